@@ -0,0 +1,49 @@
+#backend/agents/decision_memo.py
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+class DecisionMemo:
+    """
+    Per-agent LRU memo of decisions keyed on (decision type, targets offered, grimoire version, memory version).
+    A repeated Storyteller request against unchanged state is answered without another LLM call. Because both
+    versions are part of the key, any new event or status change makes older entries unreachable; they are
+    dropped as soon as a decision is stored under the newer versions.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(decision_type: str, targets: Hashable, grimoire_version: int, memory_version: int) -> Tuple:
+        return (decision_type, targets, grimoire_version, memory_version)
+
+    def get(self, key: Tuple) -> Tuple[bool, Any]:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, self._entries[key]
+        self.misses += 1
+        return False, None
+
+    def put(self, key: Tuple, value: Any):
+        versions = key[2:]
+        for stale in [k for k in self._entries if k[2:] != versions]:
+            del self._entries[stale]
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        lookups = self.hits + self.misses
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None}
@@ -1,25 +1,49 @@
 #backend/agents/player_agent.py
 import os
+import re
 from dotenv import load_dotenv
 from typing import Dict, List, Any, Optional
 from .base_agent import BaseAgent
-from ..storyteller.roles import ROLES_DATA, RoleAlignment
-from ..llm_providers import LLMFactory, UnifiedLLMClient, global_rate_limit
+from ..storyteller.roles import ROLE_REGISTRY, ROLES_DATA, RoleAlignment
+from ..storyteller.night_order import needs_night_choice, night_key
+from .turn_planner import TurnPlan, build_turn_prompt, parse_turn_plan
+from .decision_memo import DecisionMemo
+from ..llm_providers import LLMFactory, UnifiedLLMClient
+from ..utils.logger import get_logger
+from ..utils.paged_log import PagedLog
 import time
 import asyncio
 
 load_dotenv()
 
+logger = get_logger("agent")
+
 #global variables for rate limiting across all playeragent instances
 _last_global_llm_call_time: float = None
 _llm_rate_limit_lock = asyncio.Lock()
 
+#answer token sequences for streamed decisions; prompts ask for the answer on the first line so the stream can stop
+#right after it. mid-stream a terminator is required so partial ids never match; the end of the stream also counts
+NIGHT_ACTION_ANSWER_PATTERN = re.compile(r"(?m)^\s*(CHOOSE_ONE:\s*\[?[\w\-]+\]?|CHOOSE_TWO:\s*\[?[\w\-]+\s*,\s*[\w\-]+\]?|PASS)(?=[\s.,;!])")
+NOMINATION_ANSWER_PATTERN = re.compile(r"(?m)^\s*NOMINATE:\s*\[?[\w\-]+\]?(?=[\s.,;!])")
+VOTE_ANSWER_PATTERN = re.compile(r"(?m)^\s*VOTE:\s*\[?(YES|NO)\]?(?=[\s.,;!])", re.IGNORECASE)
+#append-only memory lists that prompts never print in full, so they can be paged out (see configure_memory_paging)
+PAGED_MEMORY_KEYS = ("public_chat_log", "observations", "actions_taken")
+#paged lists filled only by journaled memory events: the journal keeps them as log pages, not in snapshots
+PAGED_MEMORY_EVENTS = {"CHAT_MESSAGE": "public_chat_log"}
+
 class PlayerAgent(BaseAgent):
     def __init__(self, player_id: str, role: str, alignment: str, api_key: Optional[str] = None, game_manager: Optional[Any] = None, provider_type: Optional[str] = None, model: Optional[str] = None):
         super().__init__(player_id, role, alignment)
         self.llm = None
         self.game_manager = game_manager
         self.game_settings = None  #reference to game settings, set by game manager
+        self.task_supervisor = None  #per-game TaskSupervisor, set by game manager
+        self.journal = None  #per-game GameJournal recording memory changes, set by game manager
+        self.turn_plan: Optional[TurnPlan] = None  #latest day plan when the turn planner is enabled
+        self.decision_memo = DecisionMemo()  #repeated requests against unchanged state reuse the last decision
+        self.memory_version = 0  #bumped whenever memory or status changes; part of the decision memo key
+        self._llm_errors = 0
         
         # Create LLM provider using the factory
         try:
@@ -52,13 +76,13 @@ class PlayerAgent(BaseAgent):
                 self.llm = UnifiedLLMClient(provider, game_manager)
                 self.llm.set_agent_id(player_id)
                 
-                print(f"Initialized LLM for {player_id} using {type(provider).__name__} with model {provider.model}")
+                logger.info("Initialized LLM for %s using %s with model %s", player_id, type(provider).__name__, provider.model)
             else:
-                print(f"Warning: No API key found for PlayerAgent {player_id}. LLM will not be initialized.")
+                logger.warning("Warning: No API key found for PlayerAgent %s. LLM will not be initialized.", player_id)
                 self.llm = None
                 
         except Exception as e:
-            print(f"Failed to initialize LLM for {player_id}: {e}")
+            logger.error("Failed to initialize LLM for %s: %s", player_id, e)
             self.llm = None
             
         self.role_details = ROLES_DATA.get(self.role, {})
@@ -135,46 +159,71 @@ class PlayerAgent(BaseAgent):
         return prompt
 
     async def _rate_limited_generate(self, *args, **kwargs):
-        """Generate content with rate limiting using the new unified LLM system"""
-        # Use the global rate limiting from the new LLM system
-        await global_rate_limit()
-        
-        # The UnifiedLLMClient already handles debug logging, so we just call it directly
-        response = await self.llm.generate_content_async(*args, **kwargs)
-        return response
+        """Generate content; the UnifiedLLMClient paces calls per provider (adaptive rate control) and logs them"""
+        try:
+            return await self.llm.generate_content_async(*args, **kwargs)
+        except Exception:
+            self._llm_errors += 1
+            raise
+
+    async def _rate_limited_generate_until(self, prompt: str, answer_pattern=None, **kwargs):
+        """Stream a decision and stop generating once the answer token sequence has been parsed"""
+        if not hasattr(self.llm, "generate_until"):
+            return await self._rate_limited_generate(prompt, **kwargs)
+        try:
+            return await self.llm.generate_until(prompt, answer_pattern, **kwargs)
+        except Exception:
+            self._llm_errors += 1
+            raise
+
+    def configure_memory_paging(self, hot_items: Optional[int], page_items: int = 500, spill_dir: Optional[str] = None):
+        """Keep only the newest `hot_items` entries of each paged memory list in RAM; older ones spill to disk."""
+        for key in PAGED_MEMORY_KEYS:
+            entries = self.memory.get(key)
+            if isinstance(entries, PagedLog):
+                entries.configure(hot_items, page_items, spill_dir)
+            else:
+                self.memory[key] = PagedLog(entries or [], hot_items=hot_items, page_items=page_items, spill_dir=spill_dir)
+
+    def note_memory_changed(self):
+        """Call after writing to memory or status directly so memoized decisions are not reused."""
+        self.memory_version += 1
+
+    async def _memoized(self, decision_type: str, targets: tuple, compute):
+        """Answer from the decision memo when the same decision is asked against unchanged state."""
+        grimoire = getattr(self.game_manager, "grimoire", None)
+        if grimoire is None:
+            return await compute()
+        key = DecisionMemo.key(decision_type, targets, grimoire.version, self.memory_version)
+        hit, value = self.decision_memo.get(key)
+        if hit:
+            logger.debug("%s (%s) reusing memoized %s decision: %s", self.player_id, self.role, decision_type, value)
+            return value
+        errors_before = self._llm_errors
+        value = await compute()
+        if self._llm_errors == errors_before: #never memoize the fallback returned after a failed call
+            self.decision_memo.put(key, value)
+        return value
 
     async def get_night_action(self, game_state: Dict[str, Any], alive_player_ids_with_names: List[Dict[str,str]]) -> Optional[Dict[str, Any]]:
+        phase = game_state.get("current_phase") or game_state.get("currentPhase")
+        targets = (phase, tuple(p["id"] for p in alive_player_ids_with_names))
+        return await self._memoized("NIGHT_ACTION", targets, lambda: self._get_night_action(game_state, alive_player_ids_with_names))
+
+    async def _get_night_action(self, game_state: Dict[str, Any], alive_player_ids_with_names: List[Dict[str,str]]) -> Optional[Dict[str, Any]]:
         if not self.llm or not self.status["alive"]:
             return None
 
         role_info = self.role_details
-        is_first_night = game_state.get("current_phase") == "FIRST_NIGHT"
-        needs_active_choice = False
-        
-        #determine if an active choice is needed based on role ability for current night phase
-        if is_first_night and role_info.get("first_night_ability"):
-            #roles like Washerwoman, Librarian, Investigator, Chef, Empath (FN) get passive info from Storyteller
-            #roles like Fortune Teller (FN), Monk (FN, if allowed), Poisoner (FN, if allowed), Imp (FN) make choices
-            if self.role not in ["Washerwoman", "Librarian", "Investigator", "Chef"]:
-                 #empath first night is passive usually (0,1,2 from ST)
-                 if self.role == "Empath" and is_first_night:
-                     needs_active_choice = False 
-                 else: 
-                    needs_active_choice = True
-        elif not is_first_night and role_info.get("other_night_ability"):
-            #roles like Monk, Poisoner, Imp, Fortune Teller, Empath (other nights), Butler, Spy, Undertaker
-            #some of these are info (Spy, Undertaker, Empath), others are choices
-            if self.role not in ["Spy", "Undertaker"]:
-                #Empath on other nights is passive info based on neighbors
-                if self.role == "Empath" and not is_first_night:
-                    needs_active_choice = False
-                else:
-                    needs_active_choice = True
+        #precomputed night-order table: does this role wake to choose tonight?
+        #(the public summary uses "currentPhase"; night requests outside a night phase use the other-nights table)
+        phase = game_state.get("current_phase") or game_state.get("currentPhase")
+        needs_active_choice = needs_night_choice(self.role, phase if night_key(phase) else "NIGHT")
 
         if not needs_active_choice:
             #this signals to the Storyteller that this agent expects passive info or has no choice ability this night.
             #the Storyteller is responsible for sending info to roles like Washerwoman, Empath, Spy, Undertaker.
-            print(f"{self.player_id} ({self.role}) has no active choice this night or expects passive info.")
+            logger.debug("%s (%s) has no active choice this night or expects passive info.", self.player_id, self.role)
             return {"action_type": "PASSIVE_OR_NO_ACTION", "player_id": self.player_id, "role": self.role}
 
         #construct list of available targets (player names and IDs for the prompt)
@@ -194,7 +243,7 @@ class PlayerAgent(BaseAgent):
             f"It is {game_state.get('current_phase')}. Review your role, abilities, and the game state carefully.\n"
             f"Your role: {self.role}. Ability: {role_info.get('description')}\n"
             f"Alive players you can consider targeting: {', '.join(targetable_players_info) if targetable_players_info else 'None (or ability does not require target)'}.\n"
-            f"Think step-by-step about your objectives and the best strategic move. Consider all information you have.\n"
+            f"Weigh your objectives and everything you know, then put your decision on the FIRST line of your reply, before any explanation.\n"
             f"If you need to choose one player, respond with: CHOOSE_ONE: [PlayerID]\n"
             f"If you need to choose two players (e.g., for Librarian, Investigator), respond with: CHOOSE_TWO: [PlayerID1, PlayerID2]\n"
             f"If your ability does not require a choice now, you wish to pass (if allowed by your role), or your role is passive this night (e.g. Empath first night), respond with: PASS\n"
@@ -202,12 +251,12 @@ class PlayerAgent(BaseAgent):
         )
 
         full_prompt = self._build_prompt_context(game_state, additional_context=action_prompt)
-        full_prompt += "\nCarefully consider your role, objectives, and available information. Then, provide your decision in the specified format."
+        full_prompt += "\nStart your reply with your decision in the specified format; any reasoning comes after it."
 
         try:
-            response = await self._rate_limited_generate(full_prompt)
+            response = await self._rate_limited_generate_until(full_prompt, NIGHT_ACTION_ANSWER_PATTERN)
             choice_text = response.text.strip()
-            print(f"{self.player_id} ({self.role}) Night Action LLM Raw Response: {choice_text}")
+            logger.debug("%s (%s) Night Action LLM Raw Response: %s", self.player_id, self.role, choice_text, extra={"sample": "LLM_RESPONSE"})
 
             targets = []
             action_taken = "PASS" #default
@@ -220,7 +269,7 @@ class PlayerAgent(BaseAgent):
                     targets = [target_str]
                     action_taken = self.role #use role name as action type for now
                 else:
-                    print(f"LLM Parse Warning for {self.player_id}: Invalid target ID {target_str}")
+                    logger.warning("LLM Parse Warning for %s: Invalid target ID %s", self.player_id, target_str)
                     action_taken = "FAILED_PARSE"
             elif choice_text.startswith("CHOOSE_TWO:"):
                 target_list_str = choice_text.split("CHOOSE_TWO:")[1].strip().replace("[","").replace("]","")
@@ -231,18 +280,18 @@ class PlayerAgent(BaseAgent):
                     targets = validated_targets
                     action_taken = self.role
                 else:
-                    print(f"LLM Parse Warning for {self.player_id}: Invalid target IDs in {chosen_ids}")
+                    logger.warning("LLM Parse Warning for %s: Invalid target IDs in %s", self.player_id, chosen_ids)
                     action_taken = "FAILED_PARSE"
             elif choice_text == "PASS":
                 action_taken = "PASS"
             else:
-                print(f"LLM Parse Warning for {self.player_id}: Could not parse action: {choice_text}")
+                logger.warning("LLM Parse Warning for %s: Could not parse action: %s", self.player_id, choice_text)
                 action_taken = "FAILED_PARSE" #or "UNKNOWN_ACTION"
 
             return {"action_type": action_taken, "player_id": self.player_id, "role": self.role, "targets": targets, "raw_response": choice_text}
 
         except Exception as e:
-            print(f"Error during LLM call for {self.player_id} night action: {e}")
+            logger.error("Error during LLM call for %s night action: %s", self.player_id, e)
             return {"action_type": "ERROR", "player_id": self.player_id, "role": self.role, "targets": [], "error_message": str(e)}
 
     async def generate_chat_message(self, game_state: Dict[str, Any], chat_history: List[Dict[str, str]]) -> Optional[str]: # chat_history param might be redundant if game_state contains daily_chat_log
@@ -271,17 +320,53 @@ class PlayerAgent(BaseAgent):
         full_prompt += "\nReturn ONLY your chat message text, or SILENT."
         
         try:
-            response = await self._rate_limited_generate(full_prompt)
+            response = await self._rate_limited_generate_until(full_prompt)
             message = response.text.strip()
             if message.upper() == "SILENT":
                 return None # Indicate no message
             return message
         except Exception as e:
-            print(f"Error during LLM call for {self.player_id} chat: {e}")
+            logger.error("Error during LLM call for %s chat: %s", self.player_id, e)
             # Fallback message to indicate AI is still present but had an issue.
             return "(Pauses thoughtfully, considering the situation...)"
 
+    def _turn_planner_enabled(self) -> bool:
+        return bool(self.game_settings and getattr(self.game_settings, "turn_planner_enabled", False)
+                    and self.game_manager and getattr(self.game_manager, "grimoire", None))
+
+    def _current_turn_plan(self) -> Optional[TurnPlan]:
+        plan = self.turn_plan
+        return plan if plan and plan.is_current(self.game_manager.grimoire) else None
+
+    async def plan_day_turn(self, game_state: Dict[str, Any]) -> Optional[TurnPlan]:
+        """
+        Ask once for the whole day step (message, ranked nominations, a vote stance per player) so the
+        persona, memory and chat are uploaded once instead of once per decision.
+        """
+        grimoire = self.game_manager.grimoire
+        players = game_state.get("all_players_details", [])
+        nominee_options = [p for p in players if p["is_alive"] and p["id"] != self.player_id]
+        private_options = [p for p in nominee_options if p["id"].startswith("AIPlayer")]
+        day, log_cursor = grimoire.day_number, len(grimoire.game_log)
+        full_prompt = self._build_prompt_context(game_state, additional_context=build_turn_prompt(nominee_options, private_options))
+        try:
+            response = await self._rate_limited_generate(full_prompt)
+        except Exception as e:
+            logger.error("Error during LLM call for %s turn plan: %s", self.player_id, e)
+            return None
+        plan, error = parse_turn_plan(response.text, day, log_cursor, [p["id"] for p in nominee_options], [p["id"] for p in private_options])
+        if error:
+            logger.warning("LLM Parse Warning for %s Turn Plan: %s. Falling back to single decisions.", self.player_id, error)
+            return None
+        logger.debug("%s (%s) Turn Plan: say %s, nominate %s, votes %s", self.player_id, self.role, plan.communication.get('type'), plan.nominations, plan.votes)
+        self.turn_plan = plan
+        return plan
+
     async def decide_nomination(self, game_state: Dict[str, Any], alive_player_ids_with_names: List[Dict[str,str]], previous_nominations: List[Dict]) -> Optional[str]:
+        targets = tuple(p["id"] for p in alive_player_ids_with_names)
+        return await self._memoized("NOMINATION", targets, lambda: self._decide_nomination(game_state, alive_player_ids_with_names, previous_nominations))
+
+    async def _decide_nomination(self, game_state: Dict[str, Any], alive_player_ids_with_names: List[Dict[str,str]], previous_nominations: List[Dict]) -> Optional[str]:
         if not self.llm or not self.status["alive"]:
             return None
 
@@ -290,39 +375,53 @@ class PlayerAgent(BaseAgent):
         if not eligible_to_nominate_info:
             return None #cannot nominate if no one else is alive
 
+        if self._turn_planner_enabled():
+            plan = self._current_turn_plan() or await self.plan_day_turn(game_state)
+            if plan:
+                return plan.nomination_for([p['id'] for p in alive_player_ids_with_names if p['id'] != self.player_id])
+
         nom_prompt = f"It is your turn to nominate someone for execution. Review the game state, chat, and your private information.\n"
         nom_prompt += f"Alive players you can nominate (excluding yourself): {', '.join(eligible_to_nominate_info) if eligible_to_nominate_info else 'None'}.\n"
         if not eligible_to_nominate_info:
-             print(f"{self.player_id} ({self.role}) cannot nominate as no one else is eligible.")
+             logger.warning("%s (%s) cannot nominate as no one else is eligible.", self.player_id, self.role)
              return None
 
         nom_prompt += f"Previous nominations today: {previous_nominations if previous_nominations else 'None yet'}.\n"
-        nom_prompt += "Think step-by-step: What are your strategic reasons for nominating someone? Who is most suspicious and why? How does this nomination align with your team's goals?\n"
-        nom_prompt += "After your reasoning (internal thought process), provide your choice.\n"
+        nom_prompt += "Consider who is most suspicious and how a nomination serves your team's goals.\n"
+        nom_prompt += "Give your choice on the FIRST line of your reply, before any reasoning.\n"
         nom_prompt += f"Format your response as: NOMINATE: [PlayerID]"
 
         full_prompt = self._build_prompt_context(game_state, additional_context=nom_prompt)
-        full_prompt += "\nThink step-by-step. Then, provide your nomination choice in the specified format, ensuring PlayerID is exact."
+        full_prompt += "\nStart your reply with your nomination choice in the specified format, ensuring PlayerID is exact."
 
         try:
-            response = await self._rate_limited_generate(full_prompt)
+            response = await self._rate_limited_generate_until(full_prompt, NOMINATION_ANSWER_PATTERN)
             choice_text = response.text.strip()
-            print(f"{self.player_id} ({self.role}) Nomination LLM Raw Response: {choice_text}")
+            logger.debug("%s (%s) Nomination LLM Raw Response: %s", self.player_id, self.role, choice_text, extra={"sample": "LLM_RESPONSE"})
             if choice_text.startswith("NOMINATE:"):
                 target_id = choice_text.split("NOMINATE:")[1].strip().replace("[","").replace("]","")
                 valid_ids = [p['id'] for p in alive_player_ids_with_names if p['id'] != self.player_id]
                 if target_id in valid_ids:
                     return target_id
                 else:
-                    print(f"LLM Parse Warning for {self.player_id} Nomination: Invalid target ID {target_id}")
+                    logger.warning("LLM Parse Warning for %s Nomination: Invalid target ID %s", self.player_id, target_id)
             return None 
         except Exception as e:
-            print(f"Error during LLM call for {self.player_id} nomination: {e}")
+            logger.error("Error during LLM call for %s nomination: %s", self.player_id, e)
             return None
 
-    async def decide_vote(self, game_state: Dict[str, Any], nominee_id: str, nominee_name: str) -> Optional[bool]:
-        if not self.llm or not self.status["alive"]:
-            return None # Cannot vote if not alive or LLM not available
+    async def decide_vote(self, game_state: Dict[str, Any], nominee_id: str, nominee_name: str, dead_vote: bool = False) -> Optional[bool]:
+        return await self._memoized("VOTE", (nominee_id, dead_vote), lambda: self._decide_vote(game_state, nominee_id, nominee_name, dead_vote))
+
+    async def _decide_vote(self, game_state: Dict[str, Any], nominee_id: str, nominee_name: str, dead_vote: bool = False) -> Optional[bool]:
+        if not self.llm or (not self.status["alive"] and not dead_vote):
+            return None # Cannot vote if dead without a dead vote, or LLM not available
+
+        if self._turn_planner_enabled():
+            plan = self._current_turn_plan() or await self.plan_day_turn(game_state)
+            stance = plan.vote_for(nominee_id) if plan else None
+            if stance is not None:
+                return stance
         
         # Get nominee's role if known publicly (e.g., from a claim or previous reveal)
         # This would require game_state to potentially include public role claims.
@@ -330,32 +429,34 @@ class PlayerAgent(BaseAgent):
 
         vote_prompt = f"Player {nominee_name}(ID:{nominee_id}) has been nominated for execution. You must decide to vote YES (execute) or NO (do not execute).\n"
         vote_prompt += "Review all information: game state, chat history, your private knowledge, and your role's objectives.\n"
-        vote_prompt += "Think step-by-step: Is the nominee likely evil or good? What are the risks/benefits of executing them (e.g., Saint, unknown powerful role)? How does your vote serve your team's goals?\n"
-        vote_prompt += "After your reasoning (internal thought process), provide your vote.\n"
+        vote_prompt += "Consider whether the nominee is likely evil or good, the risks of executing them (e.g., Saint, unknown powerful role), and your team's goals.\n"
+        if dead_vote:
+            vote_prompt += "You are dead: voting YES spends the single vote you have left for the rest of the game.\n"
+        vote_prompt += "Give your vote on the FIRST line of your reply, before any reasoning.\n"
         vote_prompt += "Format your response as: VOTE: [YES/NO]"
 
         full_prompt = self._build_prompt_context(game_state, additional_context=vote_prompt)
-        full_prompt += "\nThink step-by-step. Then, provide your vote choice in the specified format."
+        full_prompt += "\nStart your reply with your vote in the specified format."
 
         try:
-            response = await self._rate_limited_generate(full_prompt)
-            choice_text = response.text.strip().upper()
-            print(f"{self.player_id} ({self.role}) Vote LLM Raw Response: {choice_text}")
+            response = await self._rate_limited_generate_until(full_prompt, VOTE_ANSWER_PATTERN)
+            choice_text = response.text.strip().upper().replace("[", "").replace("]", "")
+            logger.debug("%s (%s) Vote LLM Raw Response: %s", self.player_id, self.role, choice_text, extra={"sample": "LLM_RESPONSE"})
             if choice_text == "VOTE: YES":
                 return True
             elif choice_text == "VOTE: NO":
                 return False
-            print(f"LLM Parse Warning for {self.player_id} Vote: Invalid response {response.text}")
+            logger.warning("LLM Parse Warning for %s Vote: Invalid response %s", self.player_id, response.text)
             return False #safer default if parsing fails
         except Exception as e:
-            print(f"Error during LLM call for {self.player_id} vote: {e}")
+            logger.error("Error during LLM call for %s vote: %s", self.player_id, e)
             return False #safer default
 
     async def _curate_memory(self, event_type: str, data: Any):
         #check if memory curator is enabled in settings
         if self.game_settings and not self.game_settings.memory_curator_enabled:
             #if memory curator is disabled, store everything as important
-            self.memory.setdefault("important_events", []).append({"type": event_type, "data": data})
+            self.remember("important_event", {"type": event_type, "data": data})
             return
         
         # use LLM to decide if an event is worth remembering long-term
@@ -373,12 +474,45 @@ class PlayerAgent(BaseAgent):
             response = await self._rate_limited_generate(prompt)
             decision = response.text.strip().upper()
             if "KEEP" in decision:
-                self.memory.setdefault("important_events", []).append({"type": event_type, "data": data})
+                self.remember("important_event", {"type": event_type, "data": data})
         except Exception:
             pass
 
+    def remember(self, change: str, payload: Any):
+        """Apply one memory change and record it in the game journal, so a recovered game can replay it."""
+        if self.journal is not None:
+            self.journal.memory(self.player_id, change, payload)
+            key = PAGED_MEMORY_EVENTS.get(payload["event_type"]) if change == "event" else None
+            if key:
+                self.journal.append_to_log(self.journal_log_name(key), payload["data"])
+        self.apply_memory_change(change, payload)
+
+    def journal_log_name(self, key: str) -> str:
+        """Name of the journal's paged log holding this agent's memory list `key`."""
+        return f"{self.player_id}.{key}"
+
+    def apply_memory_change(self, change: str, payload: Any):
+        """The single write path into memory: live updates and journal replay both go through here."""
+        self.note_memory_changed()
+        if change == "event":
+            self._apply_memory_event(payload["event_type"], payload["data"])
+        elif change == "important_event":
+            self.memory.setdefault("important_events", []).append(payload)
+        elif change == "private_message":
+            self.memory.setdefault("private_chat_logs", {}).setdefault(payload["sender"], []).append(payload)
+        elif change == "private_info":
+            self.memory["private_info"] = payload
+
     def update_memory(self, event_type: str, data: Any):
         #this should be called by GameManager when events occur
+        self.remember("event", {"event_type": event_type, "data": data})
+        # schedule curation of this event under the game's supervisor so it is cancelled when the game ends
+        if self.task_supervisor:
+            self.task_supervisor.spawn(self._curate_memory(event_type, data), kind="curation")
+        else:
+            asyncio.create_task(self._curate_memory(event_type, data))
+
+    def _apply_memory_event(self, event_type: str, data: Any):
         #ensure data format is consistent for what is appended
         if event_type == "CHAT_MESSAGE": #expecting data = {"sender", "text", "timestamp"}
             self.memory["public_chat_log"].append(data)
@@ -392,8 +526,6 @@ class PlayerAgent(BaseAgent):
             self.status.update(data)
         elif event_type == "ROLE_DESCRIPTION": # Storyteller gives full role desc on game start
             self.memory["known_info"].append({"type": "ROLE_INFO", "description": data})
-        # schedule curation of this event
-        asyncio.create_task(self._curate_memory(event_type, data))
 
     def get_persona_summary(self) -> str:
         # Base persona string
@@ -403,16 +535,16 @@ class PlayerAgent(BaseAgent):
 
         role_data = ROLES_DATA.get(self.role, {})
         description = role_data.get("description", "No specific description found for your role.")
-        first_night_ability = role_data.get("first_night_ability", False)
-        other_night_ability = role_data.get("other_night_ability", False)
-        day_ability = role_data.get("day_ability", False) # Assuming ROLES_DATA might have this
+        first_night_ability = ROLE_REGISTRY.has_flag(self.role, "first_night")
+        other_night_ability = ROLE_REGISTRY.has_flag(self.role, "other_night")
+        day_ability = ROLE_REGISTRY.has_flag(self.role, "day")
 
         persona += f"Role Description: {description}\n"
         if first_night_ability:
             persona += "You have an ability on the First Night.\n"
         if other_night_ability:
             persona += "You have an ability on Other Nights.\n"
-        if day_ability: # If you add day abilities to ROLES_DATA
+        if day_ability:
             persona += "You have an ability that can be used during the Day.\n"
 
         # General goals based on alignment
@@ -477,6 +609,12 @@ class PlayerAgent(BaseAgent):
         if not self.llm or not self.status["alive"]:
             return {"type": "SILENT"} # Default to silent if no LLM or not alive
 
+        # each communication round is a new day step: plan it, and answer later requests from the plan
+        if self._turn_planner_enabled():
+            plan = await self.plan_day_turn(game_state)
+            if plan:
+                return dict(plan.communication)
+
         persona_summary = self.get_persona_summary()
         
         # Create a list of other living AI players for private chat options
@@ -501,9 +639,9 @@ class PlayerAgent(BaseAgent):
         full_prompt = self._build_prompt_context(game_state, additional_context=comm_prompt)
 
         try:
-            response = await self._rate_limited_generate(full_prompt)
+            response = await self._rate_limited_generate_until(full_prompt)
             raw_response_text = response.text.strip()
-            print(f"{self.player_id} ({self.role}) Communication LLM Raw Response: {raw_response_text}")
+            logger.debug("%s (%s) Communication LLM Raw Response: %s", self.player_id, self.role, raw_response_text, extra={"sample": "LLM_RESPONSE"})
 
             if raw_response_text.upper() == "SILENT":
                 return {"type": "SILENT"}
@@ -526,25 +664,20 @@ class PlayerAgent(BaseAgent):
                 if recipient_id in valid_recipient_ids and message_text:
                     return {"type": "PRIVATE_CHAT", "recipient_id": recipient_id, "text": message_text}
                 else:
-                    print(f"LLM Parse Warning for {self.player_id} Private Chat: Invalid recipient ({recipient_id}) or empty message ({message_text}).")
+                    logger.warning("LLM Parse Warning for %s Private Chat: Invalid recipient (%s) or empty message (%s).", self.player_id, recipient_id, message_text)
                     fallback_text = message_text if message_text else f"(Tried to send a private message but failed to specify recipient: {recipient_line})"
                     return {"type": "PUBLIC_CHAT", "text": fallback_text } 
 
             # Fallback if no clear action parsed: treat as public chat or log error
-            print(f"LLM Parse Warning for {self.player_id} Communication: Could not parse intent. Treating as public chat. Raw: {raw_response_text}")
+            logger.warning("LLM Parse Warning for %s Communication: Could not parse intent. Treating as public chat. Raw: %s", self.player_id, raw_response_text)
             return {"type": "PUBLIC_CHAT", "text": raw_response_text } # Default to public chat if unclear
 
         except Exception as e:
-            print(f"Error during LLM call for {self.player_id} communication: {e}")
+            logger.error("Error during LLM call for %s communication: %s", self.player_id, e)
             return {"type": "SILENT", "error_message": str(e)} # Default to silent on error
 
     async def receive_private_message(self, sender_id: str, sender_name: str, message_text: str):
         """Stores a received private message in the agent's memory."""
-        if "private_chat_logs" not in self.memory:
-            self.memory["private_chat_logs"] = {}
-        if sender_id not in self.memory["private_chat_logs"]:
-            self.memory["private_chat_logs"][sender_id] = []
-        
         # Get current game phase and day for timestamping/context
         # This assumes game_manager and grimoire are available and populated
         timestamp_detail = "Unknown Time"
@@ -553,11 +686,11 @@ class PlayerAgent(BaseAgent):
             day_number = self.game_manager.grimoire.day_number
             timestamp_detail = f"Day {day_number}, Phase {current_phase}"
 
-        self.memory["private_chat_logs"][sender_id].append({
+        self.remember("private_message", {
             "sender": sender_id,
             "sender_name": sender_name, 
             "text": message_text, 
             "timestamp": timestamp_detail
         })
-        print(f"Agent {self.player_id} recorded private message from {sender_name} ({sender_id}).")
+        logger.debug("Agent %s recorded private message from %s (%s).", self.player_id, sender_name, sender_id)
         # Future: Trigger agent's internal reasoning/reaction to the private message if needed immediately. 
\ No newline at end of file
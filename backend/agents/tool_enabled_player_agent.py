@@ -7,7 +7,7 @@ from typing import Dict, List, Any, Optional
 import json
 from .base_agent import BaseAgent
 from ..tools.game_state_tools import GameStateTools
-from ..llm_providers import UnifiedLLMClient, global_rate_limit
+from ..llm_providers import UnifiedLLMClient
 
 class ToolEnabledPlayerAgent(BaseAgent):
     """Player agent that uses tools to query game state instead of large prompts"""
@@ -108,7 +108,6 @@ Respond with your reasoning and final decision."""
         
         for _ in range(max_tool_calls):
             # Get LLM response
-            await global_rate_limit()
             response = await self.llm.generate_content_async(
                 json.dumps(messages),
                 response_format="json"
@@ -0,0 +1,95 @@
+#backend/agents/turn_planner.py
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from ..storyteller.grimoire import Grimoire, PUBLIC_EVENT_TYPES, PUBLIC_STATUS_KEYS
+
+#public changes a day plan already anticipates: it ranks nomination targets and takes a stance on every nominee
+ANTICIPATED_EVENT_TYPES = frozenset({"NOMINATIONS_OPEN", "NOMINATION", "NOMINATIONS_CLOSED", "VOTE_TALLY", "VOTE_RESULT", "VOTING_RESULT"})
+ANTICIPATED_STATUS_KEYS = frozenset({"nominated_today", "can_nominate", "dead_vote_used"})
+
+TURN_PLAN_INSTRUCTIONS = (
+    "Plan your whole day turn at once. Reply with ONE JSON object and nothing after it:\n"
+    "{\n"
+    '  "communication": {"type": "PUBLIC_CHAT" | "PRIVATE_CHAT" | "SILENT", "recipient_id": "<PlayerID for PRIVATE_CHAT>", "text": "<message>"},\n'
+    '  "nominate": ["<PlayerID you would nominate first>", "<second choice>"],\n'
+    '  "votes": {"<PlayerID>": "YES" | "NO"}\n'
+    "}\n"
+    "Use an empty nominate list to pass. A vote entry is how you would vote if that player is nominated.\n"
+)
+
+class TurnPlan:
+    """
+    One agent's structured plan for a day step: a message, ranked nomination targets and a vote stance per
+    possible nominee. Later nomination and vote requests are answered from it until the public state changes
+    in a way the plan did not anticipate (a death, a new day).
+    """
+
+    def __init__(self, day: int, log_cursor: int, communication: Dict[str, Any], nominations: List[str], votes: Dict[str, bool]):
+        self.day = day
+        self.log_cursor = log_cursor #len(grimoire.game_log) when the plan was made
+        self.communication = communication
+        self.nominations = nominations
+        self.votes = votes
+
+    def is_current(self, grimoire: Grimoire) -> bool:
+        if grimoire.day_number != self.day:
+            return False
+        for entry in grimoire.game_log[self.log_cursor:]:
+            event_type = entry["event_type"]
+            if event_type in PUBLIC_EVENT_TYPES and event_type not in ANTICIPATED_EVENT_TYPES:
+                return False
+            if event_type == "STATUS_UPDATE" and entry["data"].get("status") in PUBLIC_STATUS_KEYS - ANTICIPATED_STATUS_KEYS:
+                return False
+        return True
+
+    def nomination_for(self, offered_ids: List[str]) -> Optional[str]:
+        """The highest-ranked planned target that can still be nominated, or None to pass."""
+        return next((pid for pid in self.nominations if pid in offered_ids), None)
+
+    def vote_for(self, nominee_id: str) -> Optional[bool]:
+        return self.votes.get(nominee_id)
+
+def build_turn_prompt(nominee_options: List[Dict[str, str]], private_options: List[Dict[str, str]]) -> str:
+    nominees = ", ".join(f"{p['name']}(ID:{p['id']})" for p in nominee_options) or "None"
+    recipients = ", ".join(f"{p['name']}(ID:{p['id']})" for p in private_options) or "None"
+    return (
+        "It is the Day phase. Decide what you will say, whom you would nominate and how you would vote on each player.\n"
+        f"Players you could nominate: {nominees}.\n"
+        f"Other living AI players available for private chat: {recipients}.\n"
+        "Give a vote stance for every player listed above, since any of them may be nominated today.\n"
+        "Think about your goals, who you trust and who you suspect, then answer.\n"
+        + TURN_PLAN_INSTRUCTIONS
+    )
+
+def _extract_json(text: str) -> Optional[Dict[str, Any]]:
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    try:
+        data = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+def parse_turn_plan(text: str, day: int, log_cursor: int, nominee_ids: List[str], private_ids: List[str]) -> Tuple[Optional[TurnPlan], Optional[str]]:
+    """Parse and validate the planner's JSON. Returns (plan, None) or (None, error)."""
+    data = _extract_json(text)
+    if data is None:
+        return None, "no JSON object in planner response"
+
+    comm = data.get("communication") if isinstance(data.get("communication"), dict) else {}
+    comm_type = str(comm.get("type", "SILENT")).upper()
+    message = str(comm.get("text") or "").strip()
+    if comm_type == "PRIVATE_CHAT" and comm.get("recipient_id") in private_ids and message:
+        communication = {"type": "PRIVATE_CHAT", "recipient_id": comm["recipient_id"], "text": message}
+    elif comm_type in ("PUBLIC_CHAT", "PRIVATE_CHAT") and message:
+        communication = {"type": "PUBLIC_CHAT", "text": message} #an invalid private recipient falls back to public chat, as in decide_communication
+    else:
+        communication = {"type": "SILENT"}
+
+    ranked = data.get("nominate") if isinstance(data.get("nominate"), list) else []
+    nominations = [pid for pid in ranked if pid in nominee_ids]
+
+    raw_votes = data.get("votes") if isinstance(data.get("votes"), dict) else {}
+    votes = {pid: str(stance).strip().upper() == "YES" for pid, stance in raw_votes.items() if str(stance).strip().upper() in ("YES", "NO")}
+    return TurnPlan(day, log_cursor, communication, nominations, votes), None
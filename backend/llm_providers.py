@@ -4,13 +4,24 @@ Supports OpenAI, Anthropic, Google Gemini, and other providers through a unified
 """
 
 import os
+import re
 import asyncio
 import time
-from typing import Optional, Dict, Any, List
+import itertools
+import random
+import hashlib
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any, Deque, List, AsyncIterator, Callable, Awaitable, Pattern, Union
 from abc import ABC, abstractmethod
+from contextvars import ContextVar
 from dotenv import load_dotenv
 from datetime import datetime
 import json
+try:
+    from .utils.logger import get_logger
+except ImportError: #imported as a top-level module (backend/ on sys.path, e.g. test_llm_providers.py)
+    from utils.logger import get_logger
 
 # Import different provider libraries
 try:
@@ -39,27 +50,223 @@ except ImportError:
 
 load_dotenv()
 
+logger = get_logger("llm")
+
+# --- error classification, retries and circuit breaking ---
+
+#HTTP statuses worth retrying: timeouts, conflicts, rate limits and server-side failures (529 = overloaded)
+RETRYABLE_STATUSES = frozenset({408, 409, 425, 429, 500, 502, 503, 504, 529})
+#SDK exception class names (openai, anthropic, litellm, google api_core) that mean a transient failure
+RETRYABLE_ERROR_NAMES = ("Timeout", "Connection", "RateLimit", "ServiceUnavailable", "InternalServer",
+                         "Overloaded", "ResourceExhausted", "DeadlineExceeded", "TooManyRequests")
+
+class LLMError(Exception):
+    """
+    A failed provider call. `retryable` marks transient failures (rate limits, timeouts, 5xx, dropped
+    connections); `retry_after` is the server's Retry-After hint in seconds, if it sent one.
+    """
+
+    def __init__(self, message: str, provider: str, retryable: bool = False, status: Optional[int] = None,
+                 retry_after: Optional[float] = None, rate_limited: bool = False, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.provider = provider
+        self.retryable = retryable
+        self.status = status
+        self.retry_after = retry_after
+        self.rate_limited = rate_limited #a 429-style quota rejection; slows the adaptive rate controller down
+        self.headers = headers
+
+class CircuitOpenError(LLMError):
+    """Raised without calling the provider while its circuit breaker is open."""
+
+def _error_status(error: Exception) -> Optional[int]:
+    response = getattr(error, "response", None)
+    for status in (getattr(error, "status_code", None), getattr(error, "status", None),
+                   getattr(error, "code", None), getattr(response, "status_code", None)):
+        if isinstance(status, int) and 100 <= status < 600:
+            return status
+    return None
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds from a Retry-After (or retry-after-ms) response header: a number or an HTTP date."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms") is not None:
+            return max(0.0, float(headers["retry-after-ms"]) / 1000)
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+def classify_error(error: Exception, provider: str) -> LLMError:
+    """Wrap a provider SDK exception as an LLMError that says whether retrying can help."""
+    if isinstance(error, LLMError):
+        return error
+    status = _error_status(error)
+    if status is not None:
+        retryable = status in RETRYABLE_STATUSES or status >= 500
+    else:
+        retryable = isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)) or any(
+            name in type(error).__name__ for name in RETRYABLE_ERROR_NAMES)
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    rate_limited = status == 429 or any(name in type(error).__name__ for name in ("RateLimit", "ResourceExhausted", "TooManyRequests"))
+    wrapped = LLMError(f"{provider} API error: {error}", provider, retryable=retryable, status=status,
+                       retry_after=_retry_after(error), rate_limited=rate_limited, headers=dict(headers) if headers else None)
+    wrapped.__cause__ = error
+    return wrapped
+
+class RetryPolicy:
+    """Exponential backoff with full jitter; a server's Retry-After is honored as the minimum wait."""
+
+    def __init__(self, max_retries: Optional[int] = None, base_delay: Optional[float] = None,
+                 max_delay: Optional[float] = None, max_retry_after: Optional[float] = None):
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("LLM_MAX_RETRIES", "3"))
+        self.base_delay = base_delay if base_delay is not None else float(os.getenv("LLM_RETRY_BASE_DELAY", "1.0"))
+        self.max_delay = max_delay if max_delay is not None else float(os.getenv("LLM_RETRY_MAX_DELAY", "30"))
+        #a longer Retry-After than this is not waited out: the call fails at once
+        self.max_retry_after = max_retry_after if max_retry_after is not None else float(os.getenv("LLM_MAX_RETRY_AFTER", "60"))
+
+    def delay(self, error: LLMError, attempt: int) -> Optional[float]:
+        """Seconds to wait before retry number `attempt + 1`, or None if the call should not be retried."""
+        if not error.retryable or attempt >= self.max_retries:
+            return None
+        if error.retry_after is not None and error.retry_after > self.max_retry_after:
+            return None
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        return max(backoff, error.retry_after or 0.0)
+
+class CircuitBreaker:
+    """
+    Per-provider breaker. After `failure_threshold` consecutive transient failures it opens and calls fail
+    at once for `reset_timeout` seconds; then one trial call is let through (half-open). Its success closes
+    the breaker, its failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: Optional[int] = None, reset_timeout: Optional[float] = None):
+        self.name = name
+        self.failure_threshold = failure_threshold if failure_threshold is not None else int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+        self.reset_timeout = reset_timeout if reset_timeout is not None else float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.retries = 0
+        self.short_circuited = 0
+        self.times_opened = 0
+        self.last_error: Optional[str] = None
+
+    def before_call(self):
+        """Raise CircuitOpenError instead of calling a provider that is known to be failing."""
+        if self.state == "open":
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0:
+                self.short_circuited += 1
+                raise CircuitOpenError(f"{self.name} circuit open after {self.consecutive_failures} failures; retry in {remaining:.1f}s",
+                                       self.name, retry_after=remaining)
+            self.state = "half_open"
+        if self.state == "half_open":
+            if self._trial_in_flight:
+                self.short_circuited += 1
+                raise CircuitOpenError(f"{self.name} circuit half-open; waiting on a trial call", self.name)
+            self._trial_in_flight = True
+        self.calls += 1
+
+    def record_success(self):
+        self.successes += 1
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+        self.state = "closed"
+
+    def abandon(self):
+        """A call ended without an outcome (cancelled); let the next trial call through."""
+        self._trial_in_flight = False
+
+    def record_failure(self, error: LLMError):
+        self.failures += 1
+        self.last_error = str(error)
+        self._trial_in_flight = False
+        if not error.retryable: #the request was at fault, not the provider
+            if self.state == "half_open":
+                self.state = "closed"
+            return
+        self.consecutive_failures += 1
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                self.times_opened += 1
+            self.state = "open"
+            self._opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "consecutive_failures": self.consecutive_failures, "calls": self.calls,
+                "successes": self.successes, "failures": self.failures, "retries": self.retries,
+                "short_circuited": self.short_circuited, "times_opened": self.times_opened, "last_error": self.last_error}
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+def breaker_for(provider: str) -> CircuitBreaker:
+    """The shared circuit breaker for one provider (all agents using it trip and recover together)."""
+    if provider not in _breakers:
+        _breakers[provider] = CircuitBreaker(provider)
+    return _breakers[provider]
+
+def llm_resilience_stats() -> Dict[str, Dict[str, Any]]:
+    """Retry and circuit-breaker metrics per provider."""
+    return {name: breaker.stats() for name, breaker in _breakers.items()}
+
+async def _close_stream(stream: Any):
+    """Close an SDK stream the consumer stopped reading, with whichever of aclose/close/cancel it has."""
+    for method in ("aclose", "close", "cancel"):
+        closer = getattr(stream, method, None)
+        if closer is None:
+            continue
+        try:
+            result = closer()
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception:
+            pass  # the request is being abandoned either way
+        return
+
 class LLMProvider(ABC):
     """Abstract base class for LLM providers"""
     
     def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
         self.api_key = api_key
         self.model = model
-        self._last_call_time: Optional[float] = None
-        self.rate_limit_interval = float(os.getenv("LLM_MIN_INTERVAL", "1.0"))
+        self.last_headers: Optional[Dict[str, str]] = None #response headers of the latest call, for rate-limit signals
+    
+    @property
+    def name(self) -> str:
+        """Short provider name ("openai", "anthropic", ...), used to key its circuit breaker"""
+        return type(self).__name__.replace("Provider", "").lower()
     
     @abstractmethod
     async def generate_async(self, prompt: str, **kwargs) -> str:
         """Generate text asynchronously"""
         pass
     
-    async def _rate_limit(self):
-        """Apply rate limiting between calls"""
-        if self._last_call_time is not None:
-            elapsed = time.monotonic() - self._last_call_time
-            if elapsed < self.rate_limit_interval:
-                await asyncio.sleep(self.rate_limit_interval - elapsed)
-        self._last_call_time = time.monotonic()
+    async def generate_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """
+        Generate text asynchronously as a stream of chunks.
+        Providers without native streaming yield the full completion as a single chunk.
+        Closing the generator early (aclose) stops the underlying request.
+        """
+        text = await self.generate_async(prompt, **kwargs)
+        if text:
+            yield text
+    
+    def _capture_headers(self, response: Any):
+        """Remember the rate-limit headers of a raw response or stream, where the SDK exposes them"""
+        headers = getattr(response, "headers", None) or getattr(getattr(response, "response", None), "headers", None)
+        self.last_headers = dict(headers) if headers else None
 
 
 class OpenAIProvider(LLMProvider):
@@ -77,19 +284,41 @@ class OpenAIProvider(LLMProvider):
         self.client = openai.AsyncOpenAI(api_key=self.api_key)
     
     async def generate_async(self, prompt: str, **kwargs) -> str:
-        await self._rate_limit()
-        
         try:
-            response = await self.client.chat.completions.create(
+            raw = await self.client.chat.completions.with_raw_response.create(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=kwargs.get("max_tokens", 2000),
                 temperature=kwargs.get("temperature", 0.7),
                 **{k: v for k, v in kwargs.items() if k not in ["max_tokens", "temperature"]}
             )
-            return response.choices[0].message.content
+            self._capture_headers(raw)
+            return raw.parse().choices[0].message.content
+        except Exception as e:
+            raise classify_error(e, "OpenAI") from e
+    
+    async def generate_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=kwargs.get("max_tokens", 2000),
+                temperature=kwargs.get("temperature", 0.7),
+                stream=True,
+                **{k: v for k, v in kwargs.items() if k not in ["max_tokens", "temperature", "stream"]}
+            )
+            self._capture_headers(stream)
+        except Exception as e:
+            raise classify_error(e, "OpenAI") from e
+        
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
         except Exception as e:
-            raise Exception(f"OpenAI API error: {e}")
+            raise classify_error(e, "OpenAI") from e
+        finally:
+            await stream.close()  # drops the HTTP connection if the consumer stopped early
 
 
 class AnthropicProvider(LLMProvider):
@@ -107,18 +336,39 @@ class AnthropicProvider(LLMProvider):
         self.client = anthropic.AsyncAnthropic(api_key=self.api_key)
     
     async def generate_async(self, prompt: str, **kwargs) -> str:
-        await self._rate_limit()
-        
         try:
-            response = await self.client.messages.create(
+            raw = await self.client.messages.with_raw_response.create(
                 model=self.model,
                 max_tokens=kwargs.get("max_tokens", 2000),
                 temperature=kwargs.get("temperature", 0.7),
                 messages=[{"role": "user", "content": prompt}]
             )
-            return response.content[0].text
+            self._capture_headers(raw)
+            return raw.parse().content[0].text
+        except Exception as e:
+            raise classify_error(e, "Anthropic") from e
+    
+    async def generate_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        try:
+            stream = await self.client.messages.create(
+                model=self.model,
+                max_tokens=kwargs.get("max_tokens", 2000),
+                temperature=kwargs.get("temperature", 0.7),
+                messages=[{"role": "user", "content": prompt}],
+                stream=True
+            )
+            self._capture_headers(stream)
+        except Exception as e:
+            raise classify_error(e, "Anthropic") from e
+        
+        try:
+            async for event in stream:
+                if event.type == "content_block_delta" and getattr(event.delta, "text", None):
+                    yield event.delta.text
         except Exception as e:
-            raise Exception(f"Anthropic API error: {e}")
+            raise classify_error(e, "Anthropic") from e
+        finally:
+            await stream.close()
 
 
 class GoogleProvider(LLMProvider):
@@ -137,13 +387,26 @@ class GoogleProvider(LLMProvider):
         self.client = genai.GenerativeModel(self.model)
     
     async def generate_async(self, prompt: str, **kwargs) -> str:
-        await self._rate_limit()
-        
         try:
             response = await self.client.generate_content_async(prompt)
             return response.text
         except Exception as e:
-            raise Exception(f"Google API error: {e}")
+            raise classify_error(e, "Google") from e
+    
+    async def generate_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        try:
+            response = await self.client.generate_content_async(prompt, stream=True)
+        except Exception as e:
+            raise classify_error(e, "Google") from e
+        
+        try:
+            async for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            raise classify_error(e, "Google") from e
+        finally:
+            await _close_stream(getattr(response, "_iterator", None))  # the response wrapper has no close of its own
 
 
 class LiteLLMProvider(LLMProvider):
@@ -164,8 +427,6 @@ class LiteLLMProvider(LLMProvider):
                 os.environ[key] = os.getenv(key)
     
     async def generate_async(self, prompt: str, **kwargs) -> str:
-        await self._rate_limit()
-        
         try:
             response = await litellm.acompletion(
                 model=self.model,
@@ -174,9 +435,33 @@ class LiteLLMProvider(LLMProvider):
                 temperature=kwargs.get("temperature", 0.7),
                 **{k: v for k, v in kwargs.items() if k not in ["max_tokens", "temperature"]}
             )
+            self.last_headers = (getattr(response, "_hidden_params", None) or {}).get("additional_headers")
             return response.choices[0].message.content
         except Exception as e:
-            raise Exception(f"LiteLLM API error: {e}")
+            raise classify_error(e, "LiteLLM") from e
+    
+    async def generate_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        try:
+            response = await litellm.acompletion(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=kwargs.get("max_tokens", 2000),
+                temperature=kwargs.get("temperature", 0.7),
+                stream=True,
+                **{k: v for k, v in kwargs.items() if k not in ["max_tokens", "temperature", "stream"]}
+            )
+        except Exception as e:
+            raise classify_error(e, "LiteLLM") from e
+        
+        try:
+            async for chunk in response:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+        except Exception as e:
+            raise classify_error(e, "LiteLLM") from e
+        finally:
+            await _close_stream(response)
 
 
 class LLMFactory:
@@ -233,37 +518,342 @@ class LLMFactory:
             raise ValueError(f"Unknown provider type: {provider_type}")
 
 
-# Global rate limiting for all providers
-_global_rate_limit_lock = asyncio.Lock()
-_last_global_call_time: Optional[float] = None
+# --- adaptive rate control (AIMD) per provider and API key ---
 
-async def global_rate_limit():
-    """Global rate limiting across all LLM providers"""
-    global _last_global_call_time
-    min_interval = float(os.getenv("LLM_MIN_INTERVAL", "1.0"))
-    
-    async with _global_rate_limit_lock:
+def _duration_seconds(value: str) -> Optional[float]:
+    """A reset hint as seconds: "12", "1.5s", "6m0s", "20ms" (OpenAI) or an RFC 3339 time (Anthropic)."""
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = re.findall(r"(\d+(?:\.\d+)?)(ms|h|m|s)", value)
+    if parts and "".join(number + unit for number, unit in parts) == value:
+        scale = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+        return sum(float(number) * scale[unit] for number, unit in parts)
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp() - time.time()
+    except ValueError:
+        return None
+
+def rate_limit_signal(headers: Optional[Dict[str, str]]) -> Optional[Dict[str, float]]:
+    """Remaining request quota and seconds until it resets, from OpenAI, Anthropic or generic rate-limit headers."""
+    if not headers:
+        return None
+    #litellm passes provider headers through with an "llm_provider-" prefix
+    lowered = {str(key).lower().replace("llm_provider-", ""): str(value) for key, value in headers.items()}
+    for remaining_key, reset_key in (("x-ratelimit-remaining-requests", "x-ratelimit-reset-requests"),
+                                     ("anthropic-ratelimit-requests-remaining", "anthropic-ratelimit-requests-reset"),
+                                     ("x-ratelimit-remaining", "x-ratelimit-reset")):
+        if remaining_key not in lowered:
+            continue
+        try:
+            remaining = float(lowered[remaining_key])
+        except ValueError:
+            return None
+        reset = _duration_seconds(lowered[reset_key]) if reset_key in lowered else None
+        if reset is not None and reset > 1e6: #an epoch timestamp rather than a duration
+            reset -= time.time()
+        return {"remaining": remaining, "reset_seconds": max(0.0, reset) if reset is not None else None}
+    return None
+
+class AdaptiveRateController:
+    """
+    Paces calls to one provider/API key and caps how many run at once, tuned by AIMD: each success adds
+    `increase` requests/second to the target rate (and widens concurrency by one per window of successes);
+    a 429 multiplies both by `decrease` and waits out any Retry-After. Where the provider reports remaining
+    quota, the rate is also capped at what is left of the current window. Replaces the static LLM_MIN_INTERVAL,
+    which now only sets the starting rate.
+    """
+
+    def __init__(self, name: str, initial_rate: Optional[float] = None, min_rate: Optional[float] = None,
+                 max_rate: Optional[float] = None, increase: Optional[float] = None, decrease: Optional[float] = None,
+                 initial_concurrency: Optional[int] = None, max_concurrency: Optional[int] = None):
+        self.name = name
+        self.min_rate = min_rate if min_rate is not None else float(os.getenv("LLM_RATE_MIN", "0.05"))
+        self.max_rate = max_rate if max_rate is not None else float(os.getenv("LLM_RATE_MAX", "20"))
+        if initial_rate is None:
+            interval = float(os.getenv("LLM_MIN_INTERVAL", "1.0"))
+            initial_rate = 1.0 / interval if interval > 0 else self.max_rate
+        self.rate = min(self.max_rate, max(self.min_rate, initial_rate)) #target requests per second
+        self.increase = increase if increase is not None else float(os.getenv("LLM_RATE_INCREASE", "0.05"))
+        self.decrease = decrease if decrease is not None else float(os.getenv("LLM_RATE_DECREASE", "0.5"))
+        self.max_concurrency = max_concurrency if max_concurrency is not None else int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+        self.concurrency = max(1, min(self.max_concurrency, initial_concurrency if initial_concurrency is not None else 4))
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._next_slot = 0.0 #monotonic time the next call may start
+        self._window_successes = 0
+        self._last_decrease = float("-inf")
+        self._quota_rate: Optional[float] = None #rate the provider's remaining quota allows, until _quota_until
+        self._quota_until = 0.0
+        self.successes = 0
+        self.rate_limited = 0
+        self.decreases = 0
+        self.quota: Optional[Dict[str, float]] = None
+
+    def _ceiling(self) -> float:
+        if self._quota_rate is not None and time.monotonic() < self._quota_until:
+            return max(self.min_rate, min(self.max_rate, self._quota_rate))
+        return self.max_rate
+
+    async def acquire(self):
+        """Wait for a free concurrency slot, then for this call's turn at the target rate."""
+        while self.in_flight >= self.concurrency:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.in_flight += 1
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + 1.0 / self.rate
+        if slot > now:
+            try:
+                await asyncio.sleep(slot - now)
+            except BaseException:
+                self.release()
+                raise
+
+    def release(self):
+        self.in_flight = max(0, self.in_flight - 1)
+        self._wake()
+
+    def _wake(self):
+        for _ in range(max(0, self.concurrency - self.in_flight)):
+            if not self._waiters:
+                break
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def on_success(self, headers: Optional[Dict[str, str]] = None):
+        """Additive increase, capped by the quota the provider says is left."""
+        self.successes += 1
+        self._observe_quota(headers)
+        self.rate = min(self._ceiling(), self.rate + self.increase)
+        self._window_successes += 1
+        if self._window_successes >= self.concurrency:
+            self._window_successes = 0
+            self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+            self._wake()
+
+    def on_rate_limited(self, retry_after: Optional[float] = None, headers: Optional[Dict[str, str]] = None):
+        """Multiplicative decrease (once per rate interval, so one burst of 429s counts once) and a pause for Retry-After."""
+        self.rate_limited += 1
+        self._observe_quota(headers)
         now = time.monotonic()
-        if _last_global_call_time is not None:
-            elapsed = now - _last_global_call_time
-            if elapsed < min_interval:
-                await asyncio.sleep(min_interval - elapsed)
-        _last_global_call_time = time.monotonic()
+        if now - self._last_decrease >= 1.0 / self.rate:
+            self._last_decrease = now
+            self.decreases += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self.concurrency = max(1, int(self.concurrency * self.decrease))
+            self._window_successes = 0
+        if retry_after:
+            self._next_slot = max(self._next_slot, now + retry_after)
+
+    def _observe_quota(self, headers: Optional[Dict[str, str]]):
+        signal = rate_limit_signal(headers)
+        if signal is None:
+            return
+        self.quota = signal
+        reset = signal["reset_seconds"]
+        if not reset:
+            return
+        now = time.monotonic()
+        self._quota_until = now + reset
+        if signal["remaining"] <= 0:
+            self._quota_rate = self.min_rate
+            self._next_slot = max(self._next_slot, now + reset) #quota exhausted: nothing until the window resets
+        else:
+            self._quota_rate = signal["remaining"] / reset
+        self.rate = min(self.rate, self._ceiling())
+
+    def stats(self) -> Dict[str, Any]:
+        return {"target_rate_per_second": round(self.rate, 3), "interval_seconds": round(1.0 / self.rate, 3),
+                "concurrency_limit": self.concurrency, "in_flight": self.in_flight, "waiting": len(self._waiters),
+                "successes": self.successes, "rate_limited": self.rate_limited, "decreases": self.decreases,
+                "quota": self.quota}
+
+_rate_controllers: Dict[str, AdaptiveRateController] = {}
+
+def rate_controller_for(provider: str, api_key: Optional[str] = None) -> AdaptiveRateController:
+    """The shared controller for one provider and API key (quotas are per key)."""
+    key = f"{provider}:{hashlib.sha1(api_key.encode('utf-8')).hexdigest()[:8]}" if api_key else provider
+    if key not in _rate_controllers:
+        _rate_controllers[key] = AdaptiveRateController(key)
+    return _rate_controllers[key]
+
+def rate_control_stats() -> Dict[str, Dict[str, Any]]:
+    """Current target rate, concurrency and quota per provider/key."""
+    return {key: controller.stats() for key, controller in _rate_controllers.items()}
+
+
+_stream_ids = itertools.count(1)
+
+# Approximate token usage of the LLM calls made in the current context (e.g. one speculative task).
+# Tasks copy the context when they are created, so a meter started inside a task only sees that task's calls.
+_usage_meter: ContextVar[Optional[Dict[str, int]]] = ContextVar("llm_usage_meter", default=None)
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token) for usage accounting."""
+    return (len(text) + 3) // 4 if text else 0
+
+def start_usage_meter() -> Dict[str, int]:
+    """Start counting LLM usage for the current context and return the live counters."""
+    meter = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+    _usage_meter.set(meter)
+    return meter
+
+def record_usage(prompt: str, completion: str):
+    meter = _usage_meter.get()
+    if meter is not None:
+        meter["calls"] += 1
+        meter["prompt_tokens"] += estimate_tokens(prompt)
+        meter["completion_tokens"] += estimate_tokens(completion)
+
+StreamObserver = Callable[[Dict[str, Any]], Awaitable[None]]
 
 
 class UnifiedLLMClient:
     """Unified client that wraps any LLM provider with consistent interface"""
     
-    def __init__(self, provider: LLMProvider, game_manager=None):
+    def __init__(self, provider: LLMProvider, game_manager=None, retry_policy: Optional[RetryPolicy] = None):
         self.provider = provider
         self.game_manager = game_manager
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker = breaker_for(provider.name)
+        self.rate_controller = rate_controller_for(provider.name, getattr(provider, "api_key", None))
+        self._stream_observers: List[StreamObserver] = []
+    
+    def _stamp(self) -> Dict[str, Any]:
+        """Game clock stamp ({seq, mono_ns, timestamp}) for LLM call records; plain wall time outside a game."""
+        stamp = getattr(self.game_manager, "stamp", None) if self.game_manager else None
+        return (stamp() if stamp else None) or {"timestamp": datetime.utcnow().isoformat()}
+
+    def _journal(self):
+        """The current game's journal, which records responses and replays them for identical prompts."""
+        return getattr(self.game_manager, "journal", None) if self.game_manager else None
+
+    async def _backoff(self, error: LLMError, attempt: int) -> bool:
+        """Wait before retrying a failed call; False if it should not be retried."""
+        delay = self.retry_policy.delay(error, attempt)
+        if delay is None:
+            return False
+        self.breaker.retries += 1
+        logger.warning("LLM call failed (%s); retry %s/%s in %.1fs", error, attempt + 1, self.retry_policy.max_retries, delay)
+        await asyncio.sleep(delay)
+        return True
+
+    async def _acquire(self):
+        """Pass the provider's circuit breaker, then wait for a slot from its adaptive rate controller"""
+        self.breaker.before_call()
+        try:
+            await self.rate_controller.acquire()
+        except BaseException:
+            self.breaker.abandon()
+            raise
+
+    def _record_success(self):
+        self.breaker.record_success()
+        self.rate_controller.on_success(getattr(self.provider, "last_headers", None))
+
+    def _record_failure(self, e: Exception) -> LLMError:
+        error = classify_error(e, self.provider.name)
+        self.breaker.record_failure(error)
+        if error.rate_limited:
+            self.rate_controller.on_rate_limited(error.retry_after, error.headers)
+        return error
+
+    async def _generate_with_retry(self, prompt: str, **kwargs) -> str:
+        """One completion through the circuit breaker and rate controller, retrying transient failures with backoff"""
+        attempt = 0
+        while True:
+            await self._acquire() #every attempt counts against the rate
+            try:
+                text = await self.provider.generate_async(prompt, **kwargs)
+            except Exception as e:
+                error = self._record_failure(e)
+            except BaseException: #cancelled mid-call
+                self.breaker.abandon()
+                raise
+            else:
+                self._record_success()
+                return text
+            finally:
+                self.rate_controller.release()
+            if not await self._backoff(error, attempt):
+                raise error
+            attempt += 1
+
+    async def _stream_with_retry(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """
+        The provider stream through the circuit breaker and rate controller (holding a concurrency slot while
+        it runs). A failure before the first chunk is retried with backoff; once text has been yielded the
+        stream cannot be restarted transparently, so errors propagate.
+        """
+        attempt = 0
+        while True:
+            await self._acquire()
+            started = False
+            stream = self.provider.generate_stream(prompt, **kwargs)
+            try:
+                async for chunk in stream:
+                    if not started:
+                        started = True
+                        self._record_success() #the provider is answering
+                    yield chunk
+                if not started:
+                    self._record_success()
+                return
+            except Exception as e:
+                if started:
+                    raise classify_error(e, self.provider.name) from e
+                error = self._record_failure(e)
+            except BaseException: #cancelled, or closed by the consumer
+                if not started:
+                    self.breaker.abandon()
+                raise
+            finally:
+                self.rate_controller.release()
+                await stream.aclose()
+            if not await self._backoff(error, attempt):
+                raise error
+            attempt += 1
+
+    def add_stream_observer(self, observer: StreamObserver):
+        """Subscribe a coroutine callback to every streamed chunk produced by this client"""
+        if observer not in self._stream_observers:
+            self._stream_observers.append(observer)
+    
+    def remove_stream_observer(self, observer: StreamObserver):
+        if observer in self._stream_observers:
+            self._stream_observers.remove(observer)
+    
+    async def _notify_stream_observers(self, event: Dict[str, Any]):
+        """Forward a stream event to local observers and to the game manager's stream subscribers"""
+        observers = list(self._stream_observers)
+        forward = getattr(self.game_manager, "forward_llm_stream", None) if self.game_manager else None
+        if forward:
+            observers.append(forward)
+        for observer in observers:
+            try:
+                await observer(event)
+            except Exception as e:
+                logger.warning("Stream observer error: %s", e)
     
     async def generate_content_async(self, prompt: str, **kwargs) -> 'MockResponse':
         """Generate content with unified interface matching the original Gemini interface"""
-        await global_rate_limit()
-        
-        timestamp = datetime.utcnow().isoformat()
         agent_id = getattr(self, '_agent_id', 'unknown')
+        journal = self._journal()
+        replayed = journal.replayed_response(agent_id, prompt) if journal is not None else None
+        if replayed is not None:
+            return MockResponse(replayed)
+        
+        call_stamp = self._stamp()
         
         # Debug logging for prompt
         if self.game_manager:
@@ -273,17 +863,20 @@ class UnifiedLLMClient:
                     "type": "prompt",
                     "content": prompt,
                     "provider": type(self.provider).__name__,
-                    "timestamp": timestamp,
+                    **call_stamp,
                     "prompt_length": len(prompt),
                     "kwargs": kwargs
                 })
             except Exception as e:
-                print(f"Debug logging error (prompt): {e}")
+                logger.debug("Debug logging error (prompt): %s", e)
         
         try:
             start_time = time.time()
-            response_text = await self.provider.generate_async(prompt, **kwargs)
+            response_text = await self._generate_with_retry(prompt, **kwargs)
             end_time = time.time()
+            record_usage(prompt, response_text)
+            if journal is not None:
+                journal.llm(agent_id, prompt, response_text)
             
             # Debug logging for response
             if self.game_manager:
@@ -293,13 +886,14 @@ class UnifiedLLMClient:
                         "type": "response",
                         "content": response_text,
                         "provider": type(self.provider).__name__,
-                        "timestamp": datetime.utcnow().isoformat(),
+                        **self._stamp(),
+                        "call_seq": call_stamp.get("seq"),
                         "response_length": len(response_text),
                         "generation_time_seconds": round(end_time - start_time, 2),
                         "prompt_hash": hash(prompt) % 10000  # Simple hash for correlation
                     })
                 except Exception as e:
-                    print(f"Debug logging error (response): {e}")
+                    logger.debug("Debug logging error (response): %s", e)
             
             return MockResponse(response_text)
         except Exception as e:
@@ -311,13 +905,136 @@ class UnifiedLLMClient:
                         "type": "error",
                         "content": str(e),
                         "provider": type(self.provider).__name__,
-                        "timestamp": datetime.utcnow().isoformat(),
+                        **self._stamp(),
+                        "call_seq": call_stamp.get("seq"),
                         "prompt_hash": hash(prompt) % 10000
                     })
                 except Exception:
                     pass
-            print(f"LLM generation error: {e}")
+            logger.error("LLM generation error (%s): %s", agent_id, e)
+            raise
+    
+    async def generate_content_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """
+        Stream content chunk by chunk, forwarding every chunk to stream observers.
+        Closing this generator early cancels the provider stream.
+        """
+        agent_id = getattr(self, '_agent_id', 'unknown')
+        journal = self._journal()
+        replayed = journal.replayed_response(agent_id, prompt) if journal is not None else None
+        if replayed is not None:
+            yield replayed
+            return
+        
+        stream_id = f"{agent_id}-{next(_stream_ids)}"
+        call_stamp = self._stamp()
+        
+        if self.game_manager:
+            try:
+                await self.game_manager.broadcast_message("LLM_DEBUG", {
+                    "agent": agent_id,
+                    "type": "prompt",
+                    "content": prompt,
+                    "provider": type(self.provider).__name__,
+                    **call_stamp,
+                    "prompt_length": len(prompt),
+                    "kwargs": kwargs,
+                    "stream_id": stream_id
+                })
+            except Exception as e:
+                logger.debug("Debug logging error (prompt): %s", e)
+        
+        chunks: List[str] = []
+        completed = False
+        closed_early = False
+        start_time = time.time()
+        provider_stream = self._stream_with_retry(prompt, **kwargs)
+        try:
+            async for chunk in provider_stream:
+                chunks.append(chunk)
+                await self._notify_stream_observers({
+                    "agent": agent_id,
+                    "stream_id": stream_id,
+                    "chunk": chunk,
+                    "done": False
+                })
+                yield chunk
+            completed = True
+        except GeneratorExit:
+            closed_early = True #the caller stopped reading, e.g. once its answer had arrived
+            raise
+        except Exception as e:
+            if self.game_manager:
+                try:
+                    await self.game_manager.broadcast_message("LLM_DEBUG", {
+                        "agent": agent_id,
+                        "type": "error",
+                        "content": str(e),
+                        "provider": type(self.provider).__name__,
+                        **self._stamp(),
+                        "call_seq": call_stamp.get("seq"),
+                        "stream_id": stream_id
+                    })
+                except Exception:
+                    pass
+            logger.error("LLM streaming error (%s): %s", agent_id, e)
             raise
+        finally:
+            await provider_stream.aclose()
+            response_text = "".join(chunks)
+            record_usage(prompt, response_text)
+            if journal is not None and (completed or closed_early):
+                journal.llm(agent_id, prompt, response_text)
+            await self._notify_stream_observers({
+                "agent": agent_id,
+                "stream_id": stream_id,
+                "chunk": "",
+                "done": True,
+                "terminated_early": not completed
+            })
+            if self.game_manager:
+                try:
+                    await self.game_manager.broadcast_message("LLM_DEBUG", {
+                        "agent": agent_id,
+                        "type": "response",
+                        "content": response_text,
+                        "provider": type(self.provider).__name__,
+                        **self._stamp(),
+                        "call_seq": call_stamp.get("seq"),
+                        "response_length": len(response_text),
+                        "generation_time_seconds": round(time.time() - start_time, 2),
+                        "stream_id": stream_id,
+                        "terminated_early": not completed
+                    })
+                except Exception as e:
+                    logger.debug("Debug logging error (response): %s", e)
+    
+    async def generate_until(self, prompt: str, answer_pattern: Optional[Union[str, Pattern]] = None, **kwargs) -> 'MockResponse':
+        """
+        Stream a completion and stop as soon as the answer has been parsed.
+        When `answer_pattern` matches the accumulated text, the stream is cancelled and the
+        response text is the matched answer; an answer at the very end of the completion is matched
+        once the stream ends. Without a match the full completion is returned.
+        """
+        pattern = re.compile(answer_pattern) if isinstance(answer_pattern, str) else answer_pattern
+        text = ""
+        stream = self.generate_content_stream(prompt, **kwargs)
+        try:
+            async for chunk in stream:
+                text += chunk
+                if pattern is None:
+                    continue
+                match = pattern.search(text)
+                if match:
+                    return MockResponse(match.group(0), early_stopped=True)
+        finally:
+            await stream.aclose()
+        if pattern is not None:
+            #the end of the stream terminates an answer given as its last token
+            match = pattern.search(text + "\n")
+            if match:
+                return MockResponse(match.group(0).rstrip())
+        return MockResponse(text)
     
     def set_agent_id(self, agent_id: str):
         """Set agent ID for debugging purposes"""
@@ -327,5 +1044,6 @@ class UnifiedLLMClient:
 class MockResponse:
     """Mock response object to match Gemini's response interface"""
     
-    def __init__(self, text: str):
-        self.text = text 
\ No newline at end of file
+    def __init__(self, text: str, early_stopped: bool = False):
+        self.text = text
+        self.early_stopped = early_stopped #true when the stream was cancelled after the answer was parsed 
\ No newline at end of file
@@ -4,26 +4,76 @@ import uvicorn
 import json #for parsing and sending structured data
 import os #for environment variables
 import random #for shuffling roles if needed
+import itertools
+import math
+import time
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse #for testing
-from typing import Dict, List, Any, Optional
+from fastapi.responses import HTMLResponse, StreamingResponse #HTMLResponse for testing
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
 from .storyteller.grimoire import Grimoire
+from .storyteller.snapshot import player_details_view, public_players_view
 from .storyteller.rules import RuleEnforcer
+from .storyteller.context_builder import StorytellerContextBuilder
+from .storyteller.command_executor import StorytellerCommandExecutor
+from .storyteller.setup import GameSetupEngine
+from .storyteller.nominations import NominationEngine
+from .storyteller.voting import VotingEngine
+from .utils.task_supervisor import TaskSupervisor
+from .storyteller.speculation import SpeculativeDecisions, speculation_key
+from .storyteller.deadlines import DeadlineMetrics, action_family, default_action, run_with_deadline
+from .storyteller.night_order import night_key, perceived_role, plan_night, wake_order
+from .storyteller.journal import GameJournal, load_journal
+from .storyteller.replay import load_replay, replay_messages
 from .storyteller.roles import ROLES_DATA, RoleAlignment, RoleType, get_role_details #import all necessary items
-from .agents.player_agent import PlayerAgent
+from .agents.player_agent import PAGED_MEMORY_EVENTS, PlayerAgent
 from .agents.base_agent import BaseAgent #if we need to type hint with base class
 from .agents.storyteller_agent import StorytellerAgent
+from .utils.logger import configure_logging, get_logger, set_verbose
+from .utils.paged_log import json_default
+from .llm_providers import llm_resilience_stats, rate_control_stats
+
+logger = get_logger("game")
 
 #game settings configuration
 class GameSettings:
+    #filesystem locations are server configuration: clients cannot point the journal or log pages elsewhere
+    SERVER_ONLY = ("journal_dir", "log_spill_dir")
+    #numeric settings: name -> (type, minimum, None allowed)
+    NUMERIC = {
+        "storyteller_reanchor_interval": (int, 1, False),
+        "max_concurrent_commands": (int, 1, False),
+        "replay_checkpoint_interval": (int, 1, False),
+        "replay_max_gap_seconds": (float, 0.0, False),
+        "log_hot_items": (int, 0, True),
+        "log_page_items": (int, 1, False),
+        "setup_seed": (int, None, True),
+    }
+    DEADLINES = ("action_deadlines", "phase_deadlines") #name -> seconds maps
+
     def __init__(self):
         self.memory_curator_enabled = True
         self.auto_night_actions = True
         self.verbose_logging = True
         self.ai_chat_frequency = "normal"  #"low", "normal", "high"
         self.private_chat_enabled = True
+        self.storyteller_reanchor_interval = 8  #storyteller calls between full context anchors
+        self.max_concurrent_commands = 8  #storyteller sends/requests executed at once
+        self.setup_seed = None  #seed for the local setup engine; None picks a random setup
+        #seconds an agent or human may take per request before a default is applied (0 disables)
+        self.action_deadlines = {"NIGHT_ACTION": 60, "NOMINATION_CHOICE": 45, "VOTE_CHOICE": 30, "COMMUNICATION_CHOICE": 30}
+        #seconds a phase may wait on outstanding player actions before all of them are defaulted
+        self.phase_deadlines = {"FIRST_NIGHT": 240, "NIGHT": 240, "DAY_CHAT": 300, "NOMINATION": 180, "VOTING": 120}
+        self.speculative_prefetch = False  #precompute likely AI nominations/votes during Storyteller calls (spends extra tokens)
+        self.turn_planner_enabled = False  #one combined message/nomination/vote plan per agent per day step
+        self.journal_enabled = True  #record each game to an append-only journal so it can be recovered after a restart
+        self.journal_dir = os.path.join("logs", "journals")
+        self.replay_checkpoint_interval = 50  #journal mutations between replay checkpoints (a seek applies at most this many)
+        self.replay_max_gap_seconds = 5.0  #longest pause between two replayed events, whatever the speed
+        self.log_hot_items = 2000  #newest entries of each game log / agent memory list kept in RAM; older pages spill to disk (None: no limit)
+        self.log_page_items = 500  #entries per spilled page
+        self.log_spill_dir = None  #directory for spilled log segments (None: the system temp dir)
     
     def to_dict(self):
         return {
@@ -31,13 +81,61 @@ class GameSettings:
             "auto_night_actions": self.auto_night_actions,
             "verbose_logging": self.verbose_logging,
             "ai_chat_frequency": self.ai_chat_frequency,
-            "private_chat_enabled": self.private_chat_enabled
+            "private_chat_enabled": self.private_chat_enabled,
+            "storyteller_reanchor_interval": self.storyteller_reanchor_interval,
+            "max_concurrent_commands": self.max_concurrent_commands,
+            "setup_seed": self.setup_seed,
+            "action_deadlines": self.action_deadlines,
+            "phase_deadlines": self.phase_deadlines,
+            "speculative_prefetch": self.speculative_prefetch,
+            "turn_planner_enabled": self.turn_planner_enabled,
+            "journal_enabled": self.journal_enabled,
+            "journal_dir": self.journal_dir,
+            "replay_checkpoint_interval": self.replay_checkpoint_interval,
+            "replay_max_gap_seconds": self.replay_max_gap_seconds,
+            "log_hot_items": self.log_hot_items,
+            "log_page_items": self.log_page_items,
+            "log_spill_dir": self.log_spill_dir
         }
     
     def update_from_dict(self, settings_dict):
+        """
+        Apply settings sent by a client. Server-only paths are ignored; numbers are coerced and clamped to their
+        minimum, and an invalid value raises ValueError before any setting is changed.
+        """
+        updates = {}
         for key, value in settings_dict.items():
-            if hasattr(self, key):
-                setattr(self, key, value)
+            if key in self.SERVER_ONLY:
+                logger.warning("Ignoring client update of server-only setting %s", key)
+            elif hasattr(self, key):
+                updates[key] = self._coerce(key, value)
+        for key, value in updates.items():
+            setattr(self, key, value)
+
+    @classmethod
+    def _coerce(cls, key: str, value: Any) -> Any:
+        if key in cls.DEADLINES:
+            if not isinstance(value, dict):
+                raise ValueError(f"{key} must map names to seconds")
+            return {name: cls._number(f"{key}.{name}", seconds, float, 0.0) for name, seconds in value.items()}
+        if key not in cls.NUMERIC:
+            return value
+        kind, minimum, nullable = cls.NUMERIC[key]
+        if value is None and nullable:
+            return None
+        return cls._number(key, value, kind, minimum)
+
+    @staticmethod
+    def _number(key: str, value: Any, kind: type, minimum: Optional[float]) -> Any:
+        try:
+            if isinstance(value, bool):
+                raise TypeError
+            number = kind(value)
+            if not math.isfinite(number):
+                raise ValueError
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError(f"{key} must be a number, got {value!r}") from None
+        return number if minimum is None else max(minimum, number)
 
 #temp html for testing - can be removed later or served from frontend proper
 html = """
@@ -277,6 +375,10 @@ html = """
             <button onclick="requestGameStart()">Start 10-AI Player Game</button>
             <button onclick="saveLogs()">Save Comprehensive Logs</button>
             <button onclick="openSettings()">⚙️ Settings</button>
+            Replay: <input type="text" id="replayJournal" placeholder="journal file"/>
+            <input type="text" id="replayDay" placeholder="day" size="3"/>
+            <input type="text" id="replaySpeed" value="4" size="3"/>x
+            <button onclick="replayGame()">Replay</button>
         </div>
         <div class="container">
             <div class="main-content">
@@ -513,79 +615,7 @@ html = """
                         return;
                     }
 
-                    const messageType = data.type;
-                    const payload = data.payload;
-                    let displayText = "";
-
-                    if (payload && typeof payload === 'object') {
-                        displayText = JSON.stringify(payload, null, 2);
-                    } else if (payload) {
-                        displayText = payload;
-                    }
-
-                    switch (messageType) {
-                        case "INFO":
-                            addMessageToList(storytellerLog, `INFO: ${displayText}`, "info-message");
-                            break;
-                        case "ERROR":
-                            addMessageToList(storytellerLog, `ERROR: ${displayText}`, "error-message");
-                            break;
-                        case "GAME_STATE_UPDATE":
-                            let reason = payload.reason || "Game State Update";
-                            let phase = payload.currentPhase || "Unknown";
-                            let day = payload.dayNumber || "N/A";
-                            addMessageToList(storytellerLog, `STORYTELLER [${reason}]: Phase: ${phase}, Day: ${day}`, "storyteller-message");
-                            // Optionally display full game state if needed for debugging
-                            // addMessageToList(storytellerLog, JSON.stringify(payload, null, 2), "game-event");
-                            break;
-                        case "PLAYER_ROLES_UPDATE": // New message type for roles
-                            rolesMap = {};
-                            playerRolesList.innerHTML = '';
-                            if (payload.roles && Array.isArray(payload.roles)) {
-                                payload.roles.forEach((player, idx) => {
-                                    rolesMap[player.id] = player.role;
-                                    const li = document.createElement('li');
-                                    li.className = 'role-item';
-                                    li.textContent = `${idx+1}. ${player.name}: ${player.role}`;
-                                    li.dataset.playerId = player.id;
-                                    li.style.cursor = 'pointer';
-                                    li.addEventListener('click', () => {
-                                        // Remove selection from all other roles
-                                        document.querySelectorAll('.role-item').forEach(item => item.classList.remove('selected'));
-                                        // Add selection to clicked role
-                                        li.classList.add('selected');
-                                        ws.send(JSON.stringify({ type: 'REQUEST_MEMORY', payload: { player_id: player.id } }));
-                                    });
-                                    playerRolesList.appendChild(li);
-                                });
-                            }
-                            break;
-                        case "GAME_EVENT": // Generic game event from storyteller
-                             addMessageToList(storytellerLog, `STORYTELLER: ${payload.message}`, "storyteller-message");
-                             break;
-                        case "CHAT_MESSAGE":
-                            const senderName = payload.sender_name || payload.sender;
-                            const role = rolesMap[payload.sender] || '';
-                            const display = role ? `${senderName} (${role})` : senderName;
-                            addMessageToList(messagesList, `${display}: ${payload.text}`, "chat-message");
-                            break;
-                        case "MEMORY_UPDATE":
-                            const memPid = payload.player_id;
-                            const perspective = payload.perspective;
-                            document.getElementById('memoryPanel').innerHTML = formatPlayerPerspective(perspective);
-                            // Update header to show whose perspective this is
-                            const playerName = perspective.player_info ? perspective.player_info.name : memPid;
-                            document.getElementById('memoryHeader').textContent = `${playerName}'s Perspective`;
-                            break;
-                        case "SETTINGS_UPDATE":
-                            // server sent current settings
-                            currentSettings = payload;
-                            updateSettingsUI();
-                            addMessageToList(storytellerLog, "received current settings from server", "info-message");
-                            break;
-                        default:
-                            addMessageToList(storytellerLog, `UNKNOWN [${messageType}]: ${displayText}`, "game-event");
-                    }
+                    handleServerMessage(data);
                 };
 
                 ws.onclose = function(event) {
@@ -597,6 +627,83 @@ html = """
                 };
             }
 
+            //renders one server message; live websocket messages and replayed ones take the same path
+            function handleServerMessage(data) {
+                const messageType = data.type;
+                const payload = data.payload;
+                let displayText = "";
+
+                if (payload && typeof payload === 'object') {
+                    displayText = JSON.stringify(payload, null, 2);
+                } else if (payload) {
+                    displayText = payload;
+                }
+
+                switch (messageType) {
+                    case "INFO":
+                        addMessageToList(storytellerLog, `INFO: ${displayText}`, "info-message");
+                        break;
+                    case "ERROR":
+                        addMessageToList(storytellerLog, `ERROR: ${displayText}`, "error-message");
+                        break;
+                    case "GAME_STATE_UPDATE":
+                        let reason = payload.reason || "Game State Update";
+                        let phase = payload.currentPhase || "Unknown";
+                        let day = payload.dayNumber || "N/A";
+                        addMessageToList(storytellerLog, `STORYTELLER [${reason}]: Phase: ${phase}, Day: ${day}`, "storyteller-message");
+                        // Optionally display full game state if needed for debugging
+                        // addMessageToList(storytellerLog, JSON.stringify(payload, null, 2), "game-event");
+                        break;
+                    case "PLAYER_ROLES_UPDATE": // New message type for roles
+                        rolesMap = {};
+                        playerRolesList.innerHTML = '';
+                        if (payload.roles && Array.isArray(payload.roles)) {
+                            payload.roles.forEach((player, idx) => {
+                                rolesMap[player.id] = player.role;
+                                const li = document.createElement('li');
+                                li.className = 'role-item';
+                                li.textContent = `${idx+1}. ${player.name}: ${player.role}`;
+                                li.dataset.playerId = player.id;
+                                li.style.cursor = 'pointer';
+                                li.addEventListener('click', () => {
+                                    // Remove selection from all other roles
+                                    document.querySelectorAll('.role-item').forEach(item => item.classList.remove('selected'));
+                                    // Add selection to clicked role
+                                    li.classList.add('selected');
+                                    ws.send(JSON.stringify({ type: 'REQUEST_MEMORY', payload: { player_id: player.id } }));
+                                });
+                                playerRolesList.appendChild(li);
+                            });
+                        }
+                        break;
+                    case "GAME_EVENT": // Generic game event from storyteller
+                         addMessageToList(storytellerLog, `STORYTELLER: ${payload.message}`, "storyteller-message");
+                         break;
+                    case "CHAT_MESSAGE":
+                        const senderName = payload.sender_name || payload.sender;
+                        const role = rolesMap[payload.sender] || '';
+                        const display = role ? `${senderName} (${role})` : senderName;
+                        addMessageToList(messagesList, `${display}: ${payload.text}`, "chat-message");
+                        break;
+                    case "MEMORY_UPDATE":
+                        const memPid = payload.player_id;
+                        const perspective = payload.perspective;
+                        document.getElementById('memoryPanel').innerHTML = formatPlayerPerspective(perspective);
+                        // Update header to show whose perspective this is
+                        const playerName = perspective.player_info ? perspective.player_info.name : memPid;
+                        document.getElementById('memoryHeader').textContent = `${playerName}'s Perspective`;
+                        break;
+                    case "SETTINGS_UPDATE":
+                        // server sent current settings
+                        currentSettings = payload;
+                        updateSettingsUI();
+                        addMessageToList(storytellerLog, "received current settings from server", "info-message");
+                        break;
+                    default:
+                        addMessageToList(storytellerLog, `UNKNOWN [${messageType}]: ${displayText}`, "game-event");
+                }
+            }
+
             function requestGameStart() {
                 if (!ws || ws.readyState !== WebSocket.OPEN) {
                     alert("Connect to server first!");
@@ -606,6 +713,33 @@ html = """
                 addMessageToList(storytellerLog, "Requested 10-AI player game start.", "info-message");
             }
             
+            //stream an archived game from its journal through the same handler as live messages
+            async function replayGame() {
+                var journal = document.getElementById("replayJournal").value;
+                if (!journal) { alert("Journal file name cannot be empty!"); return; }
+                var params = new URLSearchParams({ speed: document.getElementById("replaySpeed").value || "1" });
+                var day = document.getElementById("replayDay").value;
+                if (day) { params.set("day", day); }
+                storytellerLog.innerHTML = '';
+                messagesList.innerHTML = '';
+                try {
+                    const response = await fetch(`/replay/${encodeURIComponent(journal)}/stream?${params}`);
+                    const reader = response.body.getReader();
+                    const decoder = new TextDecoder();
+                    let buffered = "";
+                    while (true) {
+                        const { value, done } = await reader.read();
+                        if (done) { break; }
+                        buffered += decoder.decode(value, { stream: true });
+                        const lines = buffered.split("\\n");
+                        buffered = lines.pop();
+                        lines.filter(line => line.trim()).forEach(line => handleServerMessage(JSON.parse(line)));
+                    }
+                } catch (error) {
+                    addMessageToList(storytellerLog, 'ERROR: replay failed: ' + error, 'error-message');
+                }
+            }
+
             //implement save_logs button functionality
             function saveLogs() {
                 fetch('/save_logs')
@@ -650,6 +784,7 @@ class GameManager:
         self.rule_enforcer: Optional[RuleEnforcer] = None
         self.agents: Dict[str, BaseAgent] = {}
         self.active_connections: Dict[str, WebSocket] = {} #player_id to websocket
+        self.llm_stream_subscribers: set = set() #connection ids that receive LLM_STREAM chunks as they are typed
         self.game_loop_task: Optional[asyncio.Task] = None
         self.settings = GameSettings()  #add game settings
         
@@ -663,13 +798,35 @@ class GameManager:
         # Get the appropriate API key based on provider
         self.api_key = self._get_api_key()
         
-        self.human_player_expected_actions: Dict[str, asyncio.Future] = {} # player_id -> Future for action
+        self.human_player_expected_actions: Dict[str, Tuple[str, asyncio.Future]] = {} # player_id -> (action_id, Future for action)
+        self._human_request_ids = itertools.count(1)
         self._game_lock = asyncio.Lock() #to prevent concurrent modifications to game state
         self._game_started_event = asyncio.Event()
         self._current_nominating_player_index: int = 0
         self._nomination_order: List[str] = []
+        self.nomination_engine: Optional[NominationEngine] = None
+        self.voting_engine: Optional[VotingEngine] = None
         self._daily_chat_log: List[Dict[str,str]] = [] #to feed to agents for day decisions
+        self._log_page_items: int = self.settings.log_page_items #page size of this game's logs (a recovered game keeps its journal's)
         self.pending_storyteller_actions: Dict[str, Dict[str, Any]] = {} # Initialize this early
+        self._night_wave_done_for: Optional[tuple] = None # (phase, day_number) of the last night wave
+        self._action_requests: Dict[tuple, Dict[str, Any]] = {} # (action_id, player_id) -> {action_type, requested_at}
+        self._action_tasks: Dict[tuple, asyncio.Task] = {} # (action_id, player_id) -> running AI decision task
+        self._phase_seen: Optional[str] = None
+        self._phase_started_at: float = time.monotonic()
+        self.deadline_metrics = DeadlineMetrics()
+        self.task_supervisor = TaskSupervisor("idle") # replaced per game; owns agent and curation tasks
+        self._game_count = 0
+        self.speculation = SpeculativeDecisions(lambda coro, kind: self.task_supervisor.spawn(coro, kind))
+        self.journal: Optional[GameJournal] = None #append-only record of the current game (see recover_game)
+        self._human_player_ids: List[str] = []
+        self.storyteller_context = StorytellerContextBuilder(self.settings.storyteller_reanchor_interval)
+        self.command_executor = StorytellerCommandExecutor(
+            self.execute_storyteller_command,
+            max_concurrency=self.settings.max_concurrent_commands,
+            should_stop=lambda: self.grimoire is None,
+            stamp=self.stamp
+        )
         
         # initialize LLM-based storyteller with new system
         self.storyteller_agent = StorytellerAgent(
@@ -734,96 +891,122 @@ class GameManager:
         else:
             return []
 
-    async def _get_ai_player_action(self, player_id: str, action_id: str, action_type: str, action_details: Dict[str, Any]):
+    def _build_action_context(self, action_type: str, action_details: Dict[str, Any]) -> Dict[str, Any]:
+        """Game state context for an AI action request; shared by every player asked in the same wave."""
+        # A generic public summary + action_details from ST LLM.
+        game_state_summary_for_agent = self._get_public_game_state_summary(f"Storyteller request: {action_type}")
+        # Add specific details from the ST LLM's request
+        game_state_summary_for_agent.update(action_details)
+        # Add full daily chat log as PlayerAgents expect it
+        game_state_summary_for_agent["daily_chat_log"] = list(self._daily_chat_log)
+        game_state_summary_for_agent["all_players_details"] = self.grimoire.view("player_details", player_details_view)
+        return game_state_summary_for_agent
+
+    def _action_deadline(self, action_type: Optional[str]) -> Optional[float]:
+        return self.settings.action_deadlines.get(action_family(action_type))
+
+    async def _await_with_deadline(self, awaitable, player_id: str, action_type: str, default: Any = None) -> Any:
+        """Await an agent decision under its action deadline; on expiry record a miss and return the default."""
+        limit = self._action_deadline(action_type)
+        result, timed_out = await run_with_deadline(awaitable, limit)
+        if timed_out:
+            self.deadline_metrics.record(player_id, action_type, self.grimoire.current_phase if self.grimoire else None, limit)
+            return default
+        return result
+
+    async def _decide_ai_action(self, agent: PlayerAgent, player_id: str, action_type: str, action_details: Dict[str, Any],
+                                game_state_summary_for_agent: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        action_result = None
+        if action_type.startswith("NIGHT_ACTION"): # handle any specific night action types
+            # PlayerAgent.get_night_action needs alive_player_ids_with_names
+            alive_players_with_names = [
+                {"id": pid, "name": self.grimoire.game_state.get("player_names", {}).get(pid, pid)}
+                for pid in self.grimoire.get_alive_players()
+            ]
+            action_result = await agent.get_night_action(game_state_summary_for_agent, alive_players_with_names)
+        elif action_type == "NOMINATION_CHOICE":
+            alive_players_with_names = [
+                {"id": pid, "name": self.grimoire.game_state.get("player_names", {}).get(pid, pid)}
+                for pid in self.grimoire.get_alive_players() if pid != player_id # Can't nominate self
+            ]
+            # decide_nomination expects: game_state, alive_player_ids_with_names, previous_nominations
+            # previous_nominations might need to be passed in action_details by ST LLM or fetched from grimoire log
+            previous_noms_today = [log["data"] for log in self.grimoire.game_log if log["event_type"] == "NOMINATION" and log["data"].get("day") == self.grimoire.day_number]
+            chosen_nominee_id = await agent.decide_nomination(game_state_summary_for_agent, alive_players_with_names, previous_noms_today)
+            if chosen_nominee_id:
+                action_result = {"action_type": "NOMINATE", "player_id": player_id, "nominated_player_id": chosen_nominee_id}
+            else:
+                action_result = {"action_type": "PASS_NOMINATION", "player_id": player_id}
+        elif action_type == "VOTE_CHOICE":
+            nominee_id = action_details.get("nominee_id") # ST LLM must provide this in action_details
+            nominee_name = self.grimoire.game_state.get("player_names",{}).get(nominee_id, nominee_id)
+            if nominee_id:
+                vote_decision = await agent.decide_vote(game_state_summary_for_agent, nominee_id, nominee_name)
+                action_result = {"action_type": "CAST_VOTE", "player_id": player_id, "nominee_id": nominee_id, "vote": vote_decision}
+            else:
+                logger.warning("VOTE_CHOICE requested for %s but no nominee_id in action_details: %s", player_id, action_details)
+                action_result = {"action_type": "ERROR_VOTE_NO_NOMINEE"}            
+        # Add elif for CHAT_MESSAGE or other specific actions if ST LLM is to request them individually
+        # For PUBLIC_CHAT, the _process_ai_communication_round might still be used, or ST LLM can prompt individuals.
+        elif action_type == "COMMUNICATION_CHOICE": # For public/private chat decisions
+            action_result = await agent.decide_communication(game_state_summary_for_agent)
+        else:
+            logger.warning("AI Action Warning: Unknown action_type '%s' requested for %s", action_type, player_id)
+            action_result = {"action_type": "UNKNOWN_REQUEST", "original_request": action_type}
+        return action_result
+
+    async def _get_ai_player_action(self, player_id: str, action_id: str, action_type: str, action_details: Dict[str, Any],
+                                    shared_context: Optional[Dict[str, Any]] = None):
         agent = self.agents.get(player_id)
         if not agent or not self.grimoire or not self.grimoire.is_player_alive(player_id):
-            print(f"Cannot get action for {player_id}: Not an active AI agent.")
+            logger.warning("Cannot get action for %s: Not an active AI agent.", player_id)
             # Store a None or error action if ST LLM is awaiting this player
             if action_id in self.pending_storyteller_actions and player_id in self.pending_storyteller_actions[action_id]["expected_players"]:
                  self.pending_storyteller_actions[action_id]["received_actions"][player_id] = {"action_type": "ERROR_NO_ACTION_POSSIBLE"}
             return
 
-        # Prepare game state context for the agent (similar to how _collect_ai_night_actions used to do)
-        # This might need to be slightly adapted based on what each agent.decide_X method expects.
-        # For now, a generic public summary + action_details from ST LLM.
-        game_state_summary_for_agent = self._get_public_game_state_summary(f"Storyteller request: {action_type}")
-        # Add specific details from the ST LLM's request
-        game_state_summary_for_agent.update(action_details)
+        # Prepare game state context for the agent; a wave passes one prebuilt context for all its players
+        if shared_context is not None:
+            game_state_summary_for_agent = dict(shared_context)
+        else:
+            game_state_summary_for_agent = self._build_action_context(action_type, action_details)
         #inject canonical list of available actions for this request
         game_state_summary_for_agent["available_actions"] = self.get_available_actions(player_id, action_type)
-        # Add full daily chat log as PlayerAgents expect it
-        game_state_summary_for_agent["daily_chat_log"] = list(self._daily_chat_log)
-        game_state_summary_for_agent["all_players_details"] = [
-            {"id": p_id, "name": self.grimoire.game_state.get("player_names", {}).get(p_id, p_id), "is_alive": self.grimoire.is_player_alive(p_id)}
-            for p_id in self.grimoire.players
-        ]
 
         action_result = None
-        print(f"Requesting '{action_type}' from AI {player_id} for action_id '{action_id}'...")
+        logger.debug("Requesting '%s' from AI %s for action_id '%s'...", action_type, player_id, action_id)
 
         try:
-            if action_type.startswith("NIGHT_ACTION"): # handle any specific night action types
-                # PlayerAgent.get_night_action needs alive_player_ids_with_names
-                alive_players_with_names = [
-                    {"id": pid, "name": self.grimoire.game_state.get("player_names", {}).get(pid, pid)}
-                    for pid in self.grimoire.get_alive_players()
-                ]
-                action_result = await agent.get_night_action(game_state_summary_for_agent, alive_players_with_names)
-            elif action_type == "NOMINATION_CHOICE":
-                alive_players_with_names = [
-                    {"id": pid, "name": self.grimoire.game_state.get("player_names", {}).get(pid, pid)}
-                    for pid in self.grimoire.get_alive_players() if pid != player_id # Can't nominate self
-                ]
-                # decide_nomination expects: game_state, alive_player_ids_with_names, previous_nominations
-                # previous_nominations might need to be passed in action_details by ST LLM or fetched from grimoire log
-                previous_noms_today = [log["data"] for log in self.grimoire.game_log if log["event_type"] == "NOMINATION" and log["data"].get("day") == self.grimoire.day_number]
-                chosen_nominee_id = await agent.decide_nomination(game_state_summary_for_agent, alive_players_with_names, previous_noms_today)
-                if chosen_nominee_id:
-                    action_result = {"action_type": "NOMINATE", "player_id": player_id, "nominated_player_id": chosen_nominee_id}
-                else:
-                    action_result = {"action_type": "PASS_NOMINATION", "player_id": player_id}
-            elif action_type == "VOTE_CHOICE":
-                nominee_id = action_details.get("nominee_id") # ST LLM must provide this in action_details
-                nominee_name = self.grimoire.game_state.get("player_names",{}).get(nominee_id, nominee_id)
-                if nominee_id:
-                    vote_decision = await agent.decide_vote(game_state_summary_for_agent, nominee_id, nominee_name)
-                    action_result = {"action_type": "CAST_VOTE", "player_id": player_id, "nominee_id": nominee_id, "vote": vote_decision}
-                else:
-                    print(f"VOTE_CHOICE requested for {player_id} but no nominee_id in action_details: {action_details}")
-                    action_result = {"action_type": "ERROR_VOTE_NO_NOMINEE"}            
-            # Add elif for CHAT_MESSAGE or other specific actions if ST LLM is to request them individually
-            # For PUBLIC_CHAT, the _process_ai_communication_round might still be used, or ST LLM can prompt individuals.
-            elif action_type == "COMMUNICATION_CHOICE": # For public/private chat decisions
-                action_result = await agent.decide_communication(game_state_summary_for_agent)
-            else:
-                print(f"AI Action Warning: Unknown action_type '{action_type}' requested for {player_id}")
-                action_result = {"action_type": "UNKNOWN_REQUEST", "original_request": action_type}
-
+            action_result = await self._await_with_deadline(
+                self._decide_ai_action(agent, player_id, action_type, action_details, game_state_summary_for_agent),
+                player_id, action_type, default=default_action(action_type, player_id)
+            )
         except Exception as e:
-            print(f"Error getting action {action_type} from AI {player_id}: {e}")
+            logger.exception("Error getting action %s from AI %s: %s", action_type, player_id, e)
             action_result = {"action_type": f"ERROR_IN_AGENT_ACTION", "details": str(e)}
-            import traceback
-            traceback.print_exc()
 
         # Store the result in the pending_storyteller_actions structure
         if action_id in self.pending_storyteller_actions:
-            if player_id in self.pending_storyteller_actions[action_id]["expected_players"]:
-                self.pending_storyteller_actions[action_id]["received_actions"][player_id] = action_result
-                print(f"AI action received from {player_id} for action_id '{action_id}': {action_result}")
+            received = self.pending_storyteller_actions[action_id]["received_actions"]
+            if isinstance(received.get(player_id), dict) and received[player_id].get("defaulted"):
+                logger.warning("AI action from %s for action_id '%s' arrived after its deadline; keeping the default.", player_id, action_id)
+            elif player_id in self.pending_storyteller_actions[action_id]["expected_players"]:
+                received[player_id] = action_result
+                logger.debug("AI action received from %s for action_id '%s': %s", player_id, action_id, action_result)
             else:
-                print(f"AI Action Warning: {player_id} responded for action_id '{action_id}', but was not in expected_players list: {self.pending_storyteller_actions[action_id]['expected_players']}")
+                logger.warning("AI Action Warning: %s responded for action_id '%s', but was not in expected_players list: %s", player_id, action_id, self.pending_storyteller_actions[action_id]['expected_players'])
         else:
-            print(f"AI Action Warning: Received action for '{action_id}' from {player_id}, but this action_id is not pending.")
+            logger.warning("AI Action Warning: Received action for '%s' from %s, but this action_id is not pending.", action_id, player_id)
 
     async def execute_storyteller_command(self, command_obj: Dict[str, Any]):
         command_type = command_obj.get("command")
         params = command_obj.get("params", {})
 
         if not command_type:
-            print(f"Storyteller Command Error: Missing 'command' field in {command_obj}")
+            logger.error("Storyteller Command Error: Missing 'command' field in %s", command_obj)
             return
 
-        print(f"GameManager executing Storyteller command: {command_type} with params: {params}")
+        logger.debug("GameManager executing Storyteller command: %s with params: %s", command_type, params)
 
         if command_type == "LOG_EVENT":
             if self.grimoire and "event_type" in params and "data" in params:
@@ -838,14 +1021,17 @@ class GameManager:
                         agent.update_memory("NOMINATION_EVENT", edata)
                     elif etype in ("VOTE_RESULT", "VOTING_RESULT"):  # ST LLM may use VOTING_RESULT
                         agent.update_memory("VOTE_RESULT", edata)
+                # a resolved vote frees the nomination slot
+                if params["event_type"] in ("VOTE_RESULT", "VOTING_RESULT") and self.nomination_engine:
+                    self.nomination_engine.resolve_current()
             else:
-                print(f"LOG_EVENT Error: Missing grimoire, event_type, or data in params: {params}")
+                logger.error("LOG_EVENT Error: Missing grimoire, event_type, or data in params: %s", params)
 
         elif command_type == "BROADCAST_MESSAGE":
             if "message_type" in params and "payload" in params:
                 await self.broadcast_message(params["message_type"], params["payload"])
             else:
-                print(f"BROADCAST_MESSAGE Error: Missing message_type or payload in params: {params}")
+                logger.error("BROADCAST_MESSAGE Error: Missing message_type or payload in params: %s", params)
 
         elif command_type == "SEND_PERSONAL_MESSAGE":
             if "player_id" in params and "message_type" in params and "payload" in params:
@@ -858,92 +1044,25 @@ class GameManager:
                         self.agents[ai_id].update_memory("PRIVATE_NIGHT_INFO", data)
                     if msg_type == "PRIVATE_INFO_UPDATE":
                         # store full private info payload
-                        self.agents[ai_id].memory["private_info"] = data
+                        self.agents[ai_id].remember("private_info", data)
                 await self.send_personal_message(ai_id, msg_type, data)
             else:
-                print(f"SEND_PERSONAL_MESSAGE Error: Missing player_id, message_type, or payload: {params}")
+                logger.error("SEND_PERSONAL_MESSAGE Error: Missing player_id, message_type, or payload: %s", params)
 
         elif command_type == "UPDATE_PLAYER_STATUS":
             if self.grimoire and "player_id" in params and "status_key" in params and "value" in params:
-                self.grimoire.update_status(params["player_id"], params["status_key"], params["value"])
+                try:
+                    self.grimoire.update_status(params["player_id"], params["status_key"], params["value"])
+                except KeyError as e:
+                    logger.error("UPDATE_PLAYER_STATUS Error: %s", e)
             else:
-                print(f"UPDATE_PLAYER_STATUS Error: Missing grimoire or params: {params}")
+                logger.error("UPDATE_PLAYER_STATUS Error: Missing grimoire or params: %s", params)
 
         elif command_type == "UPDATE_GRIMOIRE_VALUE":
             if self.grimoire and "key_path" in params and "value" in params:
-                key_path = params["key_path"]
-                value = params["value"]
-                
-                # Special handling for players dict to properly populate grimoire
-                if key_path == ["players"] and isinstance(value, dict):
-                    print("Special handling for players dict - populating grimoire properly")
-                    for player_id, player_data in value.items():
-                        if isinstance(player_data, str):
-                            # Storyteller is sending player_id -> role_name mapping
-                            role = player_data
-                            role_details = get_role_details(role)
-                            alignment = role_details["alignment"].value if role_details else "Good"
-                            self.grimoire.add_player(player_id, role, alignment)
-                        else:
-                            # Storyteller is sending player_id -> {role, alignment, status} mapping
-                            role = player_data.get("role")
-                            alignment = player_data.get("alignment") 
-                            if role and alignment:
-                                self.grimoire.add_player(player_id, role, alignment)
-                    print(f"Added {len(value)} players to grimoire")
-                # Handle setting players as a list
-                elif key_path == ["players"] and isinstance(value, list):
-                    print("Setting grimoire players list")
-                    self.grimoire.players = value
-                    print(f"Set grimoire.players = {value}")
-                # Handle setting roles directly
-                elif key_path == ["roles"] and isinstance(value, dict):
-                    print("Updating grimoire roles")
-                    for player_id, role in value.items():
-                        self.grimoire.roles[player_id] = role
-                    print(f"Updated roles for {len(value)} players")
-                # Handle setting alignments directly  
-                elif key_path == ["alignments"] and isinstance(value, dict):
-                    print("Updating grimoire alignments")
-                    for player_id, alignment in value.items():
-                        self.grimoire.alignments[player_id] = alignment
-                    print(f"Updated alignments for {len(value)} players")
-                # Handle setting statuses directly
-                elif key_path == ["statuses"] and isinstance(value, dict):
-                    print("Updating grimoire statuses")
-                    for player_id, status in value.items():
-                        if player_id not in self.grimoire.statuses:
-                            self.grimoire.statuses[player_id] = {}
-                        self.grimoire.statuses[player_id].update(status)
-                    print(f"Updated statuses for {len(value)} players")
-                elif len(key_path) == 1:
-                    # Handle seating_order -> players conversion
-                    if key_path[0] == "seating_order" and isinstance(value, list):
-                        # Update the grimoire players list to match seating order
-                        self.grimoire.players = value
-                        print(f"Set grimoire.players (seating order) = {value}")
-                    else:
-                        setattr(self.grimoire, key_path[0], value)
-                        print(f"Set grimoire.{key_path[0]} = {value}")
-                elif len(key_path) > 1:
-                    obj = self.grimoire
-                    for key_segment in key_path[:-1]:
-                        if hasattr(obj, key_segment):
-                            obj = getattr(obj, key_segment)
-                        elif isinstance(obj, dict) and key_segment in obj:
-                            obj = obj[key_segment]
-                        else:
-                            print(f"UPDATE_GRIMOIRE_VALUE Error: Invalid path {key_path}")
-                            return
-                    if hasattr(obj, key_path[-1]):
-                         setattr(obj, key_path[-1], value)
-                    elif isinstance(obj, dict):
-                        obj[key_path[-1]] = value
-                    else:
-                        print(f"UPDATE_GRIMOIRE_VALUE Error: Cannot set value at path {key_path}")
-                    print(f"Set grimoire path {key_path} = {value}")
+                self.grimoire.set_value(params["key_path"], params["value"])
             else:
-                print(f"UPDATE_GRIMOIRE_VALUE Error: Missing grimoire or params: {params}")
+                logger.error("UPDATE_GRIMOIRE_VALUE Error: Missing grimoire or params: %s", params)
 
         elif command_type == "EXECUTE_PLAYER":
             if self.rule_enforcer and "player_id" in params and "reason" in params:
@@ -957,25 +1076,25 @@ class GameManager:
                 # Check victory conditions after execution
                 victory_result = self.check_victory_conditions()
                 if victory_result:
-                    print(f"Victory condition met after execution: {victory_result}")
+                    logger.info("Victory condition met after execution: %s", victory_result)
                     await self.execute_storyteller_command({
                         "command": "END_GAME", 
                         "params": victory_result
                     })
             else:
-                print(f"EXECUTE_PLAYER Error: Missing rule_enforcer or params: {params}")
+                logger.error("EXECUTE_PLAYER Error: Missing rule_enforcer or params: %s", params)
         
         elif command_type == "CHECK_VICTORY":
             # Allow Storyteller to manually check victory conditions
             victory_result = self.check_victory_conditions()
             if victory_result:
-                print(f"Manual victory check result: {victory_result}")
+                logger.debug("Manual victory check result: %s", victory_result)
                 await self.execute_storyteller_command({
                     "command": "END_GAME",
                     "params": victory_result
                 })
             else:
-                print("No victory conditions met at this time")
+                logger.debug("No victory conditions met at this time")
         
         elif command_type == "REQUEST_PLAYER_ACTION":
             player_id = params.get("player_id")
@@ -984,22 +1103,26 @@ class GameManager:
             action_details = params.get("action_details", {})
 
             if not all([player_id, action_id, action_type]):
-                print(f"REQUEST_PLAYER_ACTION Error: Missing player_id, action_id, or action_type in params: {params}")
+                logger.error("REQUEST_PLAYER_ACTION Error: Missing player_id, action_id, or action_type in params: %s", params)
                 return
 
-            print(f"Storyteller LLM requests action '{action_id}' of type '{action_type}' from player {player_id} with details: {action_details}")
+            logger.debug("Storyteller LLM requests action '%s' of type '%s' from player %s with details: %s", action_id, action_type, player_id, action_details)
+            self._action_requests[(action_id, player_id)] = {"action_type": action_type, "requested_at": time.monotonic()}
 
             if player_id in self.agents: # It's an AI player
                 # Create a task to get the AI's action. This will run in the background.
                 # The result will be stored in self.pending_storyteller_actions by the helper itself.
-                asyncio.create_task(self._get_ai_player_action(player_id, action_id, action_type, action_details))
-                print(f"Task created for AI {player_id} to decide action '{action_id}'.")
+                task = self.task_supervisor.spawn(self._get_ai_player_action(player_id, action_id, action_type, action_details), kind="action")
+                if task:
+                    self._action_tasks[(action_id, player_id)] = task
+                    task.add_done_callback(lambda _t, key=(action_id, player_id): self._action_tasks.pop(key, None))
+                logger.debug("Task created for AI %s to decide action '%s'.", player_id, action_id)
             elif player_id in self.active_connections: # It's a human player (or at least connected client)
                 # For human players, we need to send them a message prompting for their action.
                 # Their response will come via `handle_incoming_message`.
                 # We still need to record that we are expecting this action_id from them.
                 if action_id not in self.pending_storyteller_actions:
-                     print(f"REQUEST_PLAYER_ACTION Warning: action_id {action_id} was not pre-declared by AWAIT_PLAYER_RESPONSES for human {player_id}. This might be okay if ST LLM requests then awaits immediately.")
+                     logger.warning("REQUEST_PLAYER_ACTION Warning: action_id %s was not pre-declared by AWAIT_PLAYER_RESPONSES for human %s. This might be okay if ST LLM requests then awaits immediately.", action_id, player_id)
                      # It implies the ST LLM should issue AWAIT just after this for this player/action_id
 
                 # Send a tailored message type based on action_type
@@ -1013,9 +1136,9 @@ class GameManager:
                     await self.send_personal_message(player_id, "REQUEST_CHAT_DECISION", {"action_id": action_id, **action_details})
                 else:
                     await self.send_personal_message(player_id, "REQUEST_GENERIC_ACTION", {"action_id": action_id, "action_type": action_type, **action_details})
-                print(f"Sent '{action_type}' prompt to human player {player_id} for action_id '{action_id}'.")
+                logger.info("Sent '%s' prompt to human player %s for action_id '%s'.", action_type, player_id, action_id)
             else:
-                print(f"REQUEST_PLAYER_ACTION Error: Player {player_id} not found in agents or active_connections.")
+                logger.error("REQUEST_PLAYER_ACTION Error: Player %s not found in agents or active_connections.", player_id)
                  # If ST LLM is awaiting this player, we should probably mark an error for them.
                 if action_id in self.pending_storyteller_actions and player_id in self.pending_storyteller_actions[action_id]["expected_players"]:
                     self.pending_storyteller_actions[action_id]["received_actions"][player_id] = {"action_type": "ERROR_PLAYER_NOT_FOUND"}
@@ -1031,145 +1154,214 @@ class GameManager:
                     new_expected = set(expected_players)
                     self.pending_storyteller_actions[action_id]["expected_players"] = list(existing_expected.union(new_expected))
                 
-                print(f"Game Loop: Now awaiting responses for action_id '{action_id}' from {self.pending_storyteller_actions[action_id]['expected_players']}")
+                logger.debug("Game Loop: Now awaiting responses for action_id '%s' from %s", action_id, self.pending_storyteller_actions[action_id]['expected_players'])
                 # The main game loop will see this action_id in pending_storyteller_actions and will continue to feed it to ST LLM
                 # until all expected_players have their actions in received_actions for this action_id.
             else:
-                 print(f"Game Loop Warning: AWAIT_PLAYER_RESPONSES command missing action_id or expected_players.")
+                 logger.warning("Game Loop Warning: AWAIT_PLAYER_RESPONSES command missing action_id or expected_players.")
 
         elif command_type == "END_GAME":
             if "winner" in params and "reason" in params:
-                print(f"Game Over! Winner: {params['winner']}, Reason: {params['reason']}")
+                logger.info("Game Over! Winner: %s, Reason: %s", params['winner'], params['reason'])
                 await self.broadcast_message("GAME_END", {"winner" : params['winner'], "reason": params['reason']})
                 if self.grimoire: # Clear grimoire to stop game loop
                     self.grimoire = None 
+                self.task_supervisor.cancel_all("game ended") # stop in-flight agent work so no more quota is spent
                 self._game_started_event.clear()
                 if self.game_loop_task and not self.game_loop_task.done():
                     self.game_loop_task.cancel() # Stop the game loop task
             else:
-                print(f"END_GAME Error: Missing winner or reason: {params}")
+                logger.error("END_GAME Error: Missing winner or reason: %s", params)
 
         elif command_type == "ERROR_LOG":
-            print(f"Storyteller LLM Reported Error: {params.get('message')}. Raw Output: {params.get('raw_output', 'N/A')}")
+            logger.error("Storyteller LLM Reported Error: %s. Raw Output: %s", params.get('message'), params.get('raw_output', 'N/A'))
 
         else:
-            print(f"GameManager Error: Unknown Storyteller command_type: {command_type}")
+            logger.error("GameManager Error: Unknown Storyteller command_type: %s", command_type)
+
+    def _reset_game(self, grimoire: Grimoire, page_items: Optional[int] = None):
+        """Replace the per-game state with a fresh game around `grimoire` (new game, or recovery with its journal's page size)."""
+        # Stop whatever the previous game still had in flight before its state is replaced
+        self.task_supervisor.cancel_all("game reset")
+        self._game_count += 1
+        self.task_supervisor = TaskSupervisor(f"game-{self._game_count}")
+        self.pending_storyteller_actions = {}
+        self.speculation.clear()
+
+        # Initialize basic game structures
+        self.grimoire = grimoire
+        self._log_page_items = page_items or self.settings.log_page_items
+        self.grimoire.configure_log_paging(*self._log_paging())
+        self.rule_enforcer = RuleEnforcer(self.grimoire, game_manager=self) # Still useful for low-level rule checks if ST LLM delegates
+        self.agents = {}
+        self._game_started_event.clear()
+        self._current_nominating_player_index = 0
+        self._nomination_order = []
+        self.nomination_engine = NominationEngine(self.grimoire)
+        self.voting_engine = VotingEngine(self.grimoire)
+        self._daily_chat_log = []
+        self._night_wave_done_for = None
+        self._action_requests = {}
+        self._action_tasks = {}
+        self._phase_seen = None
+        self.storyteller_context = StorytellerContextBuilder(self.settings.storyteller_reanchor_interval)
+        self.storyteller_agent.reset_session()
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+    def _log_paging(self):
+        return self.settings.log_hot_items, self._log_page_items, self.settings.log_spill_dir
+
+    def _create_agent(self, player_id: str, role: str, alignment: str) -> PlayerAgent:
+        """Create an AI agent wired to this game's supervisor, settings and journal."""
+        display_name = self.grimoire.game_state.get("player_names", {}).get(player_id, player_id)
+        if self.api_key:
+            agent = PlayerAgent(
+                player_id, 
+                role, 
+                alignment, 
+                api_key=self.api_key, 
+                game_manager=self,
+                provider_type=self.llm_provider_type,
+                model=self.llm_model
+            )
+            logger.info("Initialized AI Agent for %s as %s (%s) using %s provider", display_name, role, alignment, self.llm_provider_type)
+        else:
+            agent = PlayerAgent(
+                player_id, 
+                role, 
+                alignment, 
+                api_key=None, 
+                game_manager=self
+            )
+            logger.warning("Skipping LLM for AI agent %s due to missing API key. Player will be passive.", display_name)
+        agent.task_supervisor = self.task_supervisor
+        agent.game_settings = self.settings
+        agent.configure_memory_paging(*self._log_paging())
+        agent.journal = self.journal
+        self.agents[player_id] = agent
+        return agent
+
+    def _start_journal(self, path: Optional[str] = None, recorded_llm=None, resumed_logs=None):
+        """
+        Attach a journal to the current game (a new file unless `path` is given) and snapshot it at once.
+        `resumed_logs` continues the paged logs of an existing journal (see GameJournal).
+        """
+        if not self.settings.journal_enabled or not self.grimoire:
+            return
+        if path is None:
+            filename = datetime.utcnow().strftime(f"game_%Y%m%d_%H%M%S_{self._game_count}.jsonl")
+            path = os.path.join(self.settings.journal_dir, filename)
+        self.journal = GameJournal(path, recorded_llm=recorded_llm, page_items=self._log_page_items, resumed_logs=resumed_logs)
+        self.grimoire.journal = self.journal
+        for agent in self.agents.values():
+            agent.journal = self.journal
+        #a new journal starts with the game log built before it existed; later snapshots leave the log out
+        self._journal_snapshot(with_log=resumed_logs is None)
+
+    def _journal_snapshot(self, with_log: bool = False):
+        """
+        Write a snapshot (grimoire plus every agent's memory); recovery replays only what follows it. The agents'
+        event-fed paged lists, and the game log unless `with_log`, are left out: the journal keeps them as pages.
+        """
+        if self.journal is None or not self.grimoire:
+            return
+        paged = set(PAGED_MEMORY_EVENTS.values())
+        agents = {}
+        for pid, agent in self.agents.items():
+            agents[pid] = {"role": agent.role, "alignment": agent.alignment, "status": agent.status,
+                           "memory": {key: value for key, value in agent.memory.items() if key not in paged}}
+        self.journal.snapshot({
+            "grimoire": self.grimoire.to_snapshot(with_log=with_log),
+            "agents": agents,
+            "human_player_ids": self._human_player_ids,
+        })
+
+    def _current_day_chat(self) -> List[Dict[str, Any]]:
+        """The current day's CHAT events, read back from the end of the log (spilled pages of earlier days are not read)."""
+        day = self.grimoire.day_number
+        chat = []
+        for entry in reversed(self.grimoire.game_log):
+            if entry["event_type"] == "PHASE_CHANGE" and entry["data"].get("day_number", day) != day:
+                break
+            if entry["event_type"] == "CHAT":
+                chat.append(entry["data"])
+        chat.reverse()
+        return chat
+
+    async def recover_game(self, path: str) -> Dict[str, Any]:
+        """Rebuild a game from its journal (last snapshot plus tail) and resume its loop; no LLM call is repeated."""
+        async with self._game_lock:
+            started = time.perf_counter()
+            recovered = load_journal(path, self.settings.log_hot_items, self.settings.log_spill_dir)
+            if self.game_loop_task and not self.game_loop_task.done():
+                self.game_loop_task.cancel()
+                await asyncio.wait([self.game_loop_task]) #let its cleanup finish before the new game starts
+            self._reset_game(recovered.grimoire, page_items=recovered.page_items)
+            self._human_player_ids = recovered.human_player_ids
+            self._daily_chat_log = self._current_day_chat()
+            hot_items, _, spill_dir = self._log_paging()
+            paged_logs = {"game_log": self.grimoire.game_log}
+            for player_id, saved in recovered.agents.items():
+                agent = self._create_agent(player_id, saved["role"], saved["alignment"])
+                agent.memory = saved["memory"]
+                agent.status = saved["status"]
+                for key in PAGED_MEMORY_EVENTS.values():
+                    name = agent.journal_log_name(key)
+                    agent.memory[key] = paged_logs[name] = recovered.paged_log(name, hot_items, spill_dir)
+                agent.configure_memory_paging(*self._log_paging())
+            for record in recovered.memory_tail:
+                agent = self.agents.get(record["player_id"])
+                if agent:
+                    agent.apply_memory_change(record["change"], record["payload"])
+            #keep appending to the same journal and its log pages; the fresh snapshot makes the next recovery start here
+            resumed_logs = {name: (recovered.log_pages(name), log) for name, log in paged_logs.items()}
+            self._start_journal(path, recorded_llm=recovered.recorded_llm, resumed_logs=resumed_logs)
+            elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+            logger.info("Recovered game from %s (%s tail records) in %s ms", path, recovered.tail_records, elapsed_ms)
+
+            await self.broadcast_game_state("Game recovered")
+            await self.broadcast_game_event(f"Game recovered: Day {self.grimoire.day_number}, {self.grimoire.current_phase}.")
+            self.game_loop_task = asyncio.create_task(self.run_game_loop())
+            self._game_started_event.set()
+            return {"path": path, "tail_records": recovered.tail_records, "recovery_ms": elapsed_ms,
+                    "phase": self.grimoire.current_phase, "day_number": self.grimoire.day_number}
 
     async def setup_new_game(self, player_ids_roles: Dict[str, str], human_player_ids: List[str] = [], player_names: Dict[str, str] = {}):
         async with self._game_lock:
             if self.is_game_running() and self.game_loop_task and not self.game_loop_task.done():
-                print("Game is already running. Cannot setup a new game.")
+                logger.warning("Game is already running. Cannot setup a new game.")
                 await self.broadcast_game_event("Game is already running. Cannot setup a new game.")
                 return
 
-            # Initialize basic game structures
-            self.grimoire = Grimoire()
-            self.rule_enforcer = RuleEnforcer(self.grimoire, game_manager=self) # Still useful for low-level rule checks if ST LLM delegates
-            self.agents = {}
-            self._game_started_event.clear()
-            self._current_nominating_player_index = 0
-            self._nomination_order = []
-            self._daily_chat_log = []
+            self._reset_game(Grimoire())
 
             if not self.google_api_key:
-                 print("Warning: GOOGLE_API_KEY not set in environment. AI Agents and Storyteller LLM may not function.")
+                 logger.warning("Warning: GOOGLE_API_KEY not set in environment. AI Agents and Storyteller LLM may not function.")
                  await self.broadcast_game_event("Warning: GOOGLE_API_KEY not set. AI Agents/ST LLM may be passive.")
             
-            # Prepare context for Storyteller LLM to perform setup
-            initial_context = [
-                f"EVENT: REQUEST_GAME_START received.",
-                f"INPUT_PLAYER_ROLES: {json.dumps(player_ids_roles)}",
-                f"INPUT_HUMAN_PLAYERS: {json.dumps(human_player_ids)}",
-                f"GRIMOIRE_STATE: EMPTY_INITIALIZATION"
-            ]
-            
-            print("Requesting Storyteller LLM to perform game setup...")
-            setup_commands = await self.storyteller_agent.generate_commands(initial_context)
-            print(f"Received setup commands from Storyteller LLM: {setup_commands}")
-
-            # Separate state mutation commands from personal message and player action commands to defer until agents exist
-            state_commands = [cmd for cmd in setup_commands if cmd.get("command") not in ["SEND_PERSONAL_MESSAGE", "REQUEST_PLAYER_ACTION", "AWAIT_PLAYER_RESPONSES"]]
-            deferred_private_msgs = [cmd for cmd in setup_commands if cmd.get("command") == "SEND_PERSONAL_MESSAGE"]
-            deferred_player_actions = [cmd for cmd in setup_commands if cmd.get("command") in ["REQUEST_PLAYER_ACTION", "AWAIT_PLAYER_RESPONSES"]]
-            # First, apply all state-changing commands
-            for command_obj in state_commands:
-                await self.execute_storyteller_command(command_obj)
-            
-            # --- The following player agent setup remains, as ST LLM doesn't directly init Python objects ---
-            # ST LLM should have used UPDATE_GRIMOIRE_VALUE to set player names, roles etc.
-            # We now iterate based on grimoire to create agent objects.
-
-            if not self.grimoire:
-                print("CRITICAL ERROR: Grimoire not initialized by Storyteller LLM during setup.")
-                # Potentially send an error message to client or halt.
-                await self.broadcast_game_event("Critical setup error: Storyteller LLM failed to initialize Grimoire.")
-                return
-            
+            # Build the whole setup locally: seating, alignments, bluffs, red herring, Drunk/Recluse/Spy
+            # personas, the Baron adjustment and first-night info; no LLM round trip is needed
+            setup_engine = GameSetupEngine(seed=self.settings.setup_seed)
+            first_night_info = setup_engine.build(self.grimoire, player_ids_roles, player_names)
+            logger.info("Game setup built locally (seed=%s): seating %s, bluffs %s", self.settings.setup_seed, self.grimoire.players, self.grimoire.demon_bluffs)
+
             player_display_names = self.grimoire.game_state.get("player_names", {})
             all_player_role_info = [] # For broadcasting roles to observer
 
-            # Ensure all players from input are in grimoire after ST LLM setup
-            # If Storyteller didn't set up players properly, we'll do it as fallback
-            if not self.grimoire.players:
-                print("Storyteller LLM didn't set up players. Setting up manually as fallback.")
-                for player_id, role_name in player_ids_roles.items():
-                    role_details = get_role_details(role_name)
-                    alignment = role_details["alignment"].value if role_details else "Unknown"
-                    self.grimoire.add_player(player_id, role_name, alignment)
-                
-                # Set initial phase if not set
-                if not self.grimoire.current_phase:
-                    self.grimoire.current_phase = "FIRST_NIGHT"
-                    self.grimoire.day_number = 0
-                    print("Set initial phase to FIRST_NIGHT manually")
-            
-            for player_id, role_name in player_ids_roles.items():
-                if player_id not in self.grimoire.players:
-                    print(f"Warning: Player {player_id} ({role_name}) was in input but not added to Grimoire by Storyteller LLM. Adding manually.")
-                    # This is a fallback, ideally ST LLM handles all additions via commands
-                    alignment = get_role_details(role_name)["alignment"].value if get_role_details(role_name) else "Unknown"
-                    self.grimoire.add_player(player_id, role_name, alignment)
-                
-                # Set player name from provided mapping or use a better fallback
-                if player_id not in player_display_names:
-                    if player_id in player_names:
-                        # Use the provided random name
-                        player_display_names[player_id] = player_names[player_id]
-                    else:
-                        # Better fallback than generic "AI Player"
-                        player_display_names[player_id] = f"Player {player_id[-1]}"  # Use last character of ID
-                    self.grimoire.game_state.setdefault("player_names", {})[player_id] = player_display_names[player_id]
-
+            for player_id in self.grimoire.players:
                 # Populate role info for observer using grimoire's state
                 actual_role_name = self.grimoire.get_player_role(player_id)
                 display_name = player_display_names.get(player_id, player_id)
                 all_player_role_info.append({"id": player_id, "name": display_name, "role": actual_role_name})
 
-                # Initialize PlayerAgent objects
+                # Initialize PlayerAgent objects; a Drunk is told the Townsfolk role they think they are
                 if player_id not in human_player_ids:
                     alignment = self.grimoire.get_player_alignment(player_id)
-                    if self.api_key:
-                        self.agents[player_id] = PlayerAgent(
-                            player_id, 
-                            actual_role_name, 
-                            alignment, 
-                            api_key=self.api_key, 
-                            game_manager=self,
-                            provider_type=self.llm_provider_type,
-                            model=self.llm_model
-                        )
-                        print(f"Initialized AI Agent for {display_name} as {actual_role_name} ({alignment}) using {self.llm_provider_type} provider")
-                    else:
-                        self.agents[player_id] = PlayerAgent(
-                            player_id, 
-                            actual_role_name, 
-                            alignment, 
-                            api_key=None, 
-                            game_manager=self
-                        )
-                        print(f"Skipping LLM for AI agent {display_name} due to missing API key. Player will be passive.")
+                    actual_role_name = self._perceived_role(player_id)
+                    agent = self._create_agent(player_id, actual_role_name, alignment)
                     # populate initial private info into agent.memory
-                    agent = self.agents[player_id]
                     role_details = get_role_details(actual_role_name)
                     private_payload = {
                         "role": actual_role_name,
@@ -1178,63 +1370,44 @@ class GameManager:
                         "clues": self.grimoire.get_private_clues(player_id)
                     }
                     
-                    # Add placeholder first night information that will be meaningful for discussion
-                    if actual_role_name == "Washerwoman":
-                        # Create a sample clue for Washerwoman
-                        other_players = [pid for pid in self.grimoire.players if pid != player_id]
-                        if len(other_players) >= 2:
-                            # Pick two players and say one is a Townsfolk
-                            target1, target2 = other_players[:2]
-                            name1 = self.grimoire.game_state.get("player_names", {}).get(target1, target1)
-                            name2 = self.grimoire.game_state.get("player_names", {}).get(target2, target2)
-                            private_payload["first_night_clue"] = f"One of {name1} or {name2} is a Townsfolk."
-                    elif actual_role_name == "Chef":
-                        # Chef learns number of evil pairs
-                        private_payload["first_night_clue"] = "You see 1 pair of evil players sitting adjacent."
-                    elif actual_role_name == "Empath":
-                        # Empath learns evil neighbor count
-                        private_payload["first_night_clue"] = "You sense 1 evil neighbor."
+                    if player_id in first_night_info:
+                        private_payload["first_night_clue"] = first_night_info[player_id]["text"]
                     
                     # extra info: demon/minion/red_herring if applicable
                     if role_details.get("knows_demon", False):
-                        demon_ids = [pid for pid, r in self.grimoire.roles.items() if r == "Imp"]
+                        demon_ids = self.grimoire.get_player_ids_by_type(RoleType.DEMON)
                         private_payload["known_demon"] = demon_ids[0] if demon_ids else None
                     if actual_role_name == "Imp":
-                        minion_ids = [pid for pid, r in self.grimoire.roles.items() if get_role_details(r)["type"] == RoleType.MINION]
+                        minion_ids = self.grimoire.get_player_ids_by_type(RoleType.MINION)
                         private_payload["known_minions"] = minion_ids
-                        private_payload["demon_bluffs"] = getattr(self.grimoire, "demon_bluffs", ["Virgin", "Monk", "Ravenkeeper"])
+                        private_payload["demon_bluffs"] = self.grimoire.demon_bluffs
                     if role_details.get("has_red_herring", False):
-                        private_payload["red_herring"] = getattr(self.grimoire, "fortune_teller_red_herring", None)
+                        private_payload["red_herring"] = self.grimoire.fortune_teller_red_herring_player_id
                     agent.memory["private_info"] = private_payload
-                    # set game settings reference
-                    agent.game_settings = self.settings
                 else:
-                     print(f"Player {display_name} ({actual_role_name}) is a human player.")
+                     logger.info("Player %s (%s) is a human player.", display_name, actual_role_name)
             # --- End of PlayerAgent setup ---
+            self._human_player_ids = list(human_player_ids)
+            self._start_journal()
             
-            # Replay deferred personal messages now that agents and clients are ready
-            for command_obj in deferred_private_msgs:
-                await self.execute_storyteller_command(command_obj)
+            # Deliver private info (including first-night clues) to connected human players
+            for player_id in human_player_ids:
+                await self.send_private_info(player_id)
             
-            # Execute deferred player actions after agents are initialized
-            for command_obj in deferred_player_actions:
-                await self.execute_storyteller_command(command_obj)
-            
-            # Final broadcasts after ST LLM setup and Agent init
             await self.broadcast_player_roles(all_player_role_info) # Broadcast all roles based on Grimoire
-            await self.broadcast_game_state("Initial game state after ST LLM setup")
-            await self.broadcast_game_event(f"Game setup by Storyteller LLM with {len(self.grimoire.players)} players. Phase: {self.grimoire.current_phase}.")
+            await self.broadcast_game_state("Initial game state after setup")
+            await self.broadcast_game_event(f"Game setup with {len(self.grimoire.players)} players. Night falls. The first night begins.")
             
             if self.game_loop_task and not self.game_loop_task.done():
                 self.game_loop_task.cancel()
             self.game_loop_task = asyncio.create_task(self.run_game_loop())
             self._game_started_event.set()
-            print("Game loop task created and started event set after Storyteller LLM setup.")
+            logger.info("Game loop task created and started event set after setup.")
 
     async def connect(self, websocket: WebSocket, player_id: str):
         await websocket.accept()
         self.active_connections[player_id] = websocket
-        print(f"Player {player_id} connected.")
+        logger.info("Player %s connected.", player_id)
         if self.grimoire and player_id in self.grimoire.players:
             await self.send_private_info(player_id)
             await self.send_public_state_to_player(player_id, "Welcome to the game!")
@@ -1243,34 +1416,36 @@ class GameManager:
                  await websocket.send_text(json.dumps({"type": "INFO", "payload": "Game not fully setup or player not in game. Waiting..."}))
             except KeyError as ke_initial_send:
                 if player_id == "ObserverClient":
-                    print(f"Handled known KeyError during initial send_text to ObserverClient: {repr(ke_initial_send)}")
+                    logger.debug("Handled known KeyError during initial send_text to ObserverClient: %r", ke_initial_send)
                     #log and continue, do not let it propagate
                 else:
-                    print(f"Unexpected KeyError during initial send_text to {player_id}: {repr(ke_initial_send)}")
+                    logger.error("Unexpected KeyError during initial send_text to %s: %r", player_id, ke_initial_send)
                     raise #re-raise for other clients
             except Exception as e_initial_send:
-                print(f"Error during initial send_text to {player_id}: {type(e_initial_send).__name__} - {e_initial_send}")
+                logger.error("Error during initial send_text to %s: %s - %s", player_id, type(e_initial_send).__name__, e_initial_send)
                 if player_id != "ObserverClient":
                     raise #re-raise for other clients if severe
 
     def disconnect(self, player_id: str):
         if player_id in self.active_connections:
             del self.active_connections[player_id]
-            print(f"Player {player_id} disconnected.")
+            logger.info("Player %s disconnected.", player_id)
+        self.llm_stream_subscribers.discard(player_id)
         if player_id in self.human_player_expected_actions:
-            self.human_player_expected_actions[player_id].cancel() #cancel pending future if player disconnects
-            del self.human_player_expected_actions[player_id]
+            _, future = self.human_player_expected_actions.pop(player_id)
+            if not future.done():
+                future.set_result(None) #a player who disconnects gives no answer, so the default applies
 
     async def send_personal_message(self, player_id: str, message_type: str, payload: Any):
         if player_id in self.active_connections:
             try:
                 await self.active_connections[player_id].send_text(json.dumps({"type": message_type, "payload": payload, "playerId": player_id}))
             except json.JSONDecodeError as je:
-                print(f"json encode error sending personal message to {player_id}: {je}")
+                logger.error("json encode error sending personal message to %s: %s", player_id, je)
             except KeyError as ke_send_personal:
-                print(f"keyerror sending personal message to {player_id}: {repr(ke_send_personal)}")
+                logger.error("keyerror sending personal message to %s: %r", player_id, ke_send_personal)
             except Exception as e:
-                print(f"error sending personal message to {player_id}: {type(e).__name__} - {e}")
+                logger.error("error sending personal message to %s: %s - %s", player_id, type(e).__name__, e)
                 #self.disconnect(player_id) #disconnecting here might be too aggressive
 
     async def broadcast_message(self, message_type: str, payload: Any, exclude_player_ids: List[str] = []):
@@ -1278,11 +1453,11 @@ class GameManager:
         try:
             message_str = json.dumps({"type": message_type, "payload": payload})
         except KeyError as ke_json_dump:
-            print(f"!!!! KEYERROR during json.dumps in broadcast_message: {repr(ke_json_dump)}. Payload was: {payload}")
+            logger.error("!!!! KEYERROR during json.dumps in broadcast_message: %r. Payload was: %s", ke_json_dump, payload)
             # If json.dumps fails, we can't proceed with broadcasting this message.
             return 
         except Exception as e_json_dump:
-            print(f"Error during json.dumps in broadcast_message: {type(e_json_dump).__name__} - {e_json_dump}. Payload was: {payload}")
+            logger.error("Error during json.dumps in broadcast_message: %s - %s. Payload was: %s", type(e_json_dump).__name__, e_json_dump, payload)
             return # Can't proceed
 
         for player_id, connection in list(self.active_connections.items()): # Iterate over a copy
@@ -1293,17 +1468,22 @@ class GameManager:
                     if player_id == "ObserverClient":
                         #specifically handle the known issue with observerclient
                         #observer may miss message
-                        print(f"Handled known KeyError during send_text to ObserverClient (observer may miss message): {repr(ke_broadcast_send)}")
+                        logger.debug("Handled known KeyError during send_text to ObserverClient (observer may miss message): %r", ke_broadcast_send)
                         #for now, just log and continue, preventing the error from propagating.
                     else:
                         #if keyerror happens for a non-observerclient during send_text, this is highly unusual.
                         #log it and re-raise as it might indicate a more severe problem.
-                        print(f"!!!! UNEXPECTED KEYERROR during send_text to {player_id} in broadcast_message: {repr(ke_broadcast_send)}")
+                        logger.error("!!!! UNEXPECTED KEYERROR during send_text to %s in broadcast_message: %r", player_id, ke_broadcast_send)
                         raise #re-raise for unexpected cases
                 except Exception as e:
-                    print(f"Error broadcasting to {player_id} (during send_text): {type(e).__name__} - {e}")
+                    logger.error("Error broadcasting to %s (during send_text): %s - %s", player_id, type(e).__name__, e)
                     # self.disconnect(player_id) # Consider if a disconnect is too aggressive here
     
+    async def forward_llm_stream(self, stream_event: Dict[str, Any]):
+        """Forward a streamed LLM chunk to subscribed clients so text appears as it is typed."""
+        for subscriber_id in list(self.llm_stream_subscribers):
+            await self.send_personal_message(subscriber_id, "LLM_STREAM", stream_event)
+
     async def send_public_state_to_player(self, player_id: str, reason: str):
         if not self.grimoire: return
         game_state_summary = self._get_public_game_state_summary(reason)
@@ -1316,24 +1496,22 @@ class GameManager:
     
     def _get_public_game_state_summary(self, reason:str) -> Dict[str, Any]:
         if not self.grimoire: return {}
-        public_player_data = []
-        for p_id in self.grimoire.players:
-            public_player_data.append({
-                "id": p_id,
-                "name": self.grimoire.game_state.get("player_names", {}).get(p_id, p_id),
-                "isAlive": self.grimoire.is_player_alive(p_id)
-            })
-        return {
-            "currentPhase": self.grimoire.current_phase,
-            "dayNumber": self.grimoire.day_number,
-            "players": public_player_data,
-            "nominee": self.grimoire.game_state.get("current_nominee_id"),
-            "reason": reason
-        }
+        # built once per grimoire version from one consistent snapshot and shared by every reader
+        summary = self.grimoire.view("public_summary", lambda snapshot: {
+            "currentPhase": snapshot.current_phase,
+            "dayNumber": snapshot.day_number,
+            "players": snapshot.view("public_players", public_players_view),
+            "nominee": snapshot.game_state.get("current_nominee_id")
+        })
+        return {**summary, "reason": reason}
+
+    def _perceived_role(self, player_id: str) -> Optional[str]:
+        """The role a player believes they have: a Drunk sees their fake Townsfolk role."""
+        return perceived_role(self.grimoire, player_id)
 
     async def send_private_info(self, player_id: str):
         if not self.grimoire or player_id not in self.grimoire.players: return
-        role = self.grimoire.get_player_role(player_id)
+        role = self._perceived_role(player_id)
         alignment = self.grimoire.get_player_alignment(player_id)
         role_details = get_role_details(role)
         
@@ -1345,100 +1523,97 @@ class GameManager:
         }
         #provide demon identification to roles that know the demon
         if role_details.get("knows_demon", False):
-            demon_ids = [pid for pid, r in self.grimoire.roles.items() if r == "Imp"]
+            demon_ids = self.grimoire.get_player_ids_by_type(RoleType.DEMON)
             if demon_ids:
                 private_payload["known_demon"] = demon_ids[0]
         #provide minion identification and bluffs to the demon
         if role == "Imp":
-            minion_ids = [pid for pid, r in self.grimoire.roles.items() if get_role_details(r)["type"] == RoleType.MINION]
+            minion_ids = self.grimoire.get_player_ids_by_type(RoleType.MINION)
             private_payload["known_minions"] = minion_ids
             private_payload["demon_bluffs"] = getattr(self.grimoire, "demon_bluffs", [])
         #provide fortune teller red herring if applicable
         if role_details.get("has_red_herring", False):
-            private_payload["red_herring"] = getattr(self.grimoire, "fortune_teller_red_herring", None)
+            private_payload["red_herring"] = self.grimoire.fortune_teller_red_herring_player_id
         #this method sends all private info updates to the player
         await self.send_personal_message(player_id, "PRIVATE_INFO_UPDATE", private_payload)
 
     async def run_game_loop(self):
-        print("Game loop waiting for game to be fully started (Storyteller LLM driven)...")
+        logger.info("Game loop waiting for game to be fully started (Storyteller LLM driven)...")
         await self._game_started_event.wait()
-        print("Game loop starting active processing (Storyteller LLM driven).")
+        logger.info("Game loop starting active processing (Storyteller LLM driven).")
 
         if not self.grimoire:
-            print("Game loop exiting: Grimoire not initialized by Storyteller LLM.")
+            logger.warning("Game loop exiting: Grimoire not initialized by Storyteller LLM.")
             return
 
         try:
             loop_iteration = 0
             while self.grimoire is not None and loop_iteration < 500:
                 loop_iteration += 1
-                print(f"--- Game Loop Iteration: {loop_iteration} ---")
+                logger.debug("--- Game Loop Iteration: %s ---", loop_iteration)
+                if self.grimoire.current_phase != self._phase_seen:
+                    self._phase_seen = self.grimoire.current_phase
+                    self._phase_started_at = time.monotonic()
+                    self._journal_snapshot()
                 # allow AI players to chat during day phase
                 if self.grimoire.current_phase == "DAY_CHAT":
                     game_state_summary = self._get_public_game_state_summary("AI communication round")
                     await self._process_ai_communication_round(game_state_summary)
-                current_context_lines = []
-                current_context_lines.append(f"EVENT: Start of game loop iteration {loop_iteration}.")
-                current_context_lines.append(f"GRIMOIRE_PHASE: {self.grimoire.current_phase}")
-                current_context_lines.append(f"GRIMOIRE_DAY: {self.grimoire.day_number}")
-                grimoire_summary = {
-                    "players": self.grimoire.players,
-                    "roles": self.grimoire.roles,
-                    "alignments": self.grimoire.alignments,
-                    "statuses": self.grimoire.statuses,
-                    "current_phase": self.grimoire.current_phase,
-                    "day_number": self.grimoire.day_number,
-                    "game_log_tail": self.grimoire.game_log[-5:]
-                }
-                current_context_lines.append(f"GRIMOIRE_SNAPSHOT: {json.dumps(grimoire_summary)}")
-                if self._daily_chat_log:
-                    current_context_lines.append(f"RECENT_PUBLIC_CHAT_LOG: {json.dumps(self._daily_chat_log[-10:])}")
-                
-                # Consolidate ALL submitted player actions for the ST LLM context
-                # This will now also include actions submitted by humans via handle_incoming_message
-                all_submitted_actions_for_st_llm = {}
-                if self.pending_storyteller_actions:
-                    for action_id, details in self.pending_storyteller_actions.items():
-                        if details["received_actions"]:
-                            all_submitted_actions_for_st_llm[action_id] = details["received_actions"]
-                
-                if all_submitted_actions_for_st_llm:
-                    current_context_lines.append(f"PLAYER_ACTIONS_COLLECTED_SO_FAR: {json.dumps(all_submitted_actions_for_st_llm)}")
-                
-                # Also explicitly state what is still pending, so LLM knows what it's waiting for vs what it received.
-                if self.pending_storyteller_actions:
-                     current_context_lines.append(f"PENDING_STORYTELLER_ACTIONS_OVERVIEW: {json.dumps({aid: list(data['received_actions'].keys()) for aid, data in self.pending_storyteller_actions.items()}) }")
+                # ask every night chooser at once before the Storyteller resolves the night
+                if (self.settings.auto_night_actions and night_key(self.grimoire.current_phase)
+                        and self._night_wave_done_for != (self.grimoire.current_phase, self.grimoire.day_number)):
+                    await self._run_night_wave()
+                # fill an open nomination slot by asking every eligible AI at once
+                if self.grimoire.current_phase == "NOMINATION" and self.nomination_engine:
+                    await self._run_nomination_slot()
+                # collect every AI vote on the current nominee at once
+                if self.grimoire.current_phase == "VOTING" and self.voting_engine:
+                    await self._run_vote()
+                # full anchor every few turns (or on phase change), otherwise only what changed since the last call
+                current_context_lines, is_anchor = self.storyteller_context.build(
+                    self.grimoire, loop_iteration, self._daily_chat_log, self.pending_storyteller_actions
+                )
 
-                print(f"Requesting commands from Storyteller LLM... Current Phase: {self.grimoire.current_phase}, Day: {self.grimoire.day_number}")
-                storyteller_commands = await self.storyteller_agent.generate_commands(current_context_lines)
-                print(f"Received {len(storyteller_commands)} commands from Storyteller LLM: {storyteller_commands}")
+                # optionally start likely AI decisions now so they run while the Storyteller deliberates
+                if self.settings.speculative_prefetch:
+                    self._prefetch_decisions()
+
+                logger.debug("Requesting commands from Storyteller LLM... Current Phase: %s, Day: %s", self.grimoire.current_phase, self.grimoire.day_number)
+                # commands are executed as soon as each one is streamed, while the rest are still being generated
+                command_stream = self.storyteller_agent.stream_session_commands(
+                    current_context_lines, phase=self.grimoire.current_phase, anchor=is_anchor
+                )
+                storyteller_commands = await self.command_executor.execute_stream(command_stream)
+                logger.debug("Executed %s streamed commands from Storyteller LLM: %s", len(storyteller_commands), storyteller_commands)
 
                 should_await_player_responses_this_cycle = False
                 active_await_action_ids = set() # Track action_ids we are actively awaiting this cycle
 
                 for command_obj in storyteller_commands:
-                    await self.execute_storyteller_command(command_obj)
                     if command_obj.get("command") == "AWAIT_PLAYER_RESPONSES":
                         should_await_player_responses_this_cycle = True
                         action_id = command_obj["params"].get("action_id")
                         if action_id: active_await_action_ids.add(action_id)
                     
                     if command_obj.get("command") == "END_GAME":
-                        print("Game loop ending due to END_GAME command from Storyteller.")
+                        logger.info("Game loop ending due to END_GAME command from Storyteller.")
                         return
                 
                 if not self.grimoire:
-                    print("Game loop ending as Grimoire is None.")
+                    logger.info("Game loop ending as Grimoire is None.")
                     break
 
                 # After executing ST LLM commands, check if we need to pause for player inputs
                 if should_await_player_responses_this_cycle:
-                    print(f"Game Loop: Pausing to collect player responses for action_ids: {active_await_action_ids} as per Storyteller LLM directive.")
+                    logger.debug("Game Loop: Pausing to collect player responses for action_ids: %s as per Storyteller LLM directive.", active_await_action_ids)
                     # The actual collection for AIs is triggered by REQUEST_PLAYER_ACTION creating tasks.
                     # For humans, REQUEST_PLAYER_ACTION sends them a message.
                     # We now need to wait until expected actions are filled or a timeout occurs.
                     # This loop iteration will end, and the next one will provide the updated pending_storyteller_actions to the ST LLM.
                     
+                    # Fill defaults for players past their action or phase deadline so the wait stays bounded
+                    self._enforce_deadlines(active_await_action_ids)
+
                     # Check if all expected actions for *any* of the active_await_action_ids are complete
                     all_awaited_actions_complete = True
                     for action_id in list(active_await_action_ids): # Iterate over a copy if we modify dict
@@ -1448,35 +1623,252 @@ class GameManager:
                             received = set(pending_action_details["received_actions"].keys())
                             if not expected.issubset(received):
                                 all_awaited_actions_complete = False
-                                print(f"Still waiting for actions from {list(expected - received)} for action_id '{action_id}'.")
+                                logger.debug("Still waiting for actions from %s for action_id '%s'.", list(expected - received), action_id)
                                 break # No need to check other action_ids if one is still pending
                             else:
-                                print(f"All actions for action_id '{action_id}' have been received.")
+                                logger.debug("All actions for action_id '%s' have been received.", action_id)
                                 # OPTIONAL: ST LLM could explicitly command to clear a pending action once resolved.
                                 # If not, it will keep seeing it in context. For now, leave it for ST LLM to manage.
                                 # For example, ST LLM might say: LOG_EVENT (action X resolved), then doesn't AWAIT X again.
                         else:
-                            print(f"Warning: Game loop was awaiting action_id '{action_id}' but it's no longer in pending_storyteller_actions.")
+                            logger.warning("Warning: Game loop was awaiting action_id '%s' but it's no longer in pending_storyteller_actions.", action_id)
                     
                     if not all_awaited_actions_complete:
                         await asyncio.sleep(1) # Wait before re-querying ST LLM if still waiting for players
                         continue # Go to next loop iteration to provide updated context (with any newly collected actions)
                     else:
-                        print("All actively awaited player responses received for this cycle. Proceeding to next ST LLM query without forced delay.")
+                        logger.debug("All actively awaited player responses received for this cycle. Proceeding to next ST LLM query without forced delay.")
                 
                 await asyncio.sleep(0.1) # Short pause if not awaiting
 
         except asyncio.CancelledError:
-            print("Game loop was cancelled.")
+            logger.info("Game loop was cancelled.")
         except Exception as e:
-            print(f"Critical error in game loop: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Critical error in game loop: %s", e)
         finally:
             self._game_started_event.clear()
-            print("Game loop ended.")
+            logger.info("Game loop ended.")
             self.pending_storyteller_actions = {}
 
+    def _enforce_deadlines(self, action_ids):
+        """Apply default actions for awaited players whose action deadline or phase deadline has passed."""
+        now = time.monotonic()
+        phase = self.grimoire.current_phase if self.grimoire else None
+        phase_limit = self.settings.phase_deadlines.get(phase)
+        phase_expired = bool(phase_limit) and now - self._phase_started_at > phase_limit
+        for action_id in action_ids:
+            pending = self.pending_storyteller_actions.get(action_id)
+            if not pending:
+                continue
+            for player_id in pending["expected_players"]:
+                if player_id in pending["received_actions"]:
+                    continue
+                request = self._action_requests.get((action_id, player_id), {})
+                action_type = request.get("action_type")
+                limit = self._action_deadline(action_type)
+                waited = now - request.get("requested_at", self._phase_started_at)
+                if limit and waited > limit:
+                    scope = "action"
+                elif phase_expired:
+                    scope = "phase"
+                else:
+                    continue
+                pending["received_actions"][player_id] = default_action(action_type, player_id)
+                self.deadline_metrics.record(player_id, action_type, phase, waited, scope)
+                #cancel the straggler so its LLM slot is released
+                task = self._action_tasks.pop((action_id, player_id), None)
+                if task and not task.done():
+                    task.cancel()
+
+    async def _run_night_wave(self):
+        """
+        Request every alive chooser's night action in one concurrent wave, using the precomputed wake order.
+        AI decisions share a single context build and are awaited together; humans are prompted and their
+        answers arrive through the usual pending-action path. Info roles are left to the Storyteller.
+        """
+        phase = self.grimoire.current_phase
+        day = self.grimoire.day_number
+        self._night_wave_done_for = (phase, day)
+        plan = plan_night(self.grimoire, phase)
+        action_id = f"night_wave_{phase.lower()}_{day}"
+        self.pending_storyteller_actions[action_id] = {"expected_players": list(plan["choosers"]), "received_actions": {}}
+        self.grimoire.log_event("NIGHT_WAVE", {
+            "action_id": action_id,
+            "wake_order": list(wake_order(phase)),
+            "choosers_in_wake_order": [{"player_id": pid, "role": perceived_role(self.grimoire, pid)} for pid in plan["choosers"]],
+            "info_roles_in_wake_order": [{"player_id": pid, "role": perceived_role(self.grimoire, pid)} for pid in plan["info"]]
+        })
+        if not plan["choosers"]:
+            return
+
+        action_type = "NIGHT_ACTION_WAVE"
+        shared_context = self._build_action_context(action_type, {"current_phase": phase})
+        for player_id in plan["choosers"]:
+            self._action_requests[(action_id, player_id)] = {"action_type": action_type, "requested_at": time.monotonic()}
+        logger.debug("Night wave '%s': asking %s at once.", action_id, plan['choosers'])
+        async with asyncio.TaskGroup() as task_group:
+            for player_id in plan["choosers"]:
+                if player_id in self.agents:
+                    task_group.create_task(self._get_ai_player_action(player_id, action_id, action_type, {}, shared_context=shared_context))
+                else:
+                    task_group.create_task(self.execute_storyteller_command({"command": "REQUEST_PLAYER_ACTION", "params": {
+                        "player_id": player_id, "action_id": action_id, "action_type": action_type,
+                        "action_details": {"role": perceived_role(self.grimoire, player_id), "current_phase": phase}
+                    }}))
+
+        # a Butler's choice is their master for tomorrow's votes
+        for player_id, action in self.pending_storyteller_actions[action_id]["received_actions"].items():
+            if self.grimoire.get_player_role(player_id) == "Butler" and isinstance(action, dict) and action.get("targets"):
+                self.grimoire.update_status(player_id, "butler_master", action["targets"][0])
+
+    async def _run_nomination_slot(self):
+        """
+        Solicit nomination intents from every eligible player concurrently and apply the first valid one in
+        seat order. Humans are asked through REQUEST_NOMINATION under the nomination deadline, so the day
+        only closes once every eligible player, human or AI, has passed.
+        """
+        engine = self.nomination_engine
+        engine.start_day()
+        if not engine.slot_open():
+            return
+        player_names = self.grimoire.game_state.get("player_names", {})
+        decide = self._speculative(self._nomination_decider(), "NOMINATION", None)
+        nomination = await engine.run_slot(decide, spawn=lambda coro: self.task_supervisor.spawn(coro, kind="nomination"))
+        self._nomination_order = list(engine.order)
+        self._current_nominating_player_index = engine.next_index
+        if nomination:
+            nominator_name = player_names.get(nomination["nominator_id"], nomination["nominator_id"])
+            nominee_name = player_names.get(nomination["nominee_id"], nomination["nominee_id"])
+            for agent in self.agents.values():
+                agent.update_memory("NOMINATION_EVENT", nomination)
+            await self.broadcast_game_event(f"{nominator_name} nominates {nominee_name}.")
+            await self.broadcast_game_state("Nomination made")
+        else:
+            await self.broadcast_game_event("No further nominations today.")
+
+    def stamp(self) -> Dict[str, Any]:
+        """Next {seq, mono_ns, timestamp} from the current game's clock (empty between games)."""
+        return self.grimoire.clock.stamp() if self.grimoire else {}
+
+    def _nomination_decider(self):
+        """Build the per-player nomination decision for the open slot; one shared context for everyone asked."""
+        engine = self.nomination_engine
+        shared_context = self._build_action_context("NOMINATION_CHOICE", {})
+        previous_noms_today = [log["data"] for log in self.grimoire.game_log if log["event_type"] == "NOMINATION" and log["data"].get("day") == self.grimoire.day_number]
+        player_names = self.grimoire.game_state.get("player_names", {})
+
+        async def decide(player_id: str) -> Optional[str]:
+            nominees = [{"id": pid, "name": player_names.get(pid, pid)} for pid in engine.eligible_nominees(player_id)]
+            if player_id not in self.agents:
+                answer = await self._ask_human(player_id, "REQUEST_NOMINATION", "NOMINATION_CHOICE",
+                                               {"nominees": nominees, "previous_nominations": previous_noms_today})
+                return answer and (answer.get("nominee_id") or answer.get("nominated_player_id"))
+            context = dict(shared_context)
+            context["available_actions"] = self.get_available_actions(player_id, "NOMINATION_CHOICE")
+            return await self._await_with_deadline(
+                self.agents[player_id].decide_nomination(context, nominees, previous_noms_today), player_id, "NOMINATION_CHOICE"
+            )
+        return decide
+
+    async def _ask_human(self, player_id: str, message_type: str, action_type: str, details: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Send a human player a decision request and wait for their reply under the action deadline.
+        Returns the reply payload, or None if they are not connected, disconnect, or let the deadline pass.
+        """
+        if player_id not in self.active_connections:
+            return None
+        action_id = f"{action_type}_{next(self._human_request_ids)}"
+        future = asyncio.get_running_loop().create_future()
+        self.human_player_expected_actions[player_id] = (action_id, future)
+        try:
+            await self.send_personal_message(player_id, message_type, {"action_id": action_id, **details})
+            answer = await self._await_with_deadline(future, player_id, action_type)
+            return answer if isinstance(answer, dict) else None
+        finally:
+            if self.human_player_expected_actions.get(player_id, (None,))[0] == action_id:
+                del self.human_player_expected_actions[player_id]
+
+    def _vote_decider(self, nominee_id: str):
+        """Build the per-voter decision on a nominee; every voter shares one immutable context."""
+        nominee_name = self.grimoire.game_state.get("player_names", {}).get(nominee_id, nominee_id)
+        vote_context = self.voting_engine.build_context(self._build_action_context("VOTE_CHOICE", {
+            "nominee_id": nominee_id,
+            "available_actions": self.get_available_actions(nominee_id, "VOTE_CHOICE")  # the same for every voter
+        }))
+
+        async def decide(voter_id: str) -> Optional[bool]:
+            dead_vote = not self.grimoire.is_player_alive(voter_id)
+            if voter_id not in self.agents:
+                answer = await self._ask_human(voter_id, "REQUEST_VOTE", "VOTE_CHOICE",
+                                               {"nominee_id": nominee_id, "nominee_name": nominee_name, "dead_vote": dead_vote})
+                vote = answer.get("vote") if answer else False
+                return vote.strip().upper() in ("YES", "TRUE") if isinstance(vote, str) else bool(vote)
+            return await self._await_with_deadline(
+                self.agents[voter_id].decide_vote(vote_context, nominee_id, nominee_name, dead_vote=dead_vote), voter_id, "VOTE_CHOICE", default=False
+            )
+        return decide
+
+    def _speculation_key(self, kind: str, player_id: str, subject: Optional[str]):
+        return speculation_key(kind, player_id, subject, self.grimoire.public_version, len(self._daily_chat_log))
+
+    def _speculative(self, decide, kind: str, subject: Optional[str]):
+        """Wrap a decision so a matching speculative result is used instead of a fresh LLM call."""
+        if not self.settings.speculative_prefetch:
+            return decide
+        self.speculation.discard_stale(lambda key: key[3:] == (self.grimoire.public_version, len(self._daily_chat_log)))
+
+        async def decide_or_take(player_id: str):
+            found, result = await self.speculation.take(self._speculation_key(kind, player_id, subject))
+            return result if found else await decide(player_id)
+        return decide_or_take
+
+    def _prefetch_decisions(self):
+        """
+        Start the decisions the next loop iteration will most likely ask for: nomination intents while a
+        slot is open during the day, and votes on the current nominee. Runs alongside the Storyteller call.
+        """
+        if not self.grimoire or not self.agents:
+            return
+        phase = self.grimoire.current_phase
+        self.speculation.discard_stale(lambda key: key[3:] == (self.grimoire.public_version, len(self._daily_chat_log)))
+        engine = self.nomination_engine
+        nominee_id = self.grimoire.game_state.get("current_nominee_id")
+        #read-only: only _run_nomination_slot opens the day (start_day), so speculation never touches the log or journal
+        if phase in ("DAY_CHAT", "NOMINATION") and engine and not nominee_id and engine.day == self.grimoire.day_number:
+            if engine.slot_open():
+                decide = self._nomination_decider()
+                for player_id in engine.eligible_nominators(self.agents.keys()):
+                    self.speculation.prefetch(self._speculation_key("NOMINATION", player_id, None), lambda pid=player_id: decide(pid))
+        if phase in ("NOMINATION", "VOTING") and self.voting_engine and nominee_id and not self.voting_engine.already_tallied(nominee_id):
+            decide = self._vote_decider(nominee_id)
+            for voter_id in self.voting_engine.eligible_voters():
+                if voter_id in self.agents:
+                    self.speculation.prefetch(self._speculation_key("VOTE", voter_id, nominee_id), lambda pid=voter_id: decide(pid))
+
+    async def _run_vote(self):
+        """
+        Ask every eligible voter about the current nominee concurrently, streaming each vote to clients as it
+        lands and logging a local VOTE_TALLY. AIs share one immutable context; humans are asked through
+        REQUEST_VOTE under the vote deadline (no answer counts as NO).
+        """
+        nominee_id = self.grimoire.game_state.get("current_nominee_id")
+        if not nominee_id or self.voting_engine.already_tallied(nominee_id):
+            return
+        player_names = self.grimoire.game_state.get("player_names", {})
+        nominee_name = player_names.get(nominee_id, nominee_id)
+        voters = self.voting_engine.eligible_voters()
+        decide = self._speculative(self._vote_decider(nominee_id), "VOTE", nominee_id)
+
+        async def on_vote(vote_event: Dict[str, Any]):
+            vote_event["voter_name"] = player_names.get(vote_event["voter_id"], vote_event["voter_id"])
+            await self.broadcast_message("VOTE_CAST", vote_event)
+
+        logger.debug("Collecting votes on %s from %s at once.", nominee_name, voters)
+        result = await self.voting_engine.run_vote(nominee_id, voters, decide, on_vote=on_vote,
+                                                   spawn=lambda coro: self.task_supervisor.spawn(coro, kind="vote"))
+        await self.broadcast_message("VOTE_TALLY", result)
+        await self.broadcast_game_event(f"{result['votes_for']} vote(s) to execute {nominee_name} ({result['required']} needed).")
+
     async def broadcast_player_roles(self, roles_info: List[Dict[str, str]]):
         """Broadcasts all player roles to all connected clients (for observer mode)."""
         await self.broadcast_message("PLAYER_ROLES_UPDATE", {"roles": roles_info})
@@ -1490,14 +1882,14 @@ class GameManager:
         recipient_agent = self.agents.get(recipient_id)
         sender_agent_name = self.grimoire.game_state.get("player_names", {}).get(sender_id, sender_id)
         if recipient_agent and hasattr(recipient_agent, 'receive_private_message'):
-            print(f"Delivering private message from {sender_agent_name} ({sender_id}) to {recipient_id}")
+            logger.debug("Delivering private message from %s (%s) to %s", sender_agent_name, sender_id, recipient_id)
             await recipient_agent.receive_private_message(sender_id=sender_id, sender_name=sender_agent_name, message_text=message_text)
             # Optionally, inform the sender that their private message was delivered (e.g., for logging or confirmation)
             # sender_agent = self.agents.get(sender_id)
             # if sender_agent and hasattr(sender_agent, 'confirm_private_message_delivered'):
             #     await sender_agent.confirm_private_message_delivered(recipient_id, message_text)
         else:
-            print(f"Could not deliver private AI message: Recipient {recipient_id} not found or cannot receive private messages.")
+            logger.warning("Could not deliver private AI message: Recipient %s not found or cannot receive private messages.", recipient_id)
 
     async def _process_ai_communication_round(self, game_state_summary_for_ai: Dict[str, Any]):
         """
@@ -1526,15 +1918,17 @@ class GameManager:
                     "daily_chat_log": list(self._daily_chat_log), # Pass a copy
                     "all_players_details": all_player_details_for_prompt # List of {'id', 'name', 'is_alive'}
                 }
-                communication_tasks[agent_id] = asyncio.create_task(
-                    agent.decide_communication(current_game_state_for_agent)
-                )
+                task = self.task_supervisor.spawn(self._await_with_deadline(
+                    agent.decide_communication(current_game_state_for_agent), agent_id, "COMMUNICATION_CHOICE"
+                ), kind="communication")
+                if task:
+                    communication_tasks[agent_id] = task
         
         processed_communications = await asyncio.gather(*communication_tasks.values(), return_exceptions=True)
 
         for agent_id, result in zip(communication_tasks.keys(), processed_communications):
-            if isinstance(result, Exception):
-                print(f"Error getting communication decision from AI {agent_id}: {result}")
+            if isinstance(result, BaseException): # includes cancellation when the game ends mid-round
+                logger.error("Error getting communication decision from AI %s: %r", agent_id, result)
                 continue
             
             if not result: # AI chose to be silent or error
@@ -1546,14 +1940,15 @@ class GameManager:
             sender_name = self.grimoire.game_state.get("player_names", {}).get(agent_id, agent_id)
 
             if comm_type == "PUBLIC_CHAT" and text:
-                print(f"AI {sender_name} ({agent_id}) public chat: {text}")
+                logger.debug("AI %s (%s) public chat: %s", sender_name, agent_id, text, extra={"sample": "CHAT"})
+                stamp = self.stamp()
                 chat_event = {
                     "sender": agent_id,
                     "sender_name": sender_name,
                     "text": text,
-                    "timestamp": "#placeholder_timestamp#" 
+                    **stamp
                 }
-                self.grimoire.log_event("CHAT", chat_event)
+                self.grimoire.log_event("CHAT", chat_event, stamp=stamp)
                 self._daily_chat_log.append(chat_event)
                 await self.broadcast_message("CHAT_MESSAGE", chat_event)
                 # update all AI memories with public chat
@@ -1561,21 +1956,21 @@ class GameManager:
                     agent.update_memory("CHAT_MESSAGE", chat_event)
             elif comm_type == "PRIVATE_CHAT" and text and recipient_id:
                 if recipient_id != agent_id and recipient_id in self.agents: # Cannot private chat self, must be valid AI
-                    print(f"AI {sender_name} ({agent_id}) sending private message to {recipient_id}: {text}")
+                    logger.debug("AI %s (%s) sending private message to %s: %s", sender_name, agent_id, recipient_id, text)
                     await self._deliver_private_ai_message(agent_id, recipient_id, text)
                 elif recipient_id == agent_id:
-                    print(f"AI {sender_name} ({agent_id}) tried to send private message to self. Ignored.")
+                    logger.warning("AI %s (%s) tried to send private message to self. Ignored.", sender_name, agent_id)
                 else:
-                    print(f"AI {sender_name} ({agent_id}) tried to send private message to invalid recipient {recipient_id}. Ignored.")
+                    logger.warning("AI %s (%s) tried to send private message to invalid recipient %s. Ignored.", sender_name, agent_id, recipient_id)
             elif comm_type == "SILENT":
-                print(f"AI {sender_name} ({agent_id}) chose to remain silent.")
+                logger.debug("AI %s (%s) chose to remain silent.", sender_name, agent_id)
             # else: AI returned an unexpected communication type or was None
 
     async def handle_incoming_message(self, player_id: str, raw_data: str):
         try:
             msg = json.loads(raw_data)
         except json.JSONDecodeError:
-            print(f"failed to decode message from {player_id}: {raw_data}")
+            logger.error("failed to decode message from %s: %s", player_id, raw_data)
             return
 
         msg_type = msg.get("type")
@@ -1613,13 +2008,16 @@ class GameManager:
             # Create a mapping of player IDs to random names
             player_names_mapping = {pid: random_names[i] for i, pid in enumerate(default_player_ids)}
             
-            print(f"Starting {num_players}-player game with roles: {dict(zip(player_names_mapping.values(), selected_roles))}")
+            logger.info("Starting %s-player game with roles: %s", num_players, dict(zip(player_names_mapping.values(), selected_roles)))
             await self.setup_new_game(player_ids_roles, human_player_ids=[], player_names=player_names_mapping)
 
         elif msg_type == "CHAT_MESSAGE":
             # record and broadcast public chat from human
             text = payload.get("text") if isinstance(payload, dict) else payload
-            chat_event = {"sender": player_id, "sender_name": self.grimoire.game_state.get("player_names", {}).get(player_id, player_id), "text": text, "timestamp": "#timestamp#"}
+            stamp = self.stamp()
+            chat_event = {"sender": player_id, "sender_name": self.grimoire.game_state.get("player_names", {}).get(player_id, player_id), "text": text, **stamp}
+            if self.grimoire:
+                self.grimoire.log_event("CHAT", chat_event, stamp=stamp) #journaled like AI chat, so recovery and replays keep it
             self._daily_chat_log.append(chat_event)
             await self.broadcast_message("CHAT_MESSAGE", chat_event)
             # update AI memories for human chat
@@ -1629,9 +2027,12 @@ class GameManager:
         elif msg_type in ("REQUEST_NIGHT_ACTION_RESPONSE", "REQUEST_NOMINATION", "REQUEST_VOTE", "REQUEST_CHAT_DECISION", "REQUEST_GENERIC_ACTION"):
             # human response to Storyteller action prompt
             action_id = payload.get("action_id") if isinstance(payload, dict) else None
-            if action_id and action_id in self.pending_storyteller_actions:
+            expected_id, future = self.human_player_expected_actions.get(player_id, (None, None))
+            if action_id and action_id == expected_id and not future.done():
+                future.set_result(payload) #answer to a nomination/vote request from the engines (see _ask_human)
+            elif action_id and action_id in self.pending_storyteller_actions:
                 self.pending_storyteller_actions[action_id]["received_actions"][player_id] = payload
-                print(f"received human action for {player_id}, action_id {action_id}: {payload}")
+                logger.debug("received human action for %s, action_id %s: %s", player_id, action_id, payload)
 
         elif msg_type == "REQUEST_MEMORY":
             requested = payload.get("player_id")
@@ -1640,7 +2041,14 @@ class GameManager:
                 player_perspective = self._get_player_perspective(requested)
                 await self.send_personal_message(player_id, "MEMORY_UPDATE", {"player_id": requested, "perspective": player_perspective})
             else:
-                print(f"REQUEST_MEMORY for unknown player {requested}")
+                logger.warning("REQUEST_MEMORY for unknown player %s", requested)
+
+        elif msg_type == "SUBSCRIBE_LLM_STREAM":
+            self.llm_stream_subscribers.add(player_id)
+            await self.send_personal_message(player_id, "INFO", "subscribed to llm streams")
+
+        elif msg_type == "UNSUBSCRIBE_LLM_STREAM":
+            self.llm_stream_subscribers.discard(player_id)
 
         elif msg_type == "REQUEST_SETTINGS":
             # send current settings to the requesting client
@@ -1649,8 +2057,15 @@ class GameManager:
         elif msg_type == "UPDATE_SETTINGS":
             # update settings from client
             if payload and isinstance(payload, dict):
-                self.settings.update_from_dict(payload)
-                print(f"settings updated by {player_id}: {self.settings.to_dict()}")
+                try:
+                    self.settings.update_from_dict(payload)
+                except ValueError as e:
+                    await self.send_personal_message(player_id, "ERROR", f"invalid settings: {e}")
+                    return
+                set_verbose(self.settings.verbose_logging)
+                logger.info("settings updated by %s: %s", player_id, self.settings.to_dict())
+                self.storyteller_context.reanchor_every = self.settings.storyteller_reanchor_interval
+                self.command_executor.max_concurrency = self.settings.max_concurrent_commands
                 # apply settings to existing agents if game is running
                 if self.agents:
                     for agent in self.agents.values():
@@ -1663,7 +2078,7 @@ class GameManager:
                 await self.send_personal_message(player_id, "ERROR", "invalid settings payload")
 
         else:
-            print(f"unknown message type from {player_id}: {msg_type}")
+            logger.warning("unknown message type from %s: %s", player_id, msg_type)
 
     def _get_player_perspective(self, player_id: str) -> Dict[str, Any]:
         """Get a formatted view of the game from a specific player's perspective"""
@@ -1689,14 +2104,14 @@ class GameManager:
             "my_actions": {
                 "votes_cast": agent.memory.get("votes", []),
                 "nominations_made": agent.memory.get("nominations", []),
-                "actions_taken": agent.memory.get("actions_taken", [])
+                "actions_taken": list(agent.memory.get("actions_taken", []))
             },
             "my_observations": {
                 "important_events": agent.memory.get("important_events", []),
-                "observations": agent.memory.get("observations", [])
+                "observations": list(agent.memory.get("observations", []))
             },
             "communications": {
-                "public_chat_log": agent.memory.get("public_chat_log", []),
+                "public_chat_log": list(agent.memory.get("public_chat_log", [])), #paged memory lists are sent in full
                 "private_conversations": self._format_private_conversations(agent.memory.get("private_chat_logs", {}))
             },
             "game_context": {
@@ -1726,10 +2141,11 @@ player_names = game_manager.grimoire.game_state.get("player_names", {}) if game_
 
 @app.on_event("startup")
 async def startup_event():
-    print("Server starting up...")
+    configure_logging(verbose=game_manager.settings.verbose_logging)
+    logger.info("Server starting up...")
     # Game setup is now triggered by a client message for more control during dev
     # Example: send {"type": "REQUEST_GAME_START"} from client to trigger setup below.
-    print("Game will be set up upon client request using 'REQUEST_GAME_START' message.")
+    logger.info("Game will be set up upon client request using 'REQUEST_GAME_START' message.")
 
 @app.get("/") #temp endpoint for testing client html
 async def get_client_html():
@@ -1747,15 +2163,15 @@ async def websocket_endpoint(websocket: WebSocket, player_id: str):
                 raise
             except KeyError as ke_recv:
                 if player_id == "ObserverClient" and ke_recv.args == ('name',):
-                    print(f"Handled known KeyError('name') during receive_text for ObserverClient: {repr(ke_recv)}. Disconnecting observer.")
+                    logger.debug("Handled known KeyError('name') during receive_text for ObserverClient: %r. Disconnecting observer.", ke_recv)
                     game_manager.disconnect(player_id) #ensure disconnection
                     return #exit the while True loop and thus the endpoint function
                 else:
                     #log other KeyErrors or for other clients before re-raising
-                    print(f"KeyError during websocket.receive_text() for {player_id}: ExceptionType={type(ke_recv)}, Args={ke_recv.args}, ExceptionRepr={repr(ke_recv)}")
+                    logger.error("KeyError during websocket.receive_text() for %s: ExceptionType=%s, Args=%s, ExceptionRepr=%r", player_id, type(ke_recv), ke_recv.args, ke_recv)
                     raise #re-raise
             except Exception as e_recv:
-                print(f"Error specifically during websocket.receive_text() for {player_id}: ExceptionType={type(e_recv)}, Args={e_recv.args}, ExceptionRepr={repr(e_recv)}")
+                logger.error("Error specifically during websocket.receive_text() for %s: ExceptionType=%s, Args=%s, ExceptionRepr=%r", player_id, type(e_recv), e_recv.args, e_recv)
                 raise # Re-raise to be caught by the outer loop
             await game_manager.handle_incoming_message(player_id, data)
     except WebSocketDisconnect:
@@ -1781,7 +2197,7 @@ async def websocket_endpoint(websocket: WebSocket, player_id: str):
         except Exception as e_scope:
             scope_info = f"[Could not retrieve websocket.scope due to: {type(e_scope).__name__}]"
 
-        print(f"Error in WebSocket connection for {player_id}: OriginalExceptionType={err_type_name}, OriginalArgs={err_args_str}, OriginalReprAttempt={err_repr_str}, Scope={scope_info}")
+        logger.error("Error in WebSocket connection for %s: OriginalExceptionType=%s, OriginalArgs=%s, OriginalReprAttempt=%s, Scope=%s", player_id, err_type_name, err_args_str, err_repr_str, scope_info)
         game_manager.disconnect(player_id)
 
 #add endpoint to save game logs chronologically in a json file
@@ -1799,14 +2215,14 @@ async def save_logs():
             "players_count": len(game_manager.grimoire.players),
             "game_started": game_manager._game_started_event.is_set()
         },
-        "game_log": sorted(game_manager.grimoire.game_log, key=lambda e: e["timestamp"]),
+        "game_log": game_manager.grimoire.game_log, #already in seq order
         "storyteller_log": game_manager.grimoire.storyteller_log,
         "daily_chat_log": game_manager._daily_chat_log,
         "game_state": {
             "players": game_manager.grimoire.players,
             "roles": game_manager.grimoire.roles,
             "alignments": game_manager.grimoire.alignments,
-            "statuses": game_manager.grimoire.statuses,
+            "statuses": {pid: dict(status) for pid, status in game_manager.grimoire.statuses.items()},
             "demon_bluffs": game_manager.grimoire.demon_bluffs,
             "fortune_teller_red_herring_player_id": game_manager.grimoire.fortune_teller_red_herring_player_id,
             "current_demon_player_id": game_manager.grimoire.current_demon_player_id,
@@ -1844,7 +2260,7 @@ async def save_logs():
     filepath = os.path.join("logs", filename)
     
     with open(filepath, "w") as f:
-        json.dump(comprehensive_logs, f, indent=2, default=str)
+        json.dump(comprehensive_logs, f, indent=2, default=json_default) #pages spilled log entries back in
     
     return {"message": "comprehensive logs saved successfully", "filepath": filepath}
 
@@ -1870,7 +2286,8 @@ async def get_bot_debug_info():
             },
             "stats": {
                 "total_decisions": len(game_manager.grimoire.storyteller_log),
-                "game_events_processed": len(game_manager.grimoire.game_log)
+                "game_events_processed": len(game_manager.grimoire.game_log),
+                "recent_command_timings": list(game_manager.command_executor.timings)[-20:]
             }
         },
         "players": {}
@@ -1895,12 +2312,27 @@ async def get_bot_debug_info():
             "stats": {
                 "actions_taken": len(agent.memory.get("actions_taken", [])),
                 "observations_made": len(agent.memory.get("observations", [])),
-                "votes_cast": len(agent.memory.get("votes", []))
+                "votes_cast": len(agent.memory.get("votes", [])),
+                "decision_memo": agent.decision_memo.stats() if hasattr(agent, "decision_memo") else None
             }
         }
     
     return bot_info
 
+@app.get("/debug/metrics")
+async def get_debug_metrics():
+    """Runtime metrics: deadline misses per action type and phase, supervised task counts, speculation hit rate, journal and log sizes, LLM retries, circuit breakers and adaptive rate targets."""
+    return {
+        "deadlines": game_manager.deadline_metrics.to_dict(),
+        "tasks": game_manager.task_supervisor.stats(),
+        "speculation": game_manager.speculation.stats(),
+        "journal": game_manager.journal.stats() if game_manager.journal else None,
+        "llm": llm_resilience_stats(),
+        "llm_rate_control": rate_control_stats(),
+        "logs": {"game_log": game_manager.grimoire.game_log.stats(),
+                 "storyteller_log": game_manager.grimoire.storyteller_log.stats()} if game_manager.grimoire else None
+    }
+
 @app.get("/settings")
 async def get_settings():
     """get current game settings"""
@@ -1911,6 +2343,9 @@ async def update_settings(settings_update: dict):
     """update game settings"""
     try:
         game_manager.settings.update_from_dict(settings_update)
+        set_verbose(game_manager.settings.verbose_logging)
+        game_manager.storyteller_context.reanchor_every = game_manager.settings.storyteller_reanchor_interval
+        game_manager.command_executor.max_concurrency = game_manager.settings.max_concurrent_commands
         #apply settings to existing agents if game is running
         if game_manager.agents:
             for agent in game_manager.agents.values():
@@ -1919,6 +2354,74 @@ async def update_settings(settings_update: dict):
     except Exception as e:
         return {"error": f"failed to update settings: {str(e)}"}
 
+def _journal_path(journal: Optional[str]) -> Optional[str]:
+    """A journal file in journal_dir (only its base name is used), or the most recent one; None if there is none."""
+    directory = game_manager.settings.journal_dir
+    if journal is None:
+        journals = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".jsonl")] if os.path.isdir(directory) else []
+        return max(journals, key=os.path.getmtime) if journals else None
+    path = os.path.join(directory, os.path.basename(journal))
+    return path if os.path.exists(path) else None
+
+@app.post("/recover")
+async def recover_game(journal: Optional[str] = None):
+    """Rebuild and resume a game from its journal (a file name in journal_dir; default: the most recent journal)"""
+    path = _journal_path(journal)
+    if path is None:
+        return {"error": f"journal not found: {journal}" if journal else "no game journal to recover from"}
+    try:
+        return await game_manager.recover_game(path)
+    except (ValueError, KeyError) as e:
+        return {"error": f"failed to recover game: {str(e)}"}
+
+async def _seek_replay(journal: str, position: Optional[int], seq: Optional[int], phase: Optional[str], day: Optional[int]):
+    path = _journal_path(journal)
+    if path is None:
+        raise KeyError(f"journal not found: {journal}")
+    #indexing reads the whole journal once (then it is cached), so keep it off the event loop
+    replay = await asyncio.to_thread(load_replay, path, game_manager.settings.replay_checkpoint_interval)
+    position, grimoire = replay.seek(position, seq=seq, phase=phase, day=day)
+    return replay, position, grimoire
+
+@app.get("/replay/{journal}")
+async def get_replay_state(journal: str, position: Optional[int] = None, seq: Optional[int] = None,
+                           phase: Optional[str] = None, day: Optional[int] = None):
+    """Observer view of an archived game at one point: a position, an event seq, or a phase and/or day"""
+    started = time.perf_counter()
+    try:
+        replay, position, grimoire = await _seek_replay(journal, position, seq, phase, day)
+    except KeyError as e:
+        return {"error": str(e).strip("'")}
+    return {
+        "position": position,
+        "length": replay.length,
+        "seek_ms": round((time.perf_counter() - started) * 1000, 2),
+        "currentPhase": grimoire.current_phase,
+        "dayNumber": grimoire.day_number,
+        "players": grimoire.get_all_player_info_for_observer(),
+        "game_state": grimoire.game_state,
+        "events": len(grimoire.game_log),
+        "index": replay.stats()
+    }
+
+@app.get("/replay/{journal}/stream")
+async def stream_replay(journal: str, speed: float = 1.0, position: Optional[int] = None, seq: Optional[int] = None,
+                        phase: Optional[str] = None, day: Optional[int] = None):
+    """Stream an archived game as observer messages (NDJSON) from a seek point, paced by its clock times `speed`x (0 = no pauses)"""
+    try:
+        replay, position, grimoire = await _seek_replay(journal, position, seq, phase, day)
+    except KeyError as e:
+        return {"error": str(e).strip("'")}
+    max_gap = game_manager.settings.replay_max_gap_seconds
+
+    async def messages():
+        for delay, message in replay_messages(replay, position, grimoire):
+            if speed > 0 and delay > 0:
+                await asyncio.sleep(min(delay / speed, max_gap))
+            yield json.dumps(message, default=str) + "\n"
+
+    return StreamingResponse(messages(), media_type="application/x-ndjson")
+
 def generate_random_player_names(count: int) -> List[str]:
     """Generate a list of random player names for AI players."""
     first_names = [
@@ -1957,7 +2460,8 @@ def generate_random_player_names(count: int) -> List[str]:
     return names
 
 if __name__ == "__main__":
-    print("Starting game server on http://localhost:8000")
-    print("Open http://localhost:8000 in a browser to observe.")
-    print("Ensure GOOGLE_API_KEY environment variable is set for AI players.")
+    configure_logging()
+    logger.info("Starting game server on http://localhost:8000")
+    logger.info("Open http://localhost:8000 in a browser to observe.")
+    logger.info("Ensure GOOGLE_API_KEY environment variable is set for AI players.")
     uvicorn.run("backend.main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
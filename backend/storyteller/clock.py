@@ -0,0 +1,34 @@
+#backend/storyteller/clock.py
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict
+
+class GameClock:
+    """
+    Per-game clock for events, chat, commands and LLM calls. Every stamp carries a sequence number (a total
+    order across the game, so logs never need re-sorting), a monotonic nanosecond reading for latencies and
+    a wall-clock timestamp derived from it.
+    """
+
+    def __init__(self):
+        self.seq = 0 #last sequence number handed out
+        self.started_mono_ns = time.monotonic_ns()
+        self.started_wall_ns = time.time_ns()
+
+    def stamp(self) -> Dict[str, Any]:
+        mono_ns = time.monotonic_ns()
+        self.seq += 1
+        return {"seq": self.seq, "mono_ns": mono_ns, "timestamp": self.wall_time(mono_ns)}
+
+    def resume(self, seq: int):
+        """Continue numbering after `seq` (a recovered game). Monotonic readings restart with the new process."""
+        self.seq = max(self.seq, seq)
+
+    def wall_time(self, mono_ns: int) -> str:
+        """ISO wall-clock time for a monotonic reading (anchored at game start, so it never goes backwards)."""
+        wall_ns = self.started_wall_ns + (mono_ns - self.started_mono_ns)
+        return datetime.fromtimestamp(wall_ns / 1e9, tz=timezone.utc).isoformat(timespec="microseconds")
+
+    @staticmethod
+    def elapsed_ms(start: Dict[str, Any], end: Dict[str, Any]) -> float:
+        return (end["mono_ns"] - start["mono_ns"]) / 1e6
@@ -0,0 +1,145 @@
+#backend/storyteller/command_executor.py
+import asyncio
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional
+from ..utils.logger import get_logger
+
+logger = get_logger("storyteller")
+
+#commands that only deliver messages or spawn player requests; they never mutate the grimoire
+CONCURRENT_COMMANDS = {"SEND_PERSONAL_MESSAGE", "BROADCAST_MESSAGE", "REQUEST_PLAYER_ACTION"}
+
+async def _iterate(commands: List[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+    for command_obj in commands:
+        yield command_obj
+
+class StorytellerCommandExecutor:
+    """
+    Executes Storyteller command lists according to a dependency plan.
+    Grimoire mutations (and any unknown command) are ordered barriers that run alone, in list order.
+    Runs of consecutive sends and player requests between two barriers form a concurrent stage.
+    Inside a stage, commands addressed to the same player (or all broadcasts) share a lane and keep
+    their relative order; lanes run concurrently under a bounded TaskGroup.
+    execute_stream() applies the same plan to commands that are still arriving from the Storyteller.
+    """
+
+    def __init__(self, execute_command: Callable[[Dict[str, Any]], Awaitable[None]], max_concurrency: int = 8,
+                 should_stop: Optional[Callable[[], bool]] = None, timing_history: int = 500,
+                 stamp: Optional[Callable[[], Dict[str, Any]]] = None):
+        self.execute_command = execute_command
+        self.max_concurrency = max(1, max_concurrency)
+        self.should_stop = should_stop or (lambda: False)
+        self.stamp = stamp or dict #game clock stamp ({seq, mono_ns, timestamp}) recorded when each command starts
+        self.timings: Deque[Dict[str, Any]] = deque(maxlen=timing_history)
+        self._batch_count = 0
+
+    @staticmethod
+    def lane_for(command_obj: Dict[str, Any]) -> Optional[str]:
+        """Return the ordering lane of a concurrent command, or None for an ordered barrier."""
+        command_type = command_obj.get("command")
+        if command_type not in CONCURRENT_COMMANDS:
+            return None
+        if command_type == "BROADCAST_MESSAGE":
+            return "broadcast"
+        params = command_obj.get("params") or {}
+        return f"player:{params.get('player_id')}"
+
+    def plan(self, commands: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Split a command list into ordered stages: {"concurrent": bool, "lanes": {lane: [(index, command)]}}."""
+        stages: List[Dict[str, Any]] = []
+        current: Optional[Dict[str, Any]] = None
+        for index, command_obj in enumerate(commands):
+            lane = self.lane_for(command_obj)
+            if lane is None:
+                stages.append({"concurrent": False, "lanes": {"ordered": [(index, command_obj)]}})
+                current = None
+                continue
+            if current is None:
+                current = {"concurrent": True, "lanes": {}}
+                stages.append(current)
+            current["lanes"].setdefault(lane, []).append((index, command_obj))
+        return stages
+
+    async def execute(self, commands: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Execute a full command list following its dependency plan."""
+        return await self.execute_stream(_iterate(commands))
+
+    async def execute_stream(self, command_stream: AsyncIterator[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Execute commands as they arrive from an async iterator (e.g. a streamed Storyteller response).
+        Concurrent commands start immediately; a barrier waits for every in-flight command first.
+        Returns the commands that were executed, in arrival order.
+        """
+        self._batch_count += 1
+        batch = self._batch_count
+        batch_start = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        executed: List[Dict[str, Any]] = []
+        stream = command_stream.__aiter__()
+        index = 0
+        stage_number = 0
+        barrier: Optional[Dict[str, Any]] = None
+        exhausted = False
+        try:
+            while not exhausted and not self.should_stop():
+                #concurrent stage: start sends as they arrive until a barrier shows up or the stream ends
+                async with asyncio.TaskGroup() as task_group:
+                    lane_tails: Dict[str, asyncio.Task] = {}
+                    while True:
+                        try:
+                            command_obj = await stream.__anext__()
+                        except StopAsyncIteration:
+                            exhausted = True
+                            break
+                        executed.append(command_obj)
+                        lane = self.lane_for(command_obj)
+                        if lane is None:
+                            barrier = command_obj
+                            break
+                        lane_tails[lane] = task_group.create_task(self._run(
+                            command_obj, index, batch, stage_number, lane, batch_start, semaphore,
+                            after=lane_tails.get(lane)
+                        ))
+                        index += 1
+                    if lane_tails:
+                        stage_number += 1
+                if barrier is not None:
+                    if self.should_stop():
+                        executed.pop()
+                        break
+                    await self._run(barrier, index, batch, stage_number, "ordered", batch_start, semaphore)
+                    barrier = None
+                    index += 1
+                    stage_number += 1
+        finally:
+            if hasattr(stream, "aclose"):
+                await stream.aclose()
+        return executed
+
+    async def _run(self, command_obj: Dict[str, Any], index: int, batch: int, stage_number: int, lane: str,
+                   batch_start: float, semaphore: asyncio.Semaphore, after: Optional[asyncio.Task] = None):
+        if after is not None:
+            await after #keep per-lane order
+        error = None
+        async with semaphore:
+            stamp = self.stamp()
+            started = time.perf_counter()
+            try:
+                await self.execute_command(command_obj)
+            except Exception as e:
+                #one failing command must not cancel its siblings in the stage
+                error = f"{type(e).__name__}: {e}"
+                logger.error("Storyteller command %s failed: %s", command_obj.get("command"), error)
+            finished = time.perf_counter()
+        self.timings.append({
+            **stamp,
+            "batch": batch,
+            "index": index,
+            "command": command_obj.get("command"),
+            "stage": stage_number,
+            "lane": lane,
+            "started_ms": round((started - batch_start) * 1000, 3),
+            "duration_ms": round((finished - started) * 1000, 3),
+            "error": error
+        })
@@ -0,0 +1,170 @@
+#backend/storyteller/context_builder.py
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from .grimoire import Grimoire
+from .snapshot import storyteller_state_view
+
+class StorytellerContextBuilder:
+    """
+    Builds the CONTEXT lines sent to the Storyteller LLM each game loop iteration.
+    The first call (and every `reanchor_every` calls, or on a phase change) sends a full anchor:
+    the whole Grimoire snapshot, recent chat and all collected actions. Calls in between send the
+    Grimoire changes since the anchor (so a turn never depends on earlier deltas), the log events,
+    chat lines and player actions that arrived since the previous call, and any earlier actions
+    still awaiting resolution. Grimoire.version is used to skip diffing when nothing changed.
+    """
+
+    MAX_NEW_EVENTS = 20 #cap on log events included in a single delta
+    ANCHOR_LOG_TAIL = 5
+    ANCHOR_CHAT_TAIL = 10
+
+    def __init__(self, reanchor_every: int = 8):
+        self.reanchor_every = reanchor_every
+        self.reset()
+
+    @property
+    def reanchor_every(self) -> int:
+        return self._reanchor_every
+
+    @reanchor_every.setter
+    def reanchor_every(self, value: int):
+        self._reanchor_every = max(1, int(value))
+
+    def reset(self):
+        self._snapshot: Optional[Dict[str, Any]] = None #as of the anchor
+        self._version: Optional[int] = None
+        self._anchor_version: Optional[int] = None
+        self._delta: Dict[str, Any] = {} #grimoire changes since the anchor, as of self._version
+        self._anchor_phase: Optional[str] = None
+        self._turns_since_anchor = 0
+        self._log_cursor = 0
+        self._chat_cursor = 0
+        self._sent_actions: Dict[str, set] = {} #action_id -> player_ids already shown to the Storyteller
+
+    def needs_anchor(self, grimoire: Grimoire) -> bool:
+        return (
+            self._snapshot is None
+            or self._turns_since_anchor >= self.reanchor_every
+            or grimoire.current_phase != self._anchor_phase
+        )
+
+    def build(self, grimoire: Grimoire, loop_iteration: int, daily_chat_log: List[Dict[str, Any]],
+              pending_actions: Dict[str, Dict[str, Any]]) -> Tuple[List[str], bool]:
+        """Return (context_lines, is_anchor) for this Storyteller call."""
+        if self.needs_anchor(grimoire):
+            return self._build_anchor(grimoire, loop_iteration, daily_chat_log, pending_actions), True
+        return self._build_delta(grimoire, loop_iteration, daily_chat_log, pending_actions), False
+
+    @staticmethod
+    def snapshot(grimoire: Grimoire) -> Dict[str, Any]:
+        return grimoire.view("storyteller_state", storyteller_state_view)
+
+    @staticmethod
+    def diff(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+        """Compute the changes between two snapshots; statuses are diffed per player and key."""
+        delta: Dict[str, Any] = {}
+        for key in ("players", "current_phase", "day_number"):
+            if old.get(key) != new.get(key):
+                delta[key] = new.get(key)
+        for key in ("roles", "alignments"):
+            old_map, new_map = old.get(key, {}), new.get(key, {})
+            changed = {pid: value for pid, value in new_map.items() if old_map.get(pid) != value}
+            if changed:
+                delta[key] = changed
+        old_statuses, new_statuses = old.get("statuses", {}), new.get("statuses", {})
+        status_changes = {}
+        for pid, status in new_statuses.items():
+            previous = old_statuses.get(pid, {})
+            changed = {k: v for k, v in status.items() if previous.get(k) != v}
+            if changed:
+                status_changes[pid] = changed
+        if status_changes:
+            delta["statuses"] = status_changes
+        return delta
+
+    def _collect_actions(self, pending_actions: Dict[str, Dict[str, Any]], only_new: bool) -> Dict[str, Dict[str, Any]]:
+        collected: Dict[str, Dict[str, Any]] = {}
+        for action_id, details in pending_actions.items():
+            sent = self._sent_actions.setdefault(action_id, set())
+            for player_id, action in details["received_actions"].items():
+                if only_new and player_id in sent:
+                    continue
+                collected.setdefault(action_id, {})[player_id] = action
+                sent.add(player_id)
+        return collected
+
+    def _build_anchor(self, grimoire: Grimoire, loop_iteration: int, daily_chat_log: List[Dict[str, Any]],
+                      pending_actions: Dict[str, Dict[str, Any]]) -> List[str]:
+        snapshot = self.snapshot(grimoire)
+        lines = [
+            f"EVENT: Start of game loop iteration {loop_iteration}.",
+            f"CONTEXT_MODE: FULL_ANCHOR at grimoire version {grimoire.version}. Until the next anchor, turns carry only changes.",
+            f"GRIMOIRE_PHASE: {grimoire.current_phase}",
+            f"GRIMOIRE_DAY: {grimoire.day_number}",
+        ]
+        grimoire_summary = dict(snapshot)
+        grimoire_summary["game_log_tail"] = grimoire.game_log[-self.ANCHOR_LOG_TAIL:]
+        lines.append(f"GRIMOIRE_SNAPSHOT: {json.dumps(grimoire_summary, default=str)}")
+        if daily_chat_log:
+            lines.append(f"RECENT_PUBLIC_CHAT_LOG: {json.dumps(daily_chat_log[-self.ANCHOR_CHAT_TAIL:], default=str)}")
+
+        self._sent_actions = {}
+        collected = self._collect_actions(pending_actions, only_new=False)
+        if collected:
+            lines.append(f"PLAYER_ACTIONS_COLLECTED_SO_FAR: {json.dumps(collected, default=str)}")
+        if pending_actions:
+            lines.append(f"PENDING_STORYTELLER_ACTIONS_OVERVIEW: {json.dumps(self._overview(pending_actions))}")
+
+        self._snapshot = snapshot
+        self._version = self._anchor_version = grimoire.version
+        self._delta = {}
+        self._anchor_phase = grimoire.current_phase
+        self._turns_since_anchor = 1
+        self._log_cursor = len(grimoire.game_log)
+        self._chat_cursor = len(daily_chat_log)
+        return lines
+
+    def _build_delta(self, grimoire: Grimoire, loop_iteration: int, daily_chat_log: List[Dict[str, Any]],
+                     pending_actions: Dict[str, Dict[str, Any]]) -> List[str]:
+        lines = [
+            f"EVENT: Start of game loop iteration {loop_iteration}.",
+            f"CONTEXT_MODE: DELTA from the anchor at grimoire version {self._anchor_version} to {grimoire.version}.",
+            f"GRIMOIRE_PHASE: {grimoire.current_phase}",
+            f"GRIMOIRE_DAY: {grimoire.day_number}",
+        ]
+        if grimoire.version != self._version:
+            self._delta = self.diff(self._snapshot, self.snapshot(grimoire))
+            self._version = grimoire.version
+        lines.append(f"GRIMOIRE_DELTA: {json.dumps(self._delta, default=str) if self._delta else 'none'}")
+
+        log_length = len(grimoire.game_log)
+        if log_length > self._log_cursor:
+            new_events = grimoire.game_log[max(self._log_cursor, log_length - self.MAX_NEW_EVENTS):]
+            skipped = log_length - self._log_cursor - len(new_events)
+            prefix = f"({skipped} older events omitted) " if skipped > 0 else ""
+            lines.append(f"NEW_EVENTS: {prefix}{json.dumps(new_events, default=str)}")
+        self._log_cursor = log_length
+
+        if len(daily_chat_log) < self._chat_cursor: #chat log was reset
+            self._chat_cursor = 0
+        if len(daily_chat_log) > self._chat_cursor:
+            lines.append(f"NEW_PUBLIC_CHAT: {json.dumps(daily_chat_log[self._chat_cursor:], default=str)}")
+        self._chat_cursor = len(daily_chat_log)
+
+        earlier = {aid: {pid: action for pid, action in details["received_actions"].items() if pid in self._sent_actions.get(aid, ())}
+                   for aid, details in pending_actions.items()}
+        earlier = {aid: actions for aid, actions in earlier.items() if actions}
+        collected = self._collect_actions(pending_actions, only_new=True)
+        if earlier:
+            lines.append(f"EARLIER_PLAYER_ACTIONS_STILL_PENDING: {json.dumps(earlier, default=str)}")
+        if collected:
+            lines.append(f"NEW_PLAYER_ACTIONS: {json.dumps(collected, default=str)}")
+        if pending_actions:
+            lines.append(f"PENDING_STORYTELLER_ACTIONS_OVERVIEW: {json.dumps(self._overview(pending_actions))}")
+
+        self._turns_since_anchor += 1
+        return lines
+
+    @staticmethod
+    def _overview(pending_actions: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+        return {aid: list(data["received_actions"].keys()) for aid, data in pending_actions.items()}
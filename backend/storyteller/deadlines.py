@@ -0,0 +1,73 @@
+#backend/storyteller/deadlines.py
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Deque, Dict, Optional, Tuple
+from ..utils.logger import get_logger
+
+logger = get_logger("game")
+
+#what a player is assumed to have done when their deadline expires
+DEFAULT_ACTIONS: Dict[str, Dict[str, Any]] = {
+    "NIGHT_ACTION": {"action_type": "PASS", "targets": []},
+    "NOMINATION_CHOICE": {"action_type": "PASS_NOMINATION"},
+    "VOTE_CHOICE": {"action_type": "CAST_VOTE", "vote": False},
+    "COMMUNICATION_CHOICE": {"action_type": "SILENT"},
+}
+
+def action_family(action_type: Optional[str]) -> Optional[str]:
+    """Group request types under their deadline key (every NIGHT_ACTION_* shares the NIGHT_ACTION deadline)."""
+    if action_type and action_type.startswith("NIGHT_ACTION"):
+        return "NIGHT_ACTION"
+    return action_type
+
+def default_action(action_type: Optional[str], player_id: str, reason: str = "DEADLINE_EXPIRED") -> Dict[str, Any]:
+    action = dict(DEFAULT_ACTIONS.get(action_family(action_type), {"action_type": "NO_RESPONSE"}))
+    action.update({"player_id": player_id, "defaulted": True, "reason": reason})
+    return action
+
+async def run_with_deadline(awaitable: Awaitable[Any], timeout: Optional[float]) -> Tuple[Any, bool]:
+    """
+    Await with an optional deadline. Returns (result, timed_out); on expiry the awaited task is
+    cancelled, which releases its LLM slot.
+    """
+    if not timeout or timeout <= 0:
+        return await awaitable, False
+    try:
+        async with asyncio.timeout(timeout):
+            return await awaitable, False
+    except TimeoutError:
+        return None, True
+
+class DeadlineMetrics:
+    """Counts deadline misses per action type and phase and keeps the most recent ones."""
+
+    def __init__(self, history: int = 200):
+        self.misses_by_action: Dict[str, int] = {}
+        self.misses_by_phase: Dict[str, int] = {}
+        self.total_misses = 0
+        self.recent: Deque[Dict[str, Any]] = deque(maxlen=history)
+
+    def record(self, player_id: str, action_type: Optional[str], phase: Optional[str], waited: Optional[float] = None, scope: str = "action"):
+        family = action_family(action_type) or "UNKNOWN"
+        phase_key = phase or "UNKNOWN"
+        self.total_misses += 1
+        self.misses_by_action[family] = self.misses_by_action.get(family, 0) + 1
+        self.misses_by_phase[phase_key] = self.misses_by_phase.get(phase_key, 0) + 1
+        self.recent.append({
+            "player_id": player_id,
+            "action_type": action_type,
+            "phase": phase,
+            "scope": scope, #"action" or "phase" deadline
+            "waited_s": round(waited, 3) if waited is not None else None,
+            "at": time.time()
+        })
+        logger.warning("Deadline miss (%s): %s %s in %s; default applied.", scope, player_id, action_type, phase_key)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_misses": self.total_misses,
+            "misses_by_action": dict(self.misses_by_action),
+            "misses_by_phase": dict(self.misses_by_phase),
+            "recent": list(self.recent)
+        }
@@ -1,14 +1,81 @@
 #backend/storyteller/grimoire.py
-from typing import List, Dict, Any, Optional
+import logging
+from contextlib import contextmanager
+from typing import List, Dict, Any, Callable, Optional
+from .clock import GameClock
+from .player_state import PlayerState
+from .roles import ROLE_REGISTRY, RoleType
+from .seating import SeatRing
+from ..utils.logger import get_logger
+from ..utils.paged_log import PagedLog
+from .snapshot import GrimoireSnapshot, observer_players_view, public_players_view, take_snapshot
+
+#events that change what every player can see (deaths, nominations, votes); phase changes and private info do not
+PUBLIC_EVENT_TYPES = frozenset({
+    "PLAYER_ADDED", "DEATH", "PLAYER_DEATH", "EXECUTION", "NOMINATIONS_OPEN", "NOMINATION",
+    "VOTE_TALLY", "VOTE_RESULT", "VOTING_RESULT", "GAME_OVER",
+})
+PUBLIC_STATUS_KEYS = frozenset({"alive", "nominated_today", "can_nominate", "dead_vote_used"})
+
+logger = get_logger("grimoire")
+
+class RoleAssignments(dict):
+    """player_id -> role_name that keeps a live reverse index (role_name -> player_ids in assignment order)."""
+
+    def __init__(self, assignments: Optional[Dict[str, str]] = None):
+        super().__init__()
+        self.players_by_role: Dict[str, Dict[str, None]] = {}
+        self.update(assignments or {})
+
+    def __setitem__(self, player_id: str, role: str):
+        self._unindex(player_id)
+        super().__setitem__(player_id, role)
+        self.players_by_role.setdefault(role, {})[player_id] = None
+
+    def __delitem__(self, player_id: str):
+        self._unindex(player_id)
+        super().__delitem__(player_id)
+
+    def _unindex(self, player_id: str):
+        if player_id in self:
+            holders = self.players_by_role.get(dict.__getitem__(self, player_id), {})
+            holders.pop(player_id, None)
+
+    def update(self, *args, **kwargs):
+        for player_id, role in dict(*args, **kwargs).items():
+            self[player_id] = role
+
+    def setdefault(self, player_id: str, role: str = None):
+        if player_id not in self:
+            self[player_id] = role
+        return self[player_id]
+
+    def pop(self, player_id: str, *default):
+        if player_id not in self:
+            return super().pop(player_id, *default)
+        role = self[player_id]
+        del self[player_id]
+        return role
+
+    def popitem(self):
+        player_id = next(reversed(self))
+        return player_id, self.pop(player_id)
+
+    def clear(self):
+        super().clear()
+        self.players_by_role.clear()
 
 class Grimoire:
     def __init__(self):
         self.game_state: Dict[str, Any] = {} #generic game state like player names, etc.
+        self.statuses: Dict[str, PlayerState] = {} #player_id -> slotted status record ({alive, poisoned, ...})
+        self._alive_mask: int = 0 #bit per seat, set while that player is alive
+        self._ring = SeatRing() #seat index maps and alive-neighbour links
         self.players: List[str] = [] #list of player_ids in seating order
-        self.roles: Dict[str, str] = {} #player_id -> role_name
+        self.roles: RoleAssignments = RoleAssignments() #player_id -> role_name, indexed by role
         self.alignments: Dict[str, str] = {} #player_id -> alignment_str
-        self.statuses: Dict[str, Dict[str, Any]] = {} #player_id -> {alive: bool, poisoned: bool, ...}
-        self.game_log: List[Dict[str, Any]] = []
+        self._log_paging: Dict[str, Any] = {} #PagedLog limits for game_log and storyteller_log; unbounded until configured
+        self.game_log: PagedLog = PagedLog()
         # self.seating_order is effectively self.players after setup
         self.day_number: int = 0
         self.current_phase: Optional[str] = None #e.g., "FIRST_NIGHT", "DAY_CHAT", "NOMINATION", "VOTING", "NIGHT"
@@ -16,50 +83,185 @@ class Grimoire:
         self.fortune_teller_red_herring_player_id: Optional[str] = None #player_id picked as red herring
         self.current_demon_player_id: Optional[str] = None # Tracks the current demon
         self.baron_added_outsiders: List[str] = [] # Stores names of Outsider roles added by Baron
-        self.storyteller_log: List[str] = [] #internal log for storyteller/debug
+        self.storyteller_log: PagedLog = PagedLog() #internal log for storyteller/debug
         self.private_clues: Dict[str, List[Any]] = {} #player_id -> list of private clues
+        self.version: int = 0 #monotonically increasing, bumped on every mutation (log_event covers the built-in mutators)
+        self.public_version: int = 0 #bumped only when publicly visible state changes; keys speculative AI decisions
+        self._snapshot: Optional[GrimoireSnapshot] = None
+        self.clock = GameClock() #per-game sequence numbers and timestamps for every event
+        self.journal = None #optional GameJournal receiving every mutation made through the methods below
+        self._journal_paused = 0
+        self._replaying = 0
+
+    def bump_version(self, public: bool = False):
+        """Mark the grimoire as changed. Call after mutating grimoire fields directly; pass public=True if players can see it."""
+        self.version += 1
+        if public:
+            self.public_version += 1
+
+    def snapshot(self) -> GrimoireSnapshot:
+        """Immutable view of the current state, rebuilt only when the version changes (unchanged parts are shared)."""
+        if self._snapshot is None or self._snapshot.version != self.version:
+            self._snapshot = take_snapshot(self, self._snapshot)
+        return self._snapshot
+
+    def view(self, name: str, build: Callable[[GrimoireSnapshot], Any]) -> Any:
+        """Derived view memoized per version; the result is shared, so treat it as read-only."""
+        return self.snapshot().view(name, build)
+
+    @property
+    def game_log(self) -> PagedLog:
+        return self._game_log
+
+    @game_log.setter
+    def game_log(self, entries: List[Dict[str, Any]]):
+        self._game_log = PagedLog(entries, **self._log_paging)
+
+    @property
+    def storyteller_log(self) -> PagedLog:
+        return self._storyteller_log
+
+    @storyteller_log.setter
+    def storyteller_log(self, entries: List[str]):
+        self._storyteller_log = PagedLog(entries, **self._log_paging)
+
+    def configure_log_paging(self, hot_items: Optional[int], page_items: int = 500, spill_dir: Optional[str] = None):
+        """Keep only the newest `hot_items` entries of each log in memory; older pages spill to disk (None: no limit)."""
+        self._log_paging = {"hot_items": hot_items, "page_items": page_items, "spill_dir": spill_dir}
+        self._game_log.configure(**self._log_paging)
+        self._storyteller_log.configure(**self._log_paging)
+
+    @property
+    def roles(self) -> RoleAssignments:
+        return self._roles
+
+    @roles.setter
+    def roles(self, assignments: Dict[str, str]):
+        self._roles = RoleAssignments(assignments)
+
+    @property
+    def players(self) -> List[str]:
+        return self._players
+
+    @players.setter
+    def players(self, seating: List[str]):
+        #reassigning the seating re-indexes the alive bitmask so it stays in seat order
+        self._players = list(seating)
+        self._alive_mask = 0
+        seated = set(self._players)
+        for pid, state in self.statuses.items():
+            if isinstance(state, PlayerState) and pid not in seated:
+                state._bit = None #no longer seated: stop mirroring into the mask
+        alive = []
+        for bit, pid in enumerate(self._players):
+            state = self.statuses.get(pid)
+            if isinstance(state, PlayerState):
+                state._owner, state._bit = self, bit
+            alive.append(bool(state is not None and state.get("alive")))
+            if alive[-1]:
+                self._alive_mask |= 1 << bit
+        self._ring.reset(self._players, alive)
+
+    def _set_alive_bit(self, bit: int, alive: bool):
+        if alive:
+            self._alive_mask |= 1 << bit
+        else:
+            self._alive_mask &= ~(1 << bit)
+        self._ring.set_alive(bit, alive)
+
+    def new_player_state(self, player_id: str, **statuses: Any) -> PlayerState:
+        """A fresh status record wired to this grimoire's alive bitmask (if the player is seated)."""
+        return PlayerState(self, self._ring.seat_of(player_id), **statuses)
+
+    def _record(self, op: str, **args: Any):
+        if self.journal is not None and not self._journal_paused:
+            self.journal.mutation(op, args)
+
+    @contextmanager
+    def journaled(self, op: str, **args: Any):
+        """Record one compound mutation; the mutations it makes internally are replayed by re-running it, not recorded."""
+        self._record(op, **args)
+        self._journal_paused += 1
+        try:
+            yield
+        finally:
+            self._journal_paused -= 1
+
+    def apply_mutation(self, op: str, args: Dict[str, Any]):
+        """Re-apply one journaled mutation (recovery); it is not journaled again."""
+        self._journal_paused += 1
+        self._replaying += 1
+        try:
+            if op == "add_player":
+                self._seat_player(args["player_id"], args["role"], args["alignment"])
+            elif op == "update_status":
+                self._write_status(args["player_id"], args["status_key"], args["value"])
+            elif op == "add_private_clue":
+                self.private_clues.setdefault(args["player_id"], []).append(args["clue"])
+            elif op == "log_event":
+                self._append_event(args["entry"])
+            elif op == "set_value":
+                self.set_value(args["key_path"], args["value"])
+            else:
+                raise ValueError(f"Unknown grimoire mutation '{op}'")
+        finally:
+            self._journal_paused -= 1
+            self._replaying -= 1
 
     def add_player(self, player_id: str, role: str, alignment: str):
-        if player_id not in self.players:
-            self.players.append(player_id) #initial add, seating order fixed later
+        self._seat_player(player_id, role, alignment)
+        self._record("add_player", player_id=player_id, role=role, alignment=alignment)
+        self.log_event("PLAYER_ADDED", {"player_id": player_id, "role": role, "alignment": alignment})
+
+    def _seat_player(self, player_id: str, role: str, alignment: str):
+        if self._ring.seat_of(player_id) is None:
+            self._players.append(player_id) #initial add, seating order fixed later
+            self._ring.add_seat(player_id, alive=False)
         self.roles[player_id] = role
         self.alignments[player_id] = alignment
-        self.statuses[player_id] = {
-            "alive": True,
-            "poisoned": False, # Confirmed: Initialized to False
-            "is_drunk": False, # For the Drunk role
-            "thinks_is_role": None, # For the Drunk role - stores false Townsfolk role
-            "thinks_is_alignment": None, # For the Drunk role - stores false alignment
-            "misregisters_as_role": None, # For the Recluse - stores false role they register as
-            "misregisters_as_alignment": None, # For the Recluse - stores false alignment they register as
-            "protected_by_monk": False,
-            "nominated_today": False, #has this player been nominated today
-            "can_nominate": True, #can this player nominate others today
-            "used_virgin_ability": False, # Confirmed: Initialized to False
-            "used_slayer_ability": False, # Confirmed: Initialized to False
-            #add other relevant statuses here
-        }
+        self.statuses[player_id] = self.new_player_state(player_id)
+        self._set_alive_bit(self._ring.seat_of(player_id), True)
         # initialize private clues list for this player
         self.private_clues[player_id] = []
-        self.log_event("PLAYER_ADDED", {"player_id": player_id, "role": role, "alignment": alignment})
 
     def update_status(self, player_id: str, status_key: str, value: Any):
         if player_id in self.statuses and status_key in self.statuses[player_id]:
             self.statuses[player_id][status_key] = value
+            self._record("update_status", player_id=player_id, status_key=status_key, value=value)
             self.log_event("STATUS_UPDATE", {"player_id": player_id, "status": status_key, "new_value": value})
         else:
-            self.storyteller_log.append(f"Warning: Could not update status {status_key} for player {player_id}. Player or status key not found.")
-            print(f"Warning: Could not update status {status_key} for player {player_id}")
+            self.storyteller_log.append(f"Error: Could not update status {status_key} for player {player_id}. Player or status key not found.")
+            raise KeyError(f"Unknown player '{player_id}' or status '{status_key}'")
 
-    def log_event(self, event_type: str, data: Dict[str, Any]):
+    def set_status(self, player_id: str, status_key: str, value: Any):
+        """Journaled status write without a STATUS_UPDATE event, for engine bookkeeping (nomination and dead-vote flags)."""
+        self._write_status(player_id, status_key, value)
+        self._record("update_status", player_id=player_id, status_key=status_key, value=value)
+
+    def _write_status(self, player_id: str, status_key: str, value: Any):
+        self.statuses[player_id][status_key] = value
+        self.bump_version(public=status_key in PUBLIC_STATUS_KEYS)
+
+    def log_event(self, event_type: str, data: Dict[str, Any], stamp: Optional[Dict[str, Any]] = None):
         #event_type: e.g., "CHAT", "NOMINATION", "VOTE", "ABILITY_USE", "DEATH", "PHASE_CHANGE"
         #data: dictionary with event-specific details
-        #todo: use a proper timestamp library or pass from main.py if synchronized time is critical
-        timestamp = "#placeholder_timestamp#" #datetime.utcnow().isoformat()
-        log_entry = {"timestamp": timestamp, "event_type": event_type, "data": data}
+        #stamp: {seq, mono_ns, timestamp} from self.clock; pass one to share it with a related record (e.g. a chat message)
+        if self._replaying:
+            return #re-running a compound mutation: the events it logged were journaled (and are replayed) on their own
+        log_entry = {**(stamp or self.clock.stamp()), "event_type": event_type, "data": data}
+        #recorded even inside a compound mutation, so the journal's log_event records are exactly the game log
+        if self.journal is not None:
+            self.journal.mutation("log_event", {"entry": log_entry})
+        self._append_event(log_entry)
+
+    def _append_event(self, log_entry: Dict[str, Any]):
+        event_type, data = log_entry["event_type"], log_entry["data"]
         self.game_log.append(log_entry)
+        self.bump_version(public=event_type in PUBLIC_EVENT_TYPES
+                          or (event_type == "STATUS_UPDATE" and data.get("status") in PUBLIC_STATUS_KEYS))
         #self.storyteller_log.append(f"Event: {event_type} - {data}") #more verbose for internal log
-        print(f"Event Logged: {log_entry}") #for now, print to console
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Event Logged: %s", event_type, extra={"sample": event_type, "fields": log_entry})
         #update phase and day_number in grimoire
         if event_type == "PHASE_CHANGE":
             phase = data.get("phase") or data.get("new_phase")
@@ -68,59 +270,141 @@ class Grimoire:
             if "day_number" in data:
                 self.day_number = data["day_number"]
 
+    def set_value(self, key_path: List[str], value: Any) -> bool:
+        """Write a value at a grimoire path (the Storyteller's UPDATE_GRIMOIRE_VALUE). Returns False for an invalid path."""
+        with self.journaled("set_value", key_path=list(key_path), value=value):
+            ok = self._set_path(key_path, value)
+        #direct field writes bypass the grimoire mutators; seating, names and public statuses are visible to everyone
+        public = key_path[0] in ("players", "game_state") or (key_path[0] == "statuses" and key_path[-1] in PUBLIC_STATUS_KEYS)
+        self.bump_version(public=public)
+        return ok
+
+    def _set_path(self, key_path: List[str], value: Any) -> bool:
+        # Special handling for players dict to properly populate grimoire
+        if key_path == ["players"] and isinstance(value, dict):
+            logger.debug("Special handling for players dict - populating grimoire properly")
+            for player_id, player_data in value.items():
+                if isinstance(player_data, str):
+                    # Storyteller is sending player_id -> role_name mapping
+                    alignment = ROLE_REGISTRY.alignment_of.get(player_data)
+                    self.add_player(player_id, player_data, alignment.value if alignment else "Good")
+                else:
+                    # Storyteller is sending player_id -> {role, alignment, status} mapping
+                    role = player_data.get("role")
+                    alignment = player_data.get("alignment")
+                    if role and alignment:
+                        self.add_player(player_id, role, alignment)
+            logger.debug("Added %s players to grimoire", len(value))
+        # Handle setting players as a list (or the seating order, which is the same thing)
+        elif key_path in (["players"], ["seating_order"]) and isinstance(value, list):
+            self.players = value
+            logger.debug("Set grimoire.players = %s", value)
+        # Handle setting roles/alignments directly
+        elif key_path in (["roles"], ["alignments"]) and isinstance(value, dict):
+            getattr(self, key_path[0]).update(value)
+            logger.debug("Updated %s for %s players", key_path[0], len(value))
+        # Handle setting statuses directly
+        elif key_path == ["statuses"] and isinstance(value, dict):
+            for player_id, status in value.items():
+                if player_id not in self.statuses:
+                    self.statuses[player_id] = self.new_player_state(player_id)
+                try:
+                    self.statuses[player_id].update(status)
+                except KeyError as e:
+                    logger.error("UPDATE_GRIMOIRE_VALUE Error: %s", e)
+            logger.debug("Updated statuses for %s players", len(value))
+        elif len(key_path) == 1:
+            setattr(self, key_path[0], value)
+            logger.debug("Set grimoire.%s = %s", key_path[0], value)
+        else:
+            obj = self
+            for key_segment in key_path[:-1]:
+                if hasattr(obj, key_segment):
+                    obj = getattr(obj, key_segment)
+                elif isinstance(obj, dict) and key_segment in obj:
+                    obj = obj[key_segment]
+                else:
+                    logger.error("UPDATE_GRIMOIRE_VALUE Error: Invalid path %s", key_path)
+                    return False
+            if hasattr(obj, key_path[-1]):
+                setattr(obj, key_path[-1], value)
+            elif isinstance(obj, dict):
+                obj[key_path[-1]] = value
+            else:
+                logger.error("UPDATE_GRIMOIRE_VALUE Error: Cannot set value at path %s", key_path)
+                return False
+            logger.debug("Set grimoire path %s = %s", key_path, value)
+        return True
+
     def get_player_role(self, player_id: str) -> Optional[str]:
         return self.roles.get(player_id)
 
     def get_player_alignment(self, player_id: str) -> Optional[str]:
         return self.alignments.get(player_id)
 
+    def seat_of(self, player_id: str) -> Optional[int]:
+        """Seat index of a player around the circle (O(1))."""
+        return self._ring.seat_of(player_id)
+
+    def alive_neighbors(self, player_id: str) -> List[str]:
+        """The closest alive player on each side, skipping the dead (as the Empath does)."""
+        return self._ring.alive_neighbors(player_id)
+
+    def evil_pairs_count(self, is_evil: Optional[Callable[[str], bool]] = None) -> int:
+        """
+        Adjacent pairs of evil players around the whole circle (the Chef's number). Pass `is_evil` to count
+        registered alignments (Recluse/Spy); the plain count is memoized per grimoire version.
+        """
+        if is_evil is not None:
+            return self._ring.adjacent_pairs(is_evil)
+        return self.view("evil_pairs", lambda snapshot: self._ring.adjacent_pairs(lambda pid: snapshot.alignments.get(pid) == "Evil"))
+
     def is_player_alive(self, player_id: str) -> bool:
-        return self.statuses.get(player_id, {}).get("alive", False)
+        bit = self._ring.seat_of(player_id)
+        if bit is None:
+            return False
+        return bool(self._alive_mask >> bit & 1)
     
     def get_player_status(self, player_id: str, status_key: str) -> Any:
-        return self.statuses.get(player_id, {}).get(status_key)
+        state = self.statuses.get(player_id)
+        return state.get(status_key) if state is not None else None
 
     def get_all_player_info_for_observer(self) -> List[Dict[str, Any]]:
-        """Returns comprehensive info for all players, for observer mode or Spy."""
-        all_info = []
-        for player_id in self.players:
-            info = {
-                "id": player_id,
-                "name": self.game_state.get("player_names", {}).get(player_id, player_id),
-                "role": self.roles.get(player_id),
-                "alignment": self.alignments.get(player_id),
-                "status": self.statuses.get(player_id, {}).copy() #send a copy
-            }
-            all_info.append(info)
-        return all_info
+        """Returns comprehensive info for all players, for observer mode or Spy (shared per version, read-only)."""
+        return self.view("observer_players", observer_players_view)
 
     def get_public_player_info(self) -> List[Dict[str, Any]]:
-        """Returns info visible to all players (name, alive status)."""
-        public_info = []
-        for player_id in self.players:
-            info = {
-                "id": player_id,
-                "name": self.game_state.get("player_names", {}).get(player_id, player_id),
-                "isAlive": self.is_player_alive(player_id)
-                #could add more public info like who they voted for if that becomes public
-            }
-            public_info.append(info)
-        return public_info
+        """Returns info visible to all players (name, alive status); shared per version, read-only."""
+        return self.view("public_players", public_players_view)
 
     def get_player_ids_by_role(self, role_name: str) -> List[str]:
-        return [pid for pid, r_name in self.roles.items() if r_name == role_name]
+        return list(self._roles.players_by_role.get(role_name, ()))
+
+    def get_player_ids_by_type(self, role_type: RoleType) -> List[str]:
+        """Players whose actual role is of this type (e.g. every Minion), via the role index."""
+        return [pid for role in ROLE_REGISTRY.by_type[role_type] for pid in self._roles.players_by_role.get(role, ())]
 
     def get_player_ids_by_alignment(self, alignment_val: str) -> List[str]:
         return [pid for pid, align in self.alignments.items() if align == alignment_val]
     
     def get_alive_players(self) -> List[str]:
-        return [pid for pid in self.players if self.is_player_alive(pid)]
+        """Alive players in seat order, read straight off the alive bitmask."""
+        alive, mask = [], self._alive_mask
+        while mask:
+            low = mask & -mask
+            alive.append(self._players[low.bit_length() - 1])
+            mask ^= low
+        return alive
+
+    def alive_count(self) -> int:
+        return self._alive_mask.bit_count()
 
     def add_private_clue(self, player_id: str, clue: Any):
         """Record a private clue for a player."""
         if player_id not in self.private_clues:
             self.private_clues[player_id] = []
         self.private_clues[player_id].append(clue)
+        self._record("add_private_clue", player_id=player_id, clue=clue)
         # also log the private info event in game log
         self.log_event("PRIVATE_INFO", {"player_id": player_id, "clue": clue})
 
@@ -128,4 +412,45 @@ class Grimoire:
         """Retrieve all private clues that have been recorded for a player."""
         return self.private_clues.get(player_id, [])
 
+    #fields captured by to_snapshot/from_snapshot besides players, roles, alignments and statuses
+    _SNAPSHOT_FIELDS = ("game_state", "game_log", "day_number", "current_phase", "demon_bluffs",
+                        "fortune_teller_red_herring_player_id", "current_demon_player_id", "baron_added_outsiders",
+                        "storyteller_log", "private_clues", "version", "public_version")
+
+    def to_snapshot(self, with_log: bool = True) -> Dict[str, Any]:
+        """
+        Plain JSON-ready copy of the full state. Without `with_log` the game log is replaced by its length: the
+        journal's snapshots stay small, and the log is recovered from the journal's log pages.
+        """
+        state = {field: getattr(self, field) for field in self._SNAPSHOT_FIELDS if with_log or field != "game_log"}
+        if not with_log:
+            state["log_length"] = len(self.game_log)
+        for field, value in state.items():
+            if isinstance(value, PagedLog):
+                state[field] = value.to_list()
+        state.update({
+            "players": list(self.players),
+            "roles": dict(self.roles),
+            "alignments": dict(self.alignments),
+            "statuses": {pid: dict(status) for pid, status in self.statuses.items()},
+            "clock_seq": self.clock.seq,
+        })
+        return state
+
+    @classmethod
+    def from_snapshot(cls, state: Dict[str, Any], game_log: Optional[PagedLog] = None) -> "Grimoire":
+        """Rebuild a grimoire; pass `game_log` to adopt an already rebuilt log (required for a snapshot taken without it)."""
+        grimoire = cls()
+        for field in cls._SNAPSHOT_FIELDS:
+            if field == "game_log" and game_log is not None:
+                grimoire._game_log = game_log
+            else:
+                setattr(grimoire, field, state[field])
+        grimoire.roles = state["roles"]
+        grimoire.alignments = dict(state["alignments"])
+        grimoire.statuses = {pid: PlayerState(**status) for pid, status in state["statuses"].items()}
+        grimoire.players = state["players"] #re-indexes the alive bitmask and seat ring from the statuses
+        grimoire.clock.resume(state["clock_seq"])
+        return grimoire
+
     #add more getter/setter methods as needed for game state management 
\ No newline at end of file
@@ -0,0 +1,209 @@
+#backend/storyteller/journal.py
+import hashlib
+import json
+import os
+from collections import deque
+from typing import Any, BinaryIO, Deque, Dict, List, Optional, Sequence, Tuple
+from .grimoire import Grimoire
+from ..utils.paged_log import PagedLog, json_default
+
+#every line starts with its type so recovery can skip lines it does not need without parsing them
+_SNAPSHOT_PREFIX = '{"type": "snapshot"'
+
+def prompt_key(prompt: str) -> str:
+    """Stable key for a prompt (Python's hash() is salted per process, so it cannot be used across restarts)."""
+    return hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:16]
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+class GameJournal:
+    """
+    Append-only JSONL event stream for one game: grimoire mutations, agent memory changes, LLM responses and
+    periodic snapshots. The append-only logs (the game log, agents' chat lists) are also written as sealed
+    pages of `page_items` entries; a snapshot carries only the page locations and the entries not yet paged,
+    so it stays small however long the game runs. A game is rebuilt from the last snapshot plus the records
+    after it (see load_journal): the pages are read back on demand, so recovery cost follows the tail.
+    Recorded LLM responses are served back for identical prompts, so replaying a game never pays for the
+    same call twice.
+    """
+
+    def __init__(self, path: str, recorded_llm: Optional[Dict[Tuple[str, str], List[str]]] = None, page_items: int = 500,
+                 resumed_logs: Optional[Dict[str, Tuple[List[Tuple[int, int]], Sequence[Any]]]] = None):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        if self._file.tell() and not _ends_with_newline(path):
+            self._file.write("\n") #a recovered game must not append to a line torn by the crash
+        self._recorded_llm: Dict[Tuple[str, str], Deque[str]] = {key: deque(responses) for key, responses in (recorded_llm or {}).items()}
+        self.records = 0
+        self.records_since_snapshot = 0
+        self.snapshots = 0
+        self.llm_replayed = 0
+        self.page_items = max(1, page_items)
+        #log name -> {"pages": [(offset, byte length) of each sealed page], "tail": entries not yet in a page}
+        self._logs: Dict[str, Dict[str, list]] = {}
+        for name, (pages, entries) in (resumed_logs or {}).items():
+            self._resume_log(name, pages, entries)
+
+    def _append(self, record: Dict[str, Any]):
+        if self._file.closed:
+            return
+        #flushed per record so a crash (not just a clean shutdown) leaves the tail on disk
+        self._file.write(json.dumps(record, default=json_default) + "\n")
+        self._file.flush()
+        self.records += 1
+        self.records_since_snapshot += 1
+
+    def mutation(self, op: str, args: Dict[str, Any]):
+        self._append({"type": "mutation", "op": op, "args": args})
+        if op == "log_event":
+            self.append_to_log("game_log", args["entry"])
+
+    def append_to_log(self, name: str, entry: Any):
+        """Add one entry to a paged log; every `page_items` entries are sealed into a page written to the journal."""
+        log = self._logs.setdefault(name, {"pages": [], "tail": []})
+        log["tail"].append(entry)
+        if len(log["tail"]) >= self.page_items and not self._file.closed:
+            header = '{"type": "log_page", "log": %s, "entries": ' % json.dumps(name)
+            data = json.dumps(log["tail"], default=json_default)
+            start = self._file.tell()
+            self._file.write(header + data + "}\n")
+            self._file.flush()
+            #the entries' JSON list is a PagedLog page as it stands (see PagedLog.adopt_pages)
+            log["pages"].append((start + len(header.encode("utf-8")), len(data.encode("utf-8"))))
+            log["tail"] = []
+
+    def _resume_log(self, name: str, pages: List[Tuple[int, int]], entries: Sequence[Any]):
+        """Continue a log whose first pages are already written; `entries` is the whole log."""
+        self._logs[name] = {"pages": [tuple(page) for page in pages], "tail": []}
+        for entry in entries[len(pages) * self.page_items:]:
+            self.append_to_log(name, entry)
+
+    def memory(self, player_id: str, change: str, payload: Any):
+        self._append({"type": "memory", "player_id": player_id, "change": change, "payload": payload})
+
+    def llm(self, agent_id: str, prompt: str, response: str):
+        self._append({"type": "llm", "agent": agent_id, "key": prompt_key(prompt), "response": response})
+
+    def replayed_response(self, agent_id: str, prompt: str) -> Optional[str]:
+        """A recorded response to this exact prompt from this agent, consumed in recording order (None if none left)."""
+        if not self._recorded_llm:
+            return None
+        responses = self._recorded_llm.get((agent_id, prompt_key(prompt)))
+        if not responses:
+            return None
+        self.llm_replayed += 1
+        return responses.popleft()
+
+    def snapshot(self, state: Dict[str, Any]):
+        """Write a snapshot plus the paged logs' locations. A grimoire snapshot with its game log starts that log."""
+        game_log = state.get("grimoire", {}).get("game_log")
+        if game_log is not None and "game_log" not in self._logs:
+            self._resume_log("game_log", [], game_log)
+        self._append({"type": "snapshot", **state, "page_items": self.page_items,
+                      "logs": {name: {"pages": log["pages"], "tail": log["tail"]} for name, log in self._logs.items()}})
+        self.records_since_snapshot = 0
+        self.snapshots += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"path": self.path, "records": self.records, "records_since_snapshot": self.records_since_snapshot,
+                "snapshots": self.snapshots, "llm_replayed": self.llm_replayed,
+                "log_pages": sum(len(log["pages"]) for log in self._logs.values()),
+                "llm_recorded_unused": sum(len(responses) for responses in self._recorded_llm.values())}
+
+class RecoveredGame:
+    """A game rebuilt from its journal: the grimoire, the agents' saved state and the memory changes to replay on them."""
+
+    def __init__(self, grimoire: Grimoire, snapshot: Dict[str, Any], memory_tail: List[Dict[str, Any]],
+                 recorded_llm: Dict[Tuple[str, str], List[str]], tail_records: int, path: str):
+        self.grimoire = grimoire
+        self.agents: Dict[str, Dict[str, Any]] = snapshot.get("agents", {}) #player_id -> {role, alignment, memory, status}
+        self.human_player_ids: List[str] = snapshot.get("human_player_ids", [])
+        self.memory_tail = memory_tail
+        self.recorded_llm = recorded_llm
+        self.tail_records = tail_records
+        self.path = path
+        self.page_items: int = snapshot.get("page_items", 500)
+        self.logs: Dict[str, Dict[str, list]] = snapshot.get("logs", {})
+
+    def log_pages(self, name: str) -> List[Tuple[int, int]]:
+        return [tuple(page) for page in self.logs.get(name, {}).get("pages", [])]
+
+    def paged_log(self, name: str, hot_items: Optional[int] = None, spill_dir: Optional[str] = None) -> PagedLog:
+        """A journaled log as it was at the snapshot: its pages stay in the journal and are read on demand."""
+        return _journaled_log(self.path, self.logs.get(name, {}), self.page_items, hot_items, spill_dir)
+
+def _journaled_log(path: str, saved: Dict[str, list], page_items: int, hot_items: Optional[int], spill_dir: Optional[str]) -> PagedLog:
+    log = PagedLog(hot_items=hot_items, page_items=page_items, spill_dir=spill_dir)
+    log.adopt_pages(path, [tuple(page) for page in saved.get("pages", [])])
+    log.extend(saved.get("tail", []))
+    return log
+
+def _rfind_line(f: BinaryIO, prefix: bytes, end: int, block: int = 1 << 16) -> Optional[int]:
+    """Offset of the last line starting with `prefix` that begins before `end`, reading the file backwards in blocks."""
+    position, window = end, b""
+    while position > 0:
+        step = min(block, position)
+        position -= step
+        f.seek(position)
+        #keep the start of the block read before so a match across the boundary is still found
+        window = f.read(step) + window[:len(prefix) + 1]
+        index = window.rfind(b"\n" + prefix)
+        if index != -1:
+            return position + index + 1
+    return 0 if window.startswith(prefix) else None
+
+def _last_snapshot(f: BinaryIO) -> Tuple[int, Dict[str, Any]]:
+    end = f.seek(0, os.SEEK_END)
+    while True:
+        offset = _rfind_line(f, _SNAPSHOT_PREFIX.encode("utf-8"), end)
+        if offset is None:
+            raise ValueError(f"No snapshot in journal {f.name}")
+        f.seek(offset)
+        try:
+            return offset, json.loads(f.readline())
+        except json.JSONDecodeError: #a snapshot torn by the crash: recover from the one before it
+            end = offset
+
+def load_journal(path: str, hot_items: Optional[int] = None, spill_dir: Optional[str] = None) -> RecoveredGame:
+    """
+    Rebuild a game from the last snapshot in a journal plus the records after it. The snapshot is found by
+    reading backwards from the end and only the tail is parsed. The game log's sealed pages are not read:
+    the rebuilt log (paged per `hot_items` and `spill_dir`) reads them back from the journal on demand.
+    Recorded LLM responses are taken from the tail only: those are the calls the resumed game repeats.
+    """
+    with open(path, "rb") as f:
+        _, snapshot = _last_snapshot(f)
+        tail = f.read().decode("utf-8", errors="replace").splitlines()
+
+    state, page_items = snapshot["grimoire"], snapshot.get("page_items", 500)
+    game_log = None
+    if "game_log" not in state:
+        game_log = _journaled_log(path, snapshot.get("logs", {}).get("game_log", {}), page_items, hot_items, spill_dir)
+    grimoire = Grimoire.from_snapshot(state, game_log=game_log)
+    grimoire.configure_log_paging(hot_items, page_items, spill_dir)
+    memory_tail: List[Dict[str, Any]] = []
+    recorded_llm: Dict[Tuple[str, str], List[str]] = {}
+    for line in tail:
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            break #a torn final line from a crash: everything before it is intact
+        if record["type"] == "mutation":
+            grimoire.apply_mutation(record["op"], record["args"])
+        elif record["type"] == "memory":
+            memory_tail.append(record)
+        elif record["type"] == "llm":
+            recorded_llm.setdefault((record["agent"], record["key"]), []).append(record["response"])
+    if grimoire.game_log:
+        grimoire.clock.resume(grimoire.game_log[-1].get("seq", 0))
+    return RecoveredGame(grimoire, snapshot, memory_tail, recorded_llm, len(tail), path)
@@ -0,0 +1,65 @@
+#backend/storyteller/night_order.py
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from .grimoire import Grimoire
+from .roles import ROLE_REGISTRY
+
+#canonical Trouble Brewing wake order; only roles whose registry flags say they act that night are kept
+_FIRST_NIGHT_PRIORITY = (
+    "Poisoner", "Spy", "Washerwoman", "Librarian", "Investigator", "Chef", "Empath", "Fortune Teller", "Butler",
+)
+_OTHER_NIGHT_PRIORITY = (
+    "Poisoner", "Monk", "Scarlet Woman", "Imp", "Ravenkeeper", "Empath", "Fortune Teller", "Undertaker", "Butler", "Spy",
+)
+
+NIGHT_PHASES = ("FIRST_NIGHT", "NIGHT")
+
+def _build_order(priority: Tuple[str, ...], flag: str) -> Tuple[str, ...]:
+    flagged = ROLE_REGISTRY.by_flag[flag]
+    ordered = [role for role in priority if role in flagged]
+    #any flagged role missing from the priority list still wakes, after the listed ones
+    ordered += sorted(flagged.difference(ordered))
+    return tuple(ordered)
+
+#precomputed once at import time
+FIRST_NIGHT_ORDER: Tuple[str, ...] = _build_order(_FIRST_NIGHT_PRIORITY, "first_night")
+OTHER_NIGHT_ORDER: Tuple[str, ...] = _build_order(_OTHER_NIGHT_PRIORITY, "other_night")
+CHOOSER_ROLES: FrozenSet[str] = ROLE_REGISTRY.by_flag["night_choice"]
+
+_WAKE_ORDER: Dict[str, Tuple[str, ...]] = {"FIRST_NIGHT": FIRST_NIGHT_ORDER, "NIGHT": OTHER_NIGHT_ORDER}
+_WAKE_INDEX: Dict[str, Dict[str, int]] = {phase: {role: i for i, role in enumerate(order)} for phase, order in _WAKE_ORDER.items()}
+_CHOOSERS: Dict[str, FrozenSet[str]] = {phase: frozenset(order) & CHOOSER_ROLES for phase, order in _WAKE_ORDER.items()}
+_INFO: Dict[str, FrozenSet[str]] = {phase: frozenset(order) - CHOOSER_ROLES for phase, order in _WAKE_ORDER.items()}
+
+def night_key(phase: Optional[str]) -> Optional[str]:
+    """Map a grimoire phase to its night table ("FIRST_NIGHT" or "NIGHT"), or None outside the night."""
+    return phase if phase in _WAKE_ORDER else None
+
+def wake_order(phase: Optional[str]) -> Tuple[str, ...]:
+    return _WAKE_ORDER.get(night_key(phase), ())
+
+def needs_night_choice(role: Optional[str], phase: Optional[str]) -> bool:
+    """Whether a role wakes to make a choice in this night phase (table lookup)."""
+    return role in _CHOOSERS.get(night_key(phase), ())
+
+def is_info_role(role: Optional[str], phase: Optional[str]) -> bool:
+    """Whether a role wakes this night only to receive information from the Storyteller."""
+    return role in _INFO.get(night_key(phase), ())
+
+def perceived_role(grimoire: Grimoire, player_id: str) -> Optional[str]:
+    """The role a player acts as at night: the Drunk wakes as the Townsfolk they think they are."""
+    if grimoire.get_player_status(player_id, "is_drunk") and grimoire.get_player_status(player_id, "thinks_is_role"):
+        return grimoire.get_player_status(player_id, "thinks_is_role")
+    return grimoire.get_player_role(player_id)
+
+def plan_night(grimoire: Grimoire, phase: Optional[str] = None) -> Dict[str, List[str]]:
+    """
+    Split the alive players into the night's choosers (asked together in one wave) and info roles
+    (resolved by the Storyteller afterwards), each list in wake order.
+    """
+    phase = phase or grimoire.current_phase
+    index = _WAKE_INDEX.get(night_key(phase), {})
+    waking = [(index[role], pid) for pid in grimoire.get_alive_players() if (role := perceived_role(grimoire, pid)) in index]
+    waking.sort()
+    choosers = [pid for _, pid in waking if needs_night_choice(perceived_role(grimoire, pid), phase)]
+    info = [pid for _, pid in waking if is_info_role(perceived_role(grimoire, pid), phase)]
+    return {"choosers": choosers, "info": info}
@@ -0,0 +1,137 @@
+#backend/storyteller/nominations.py
+import asyncio
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Iterable, List, Optional
+from .grimoire import Grimoire
+from ..utils.logger import get_logger
+
+logger = get_logger("game")
+
+class NominationEngine:
+    """
+    Runs the day's nomination slots without a Storyteller round trip per nominator.
+    For each open slot every eligible nominator is asked at once; intents are then applied in seat
+    order (starting after the previous nominator), so the earliest seat with a valid nomination wins
+    regardless of which LLM answered first. Requests still outstanding once the slot is taken are cancelled.
+    The engine's per-day state lives in grimoire.game_state and every write goes through the journaled
+    grimoire mutators, so a recovered game resumes the day where it stopped.
+    """
+
+    STATE_KEY = "nomination_day"
+
+    def __init__(self, grimoire: Grimoire):
+        self.grimoire = grimoire
+
+    def _state(self) -> Dict[str, Any]:
+        return self.grimoire.game_state.get(self.STATE_KEY) or {"day": None, "order": [], "next_index": 0, "closed": False}
+
+    def _save(self, **changes: Any):
+        self.grimoire.set_value(["game_state", self.STATE_KEY], {**self._state(), **changes})
+
+    @property
+    def day(self) -> Optional[int]:
+        return self._state()["day"]
+
+    @property
+    def order(self) -> List[str]:
+        """Today's nomination order (seat order)."""
+        return self._state()["order"]
+
+    @property
+    def next_index(self) -> int:
+        """Position in `order` where the next slot starts."""
+        return self._state()["next_index"]
+
+    @property
+    def closed(self) -> bool:
+        """Every eligible nominator passed; no more nominations today."""
+        return self._state()["closed"]
+
+    def start_day(self):
+        """Reset per-day nomination flags when a new day begins."""
+        day = self.grimoire.day_number
+        if self.day == day:
+            return
+        order = list(self.grimoire.players)
+        self._save(day=day, order=order, next_index=0, closed=False)
+        for player_id in self.grimoire.statuses:
+            self.grimoire.set_status(player_id, "nominated_today", False)
+            self.grimoire.set_status(player_id, "can_nominate", self.grimoire.is_player_alive(player_id))
+        self.grimoire.set_value(["game_state", "current_nominee_id"], None)
+        self.grimoire.log_event("NOMINATIONS_OPEN", {"day": day, "order": list(order)})
+
+    def slot_open(self) -> bool:
+        return not self.closed and not self.grimoire.game_state.get("current_nominee_id")
+
+    def eligible_nominators(self, candidates: Optional[Iterable[str]] = None) -> List[str]:
+        """Alive players who may still nominate today, in seat order starting at the next slot."""
+        allowed = set(candidates) if candidates is not None else None
+        rotated = self.order[self.next_index:] + self.order[:self.next_index]
+        return [
+            pid for pid in rotated
+            if (allowed is None or pid in allowed)
+            and self.grimoire.is_player_alive(pid)
+            and self.grimoire.get_player_status(pid, "can_nominate")
+        ]
+
+    def eligible_nominees(self, nominator_id: str) -> List[str]:
+        return [
+            pid for pid in self.order
+            if pid != nominator_id
+            and self.grimoire.is_player_alive(pid)
+            and not self.grimoire.get_player_status(pid, "nominated_today")
+        ]
+
+    def is_valid(self, nominator_id: str, nominee_id: Optional[str]) -> bool:
+        return (
+            nominee_id is not None
+            and bool(self.grimoire.get_player_status(nominator_id, "can_nominate"))
+            and nominee_id in self.eligible_nominees(nominator_id)
+        )
+
+    async def run_slot(self, decide: Callable[[str], Awaitable[Optional[str]]],
+                       candidates: Optional[Iterable[str]] = None,
+                       spawn: Callable[[Coroutine], Optional[asyncio.Task]] = asyncio.create_task) -> Optional[Dict[str, Any]]:
+        """
+        Ask every eligible nominator concurrently via `decide(player_id) -> nominee_id | None` and apply the
+        first valid intent in seat order. Returns the nomination, or None if everybody passed.
+        Requests are started with `spawn` (pass a TaskSupervisor's so the game owns them); a spawn that
+        returns None (the game is over) counts as a pass.
+        """
+        self.start_day()
+        nominators = self.eligible_nominators(candidates)
+        tasks = {pid: task for pid, task in ((pid, spawn(decide(pid))) for pid in nominators) if task is not None}
+        try:
+            for player_id in nominators:
+                if player_id not in tasks:
+                    continue
+                try:
+                    nominee_id = await tasks[player_id]
+                except Exception as e:
+                    logger.warning("Nomination intent from %s failed: %s", player_id, e)
+                    continue
+                if self.is_valid(player_id, nominee_id):
+                    return self.apply(player_id, nominee_id)
+        finally:
+            #the slot is decided (or everyone passed); stop any request still in flight
+            for task in tasks.values():
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+        self._save(closed=True)
+        self.grimoire.log_event("NOMINATIONS_CLOSED", {"day": self.day, "reason": "all eligible nominators passed"})
+        return None
+
+    def apply(self, nominator_id: str, nominee_id: str) -> Dict[str, Any]:
+        self.grimoire.set_status(nominator_id, "can_nominate", False)
+        self.grimoire.set_status(nominee_id, "nominated_today", True)
+        self.grimoire.set_value(["game_state", "current_nominee_id"], nominee_id)
+        if nominator_id in self.order:
+            self._save(next_index=(self.order.index(nominator_id) + 1) % len(self.order))
+        nomination = {"nominator_id": nominator_id, "nominee_id": nominee_id, "day": self.grimoire.day_number}
+        self.grimoire.log_event("NOMINATION", nomination)
+        return nomination
+
+    def resolve_current(self):
+        """Close the current nomination (after its vote) so the next slot can open."""
+        if self.grimoire.game_state.get("current_nominee_id") is not None:
+            self.grimoire.set_value(["game_state", "current_nominee_id"], None)
@@ -0,0 +1,74 @@
+#backend/storyteller/player_state.py
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+#every status a player can have, with its initial value; anything else is rejected
+STATUS_DEFAULTS: Dict[str, Any] = {
+    "alive": True,
+    "poisoned": False,
+    "is_drunk": False, # For the Drunk role
+    "thinks_is_role": None, # For the Drunk role - stores false Townsfolk role
+    "thinks_is_alignment": None, # For the Drunk role - stores false alignment
+    "misregisters_as_role": None, # For the Recluse/Spy - stores false role they register as
+    "misregisters_as_alignment": None, # For the Recluse/Spy - stores false alignment they register as
+    "protected_by_monk": False,
+    "nominated_today": False, #has this player been nominated today
+    "can_nominate": True, #can this player nominate others today
+    "used_virgin_ability": False,
+    "used_slayer_ability": False,
+    "butler_master": None, # For the Butler - player chosen at night whose vote they depend on
+    "dead_vote_used": False, # Dead players keep one vote for the rest of the game
+}
+STATUS_KEYS: Tuple[str, ...] = tuple(STATUS_DEFAULTS)
+_STATUS_KEY_SET = frozenset(STATUS_KEYS)
+
+class PlayerState(MutableMapping):
+    """
+    One player's statuses as a slotted record (no per-player dict). It still behaves like the status dict it
+    replaces (`state["alive"]`, `.get`, `.update`, `.items()`), but only known status keys can be set: an
+    unknown key raises KeyError. Changes to `alive` are mirrored into the owning grimoire's alive bitmask.
+    """
+
+    __slots__ = tuple(key for key in STATUS_KEYS if key != "alive") + ("_alive", "_owner", "_bit")
+
+    def __init__(self, owner: Optional[Any] = None, bit: Optional[int] = None, **statuses: Any):
+        self._owner = owner
+        self._bit = bit
+        for key, default in STATUS_DEFAULTS.items():
+            setattr(self, key, default)
+        self.update(statuses)
+
+    @property
+    def alive(self) -> bool:
+        return self._alive
+
+    @alive.setter
+    def alive(self, value: Any):
+        self._alive = value
+        if self._owner is not None and self._bit is not None:
+            self._owner._set_alive_bit(self._bit, bool(value))
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _STATUS_KEY_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in _STATUS_KEY_SET:
+            raise KeyError(f"Unknown player status '{key}'")
+        setattr(self, key, value)
+
+    def __delitem__(self, key: str):
+        raise TypeError("player statuses cannot be removed")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(STATUS_KEYS)
+
+    def __len__(self) -> int:
+        return len(STATUS_KEYS)
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def __repr__(self) -> str:
+        return f"PlayerState({dict(self)!r})"
@@ -0,0 +1,182 @@
+#backend/storyteller/replay.py
+import json
+import os
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from .grimoire import Grimoire
+from ..utils.paged_log import PagedLog
+
+class Checkpoint:
+    """Grimoire state after `position` mutations. The game log is append-only, so it is shared, not copied."""
+
+    __slots__ = ("position", "state", "log", "log_length")
+
+    def __init__(self, position: int, grimoire: Grimoire):
+        state = grimoire.to_snapshot(with_log=False)
+        self.log: PagedLog = grimoire.game_log
+        self.log_length = len(self.log)
+        self.position = position
+        self.state = json.dumps(state, default=str) #serialized so later mutations cannot reach it
+
+    def restore(self) -> Grimoire:
+        state = json.loads(self.state)
+        state["game_log"] = self.log[:self.log_length]
+        return Grimoire.from_snapshot(state)
+
+class GameReplay:
+    """
+    Seekable replay of an archived game journal. The journal's grimoire mutations form the timeline; position p
+    is the state after the first p of them. One pass builds a sparse checkpoint every `checkpoint_every`
+    mutations (plus one at each snapshot in the journal) and an index of events, phases and days, so a seek
+    restores the nearest checkpoint at or before the target and applies at most `checkpoint_every` mutations.
+    """
+
+    def __init__(self, records: List[Dict[str, Any]], checkpoint_every: int = 50):
+        self.checkpoint_every = max(1, checkpoint_every)
+        self.mutations: List[Tuple[str, Dict[str, Any]]] = []
+        self.checkpoints: List[Checkpoint] = []
+        self.checkpoint_positions: List[int] = []
+        self.event_seqs: List[int] = [] #clock seq of each event, ascending
+        self.event_positions: List[int] = [] #position right after each event
+        self.phase_marks: List[Tuple[int, Optional[str], int]] = [] #(position, phase, day) at every phase or day change
+        self._build(records)
+
+    def _build(self, records: List[Dict[str, Any]]):
+        grimoire = Grimoire()
+        self._checkpoint(grimoire)
+        for record in records:
+            if record["type"] == "snapshot":
+                #the journal's own snapshots also capture direct field writes that were never journaled; a compact
+                #snapshot has no game log, so the one rebuilt from the log_event records so far is kept
+                state = record["grimoire"]
+                grimoire = Grimoire.from_snapshot(state, game_log=None if "game_log" in state else grimoire.game_log)
+                self._checkpoint(grimoire)
+                self._mark_phase(grimoire)
+            elif record["type"] == "mutation":
+                grimoire.apply_mutation(record["op"], record["args"])
+                self.mutations.append((record["op"], record["args"]))
+                if record["op"] == "log_event":
+                    self.event_seqs.append(record["args"]["entry"].get("seq", 0))
+                    self.event_positions.append(len(self.mutations))
+                self._mark_phase(grimoire)
+                if len(self.mutations) - self.checkpoints[-1].position >= self.checkpoint_every:
+                    self._checkpoint(grimoire)
+
+    def _checkpoint(self, grimoire: Grimoire):
+        checkpoint = Checkpoint(len(self.mutations), grimoire)
+        if self.checkpoints and self.checkpoints[-1].position == checkpoint.position:
+            self.checkpoints[-1] = checkpoint #a journal snapshot supersedes the state rebuilt up to it
+        else:
+            self.checkpoints.append(checkpoint)
+            self.checkpoint_positions.append(checkpoint.position)
+
+    def _mark_phase(self, grimoire: Grimoire):
+        mark = (len(self.mutations), grimoire.current_phase, grimoire.day_number)
+        if not self.phase_marks or self.phase_marks[-1][1:] != mark[1:]:
+            self.phase_marks.append(mark)
+
+    @property
+    def length(self) -> int:
+        return len(self.mutations)
+
+    def state_at(self, position: int) -> Grimoire:
+        """A fresh grimoire as it was after `position` mutations (clamped to the game's length)."""
+        position = max(0, min(position, self.length))
+        checkpoint = self.checkpoints[bisect_right(self.checkpoint_positions, position) - 1]
+        grimoire = checkpoint.restore()
+        for op, args in self.mutations[checkpoint.position:position]:
+            grimoire.apply_mutation(op, args)
+        return grimoire
+
+    def position_of_event(self, seq: int) -> int:
+        """Position right after the event with clock seq `seq` (or the first event after it)."""
+        index = bisect_left(self.event_seqs, seq)
+        if index == len(self.event_seqs):
+            raise KeyError(f"No event at or after seq {seq}")
+        return self.event_positions[index]
+
+    def position_of_phase(self, phase: Optional[str] = None, day: Optional[int] = None) -> int:
+        """Position where the game first entered `phase` (on `day`, if given)."""
+        for position, mark_phase, mark_day in self.phase_marks:
+            if (phase is None or mark_phase == phase) and (day is None or mark_day == day):
+                return position
+        raise KeyError(f"Game never reached phase {phase!r} on day {day!r}")
+
+    def seek(self, position: Optional[int] = None, seq: Optional[int] = None,
+             phase: Optional[str] = None, day: Optional[int] = None) -> Tuple[int, Grimoire]:
+        """Resolve one target (a position, an event seq, or a phase and/or day) and return (position, state)."""
+        if seq is not None:
+            position = self.position_of_event(seq)
+        elif phase is not None or day is not None:
+            position = self.position_of_phase(phase, day)
+        elif position is None:
+            position = 0
+        position = max(0, min(position, self.length))
+        return position, self.state_at(position)
+
+    def events_from(self, position: int) -> Iterator[Dict[str, Any]]:
+        """Events logged after `position`, in order."""
+        for index in range(bisect_right(self.event_positions, position), len(self.event_positions)):
+            yield self.mutations[self.event_positions[index] - 1][1]["entry"]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"mutations": self.length, "events": len(self.event_seqs), "checkpoints": len(self.checkpoints),
+                "checkpoint_every": self.checkpoint_every, "phases": len(self.phase_marks)}
+
+def observer_message(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """One logged event as the message the observer UI renders for it live."""
+    event_type, data = entry["event_type"], entry["data"]
+    if event_type == "CHAT":
+        message_type, payload = "CHAT_MESSAGE", data
+    elif event_type == "PHASE_CHANGE":
+        message_type = "GAME_STATE_UPDATE"
+        payload = {"currentPhase": data.get("phase") or data.get("new_phase"), "dayNumber": data.get("day_number"), "reason": "Replay"}
+    else:
+        message_type, payload = "GAME_EVENT", {"message": f"{event_type}: {json.dumps(data, default=str)}"}
+    return {"type": message_type, "payload": payload, "seq": entry.get("seq")}
+
+def replay_messages(replay: GameReplay, position: int, grimoire: Grimoire) -> Iterator[Tuple[float, Dict[str, Any]]]:
+    """
+    (seconds since the previous message, message) pairs for the observer UI: the state at `position` (seating,
+    roles, phase), then every later event, spaced by the game clock's original gaps.
+    """
+    yield 0.0, {"type": "PLAYER_ROLES_UPDATE", "payload": {"roles": grimoire.get_all_player_info_for_observer()}}
+    yield 0.0, {"type": "GAME_STATE_UPDATE", "payload": {"currentPhase": grimoire.current_phase, "dayNumber": grimoire.day_number,
+                                                         "players": grimoire.get_public_player_info(), "reason": "Replay"}}
+    previous_ns = grimoire.game_log[-1].get("mono_ns") if grimoire.game_log else None
+    for entry in replay.events_from(position):
+        mono_ns = entry.get("mono_ns")
+        delay = (mono_ns - previous_ns) / 1e9 if mono_ns is not None and previous_ns is not None else 0.0
+        if mono_ns is not None:
+            previous_ns = mono_ns
+        yield max(0.0, delay), observer_message(entry)
+
+def read_records(path: str) -> List[Dict[str, Any]]:
+    """The journal's snapshot and mutation records (LLM and memory records are not needed to replay the grimoire)."""
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not (line.startswith('{"type": "snapshot"') or line.startswith('{"type": "mutation"')):
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError: #a line torn by a crash; a recovered game continues after it
+                continue
+    return records
+
+_replays: "OrderedDict[Tuple, GameReplay]" = OrderedDict()
+_MAX_CACHED_REPLAYS = 4
+
+def load_replay(path: str, checkpoint_every: int = 50) -> GameReplay:
+    """Index a journal for replay; the index is reused until the file changes."""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size, checkpoint_every)
+    replay = _replays.get(key)
+    if replay is None:
+        replay = GameReplay(read_records(path), checkpoint_every)
+        _replays[key] = replay
+        while len(_replays) > _MAX_CACHED_REPLAYS:
+            _replays.popitem(last=False)
+    _replays.move_to_end(key)
+    return replay
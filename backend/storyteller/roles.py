@@ -1,5 +1,6 @@
 #backend/storyteller/roles.py
 from enum import Enum
+from typing import Any, Dict, FrozenSet, Mapping, Optional, Tuple
 
 class RoleAlignment(Enum):
     GOOD = "Good"
@@ -69,6 +70,7 @@ ROLES_DATA = {
         "description": "Each night, choose two players: you learn if either is a Demon. One of the two players you choose is the Demon, is a 'yes'. If one of the two players you choose is the Recluse, you may learn a 'no'. You have a red herring.",
         "first_night_ability": True,
         "other_night_ability": True,
+        "night_choice": True, #wakes to choose players rather than just receiving info
         "has_red_herring": True
     },
     "Undertaker": {
@@ -81,7 +83,8 @@ ROLES_DATA = {
         "type": RoleType.TOWNSFOLK,
         "alignment": RoleAlignment.GOOD,
         "description": "Each night*, choose a player (not yourself): they are safe from the Demon tonight.",
-        "other_night_ability": True
+        "other_night_ability": True,
+        "night_choice": True
     },
     "Ravenkeeper": {
         "type": RoleType.TOWNSFOLK,
@@ -121,7 +124,9 @@ ROLES_DATA = {
         "type": RoleType.OUTSIDER,
         "alignment": RoleAlignment.GOOD,
         "description": "Each night, choose a player (not yourself): tomorrow, you may only vote if they vote.",
-        "other_night_ability": True
+        "first_night_ability": True,
+        "other_night_ability": True,
+        "night_choice": True
     },
     "Drunk": {
         "type": RoleType.OUTSIDER,
@@ -151,13 +156,16 @@ ROLES_DATA = {
         "type": RoleType.MINION,
         "alignment": RoleAlignment.EVIL,
         "description": "Each night, choose a player: they are poisoned tonight and tomorrow day. Their ability malfunctions.",
+        "first_night_ability": True,
         "other_night_ability": True,
+        "night_choice": True,
         "knows_demon": True
     },
     "Spy": {
         "type": RoleType.MINION,
         "alignment": RoleAlignment.EVIL,
         "description": "Each night, you see the Grimoire. You might register as good, or as a Townsfolk or Outsider, even if dead.",
+        "first_night_ability": True,
         "other_night_ability": True,
         "knows_demon": True
         #special handling: can confuse Investigator, Fortune Teller, Empath, Undertaker, Ravenkeeper, Slayer
@@ -183,16 +191,68 @@ ROLES_DATA = {
         "alignment": RoleAlignment.EVIL,
         "description": "Each night*, choose a player: they die. If you kill yourself, a Minion becomes the Imp.",
         "other_night_ability": True,
+        "night_choice": True,
         "demon_kill": True,
         "suicide_promotion": True #if self-target, new Imp (Scarlet Woman if in play and conditions met)
     }
 }
 
+#ability flags the registry indexes; each maps to the ROLES_DATA keys that set it
+ABILITY_FLAGS: Dict[str, Tuple[str, ...]] = {
+    "first_night": ("first_night_ability",),
+    "other_night": ("other_night_ability",),
+    "night_choice": ("night_choice",),
+    "day": ("day_ability",),
+    "on_death": ("on_death_night_ability", "on_death_night_ability_passive"),
+    "setup": ("affects_setup",),
+}
+
+class _FrozenDict(dict):
+    """A dict that refuses mutation, so precomputed tables can be handed out without copying."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("role registry tables are read-only")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _readonly
+
+class RoleRegistry:
+    """
+    Lookup tables over a roles table (ROLES_DATA for Trouble Brewing), built once. Indexes roles by type,
+    alignment and ability flag so hot-path checks are single lookups; another edition is just another table.
+    """
+
+    def __init__(self, roles_data: Mapping[str, Dict[str, Any]]):
+        self.details = roles_data
+        self.type_of: Mapping[str, RoleType] = _FrozenDict({name: data["type"] for name, data in roles_data.items()})
+        self.alignment_of: Mapping[str, RoleAlignment] = _FrozenDict(
+            {name: data["alignment"] for name, data in roles_data.items() if "alignment" in data})
+        self.by_type: Mapping[RoleType, Mapping[str, Dict[str, Any]]] = _FrozenDict(
+            {role_type: _FrozenDict({name: data for name, data in roles_data.items() if data["type"] == role_type})
+             for role_type in RoleType})
+        self.by_alignment: Mapping[RoleAlignment, FrozenSet[str]] = _FrozenDict(
+            {alignment: frozenset(name for name, value in self.alignment_of.items() if value == alignment)
+             for alignment in RoleAlignment})
+        self.by_flag: Mapping[str, FrozenSet[str]] = _FrozenDict(
+            {flag: frozenset(name for name, data in roles_data.items() if any(data.get(key) for key in keys))
+             for flag, keys in ABILITY_FLAGS.items()})
+
+    def is_type(self, role_name: Optional[str], role_type: RoleType) -> bool:
+        return self.type_of.get(role_name) is role_type
+
+    def has_flag(self, role_name: Optional[str], flag: str) -> bool:
+        return role_name in self.by_flag[flag]
+
+    def roles_of_type(self, *role_types: RoleType) -> Tuple[str, ...]:
+        return tuple(name for role_type in role_types for name in self.by_type[role_type])
+
+ROLE_REGISTRY = RoleRegistry(ROLES_DATA)
+
 def get_role_details(role_name: str):
     return ROLES_DATA.get(role_name)
 
 def get_roles_by_type(role_type: RoleType):
-    return {name: data for name, data in ROLES_DATA.items() if data["type"] == role_type}
+    """Roles of one type (name -> details); a shared read-only table."""
+    return ROLE_REGISTRY.by_type[role_type]
 
 def get_all_roles():
     return list(ROLES_DATA.keys()) 
\ No newline at end of file
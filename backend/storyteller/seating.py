@@ -0,0 +1,86 @@
+#backend/storyteller/seating.py
+from typing import Callable, Dict, List, Optional
+
+class SeatRing:
+    """
+    The seating circle as index maps plus a doubly linked ring of alive seats.
+    A death unlinks the seat in O(1), so each alive player's closest alive neighbours are always two list
+    reads away. Reviving a seat (rare) re-links it by walking to the nearest alive seats.
+    """
+
+    def __init__(self, seating: Optional[List[str]] = None):
+        self.seats: List[str] = []
+        self.seat_index: Dict[str, int] = {}
+        self.alive: List[bool] = []
+        self.left: List[int] = []
+        self.right: List[int] = []
+        self.reset(seating or [], [True] * len(seating or []))
+
+    def reset(self, seating: List[str], alive: List[bool]):
+        """Rebuild for a new seating order (setup or reseating); O(n)."""
+        self.seats = list(seating)
+        self.seat_index = {pid: seat for seat, pid in enumerate(self.seats)}
+        self.alive = list(alive)
+        n = len(self.seats)
+        self.left = [(seat - 1) % n for seat in range(n)]
+        self.right = [(seat + 1) % n for seat in range(n)]
+        for seat in range(n):
+            if not self.alive[seat]:
+                self._unlink(seat)
+
+    def add_seat(self, player_id: str, alive: bool = True):
+        self.reset(self.seats + [player_id], self.alive + [alive])
+
+    def seat_of(self, player_id: str) -> Optional[int]:
+        return self.seat_index.get(player_id)
+
+    def _unlink(self, seat: int):
+        left, right = self.left[seat], self.right[seat]
+        self.right[left] = right
+        self.left[right] = left
+
+    def set_alive(self, seat: int, alive: bool):
+        if self.alive[seat] == alive:
+            return
+        self.alive[seat] = alive
+        if not alive:
+            self._unlink(seat)
+            return
+        left, right = self._nearest_alive(seat, -1), self._nearest_alive(seat, 1)
+        if left is None: #the only alive seat links to itself
+            left = right = seat
+        self.left[seat], self.right[seat] = left, right
+        self.right[left] = seat
+        self.left[right] = seat
+
+    def _nearest_alive(self, seat: int, step: int) -> Optional[int]:
+        n = len(self.seats)
+        for offset in range(1, n):
+            candidate = (seat + step * offset) % n
+            if self.alive[candidate]:
+                return candidate
+        return None
+
+    def alive_neighbors(self, player_id: str) -> List[str]:
+        """The closest alive player on each side (dead players are skipped); fewer if too few are alive."""
+        seat = self.seat_index.get(player_id)
+        if seat is None:
+            return []
+        if self.alive[seat]:
+            left, right = self.left[seat], self.right[seat]
+        else:
+            left, right = self._nearest_alive(seat, -1), self._nearest_alive(seat, 1)
+        neighbors = []
+        for other in (left, right):
+            if other is not None and other != seat and self.seats[other] not in neighbors:
+                neighbors.append(self.seats[other])
+        return neighbors
+
+    def adjacent_pairs(self, is_marked: Callable[[str], bool]) -> int:
+        """Number of adjacent seat pairs (dead or alive) where both players satisfy `is_marked`."""
+        n = len(self.seats)
+        if n < 2:
+            return 0
+        marked = [is_marked(pid) for pid in self.seats]
+        pairs = n if n > 2 else 1
+        return sum(1 for seat in range(pairs) if marked[seat] and marked[(seat + 1) % n])
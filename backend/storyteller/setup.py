@@ -0,0 +1,202 @@
+#backend/storyteller/setup.py
+import random
+from typing import Any, Dict, List, Optional, Tuple
+from .grimoire import Grimoire
+from .roles import ROLE_REGISTRY, RoleAlignment, RoleType, get_role_details, get_roles_by_type
+
+#base number of outsiders for each player count (Trouble Brewing distribution)
+BASE_OUTSIDERS = {5: 0, 6: 1, 7: 0, 8: 1, 9: 2, 10: 0, 11: 1, 12: 2, 13: 0, 14: 1, 15: 2}
+BARON_EXTRA_OUTSIDERS = 2
+FIRST_NIGHT_INFO_ROLES = ("Washerwoman", "Librarian", "Investigator", "Chef", "Empath")
+
+class GameSetupEngine:
+    """
+    Builds a complete game setup locally from ROLES_DATA, replacing the Storyteller LLM setup call.
+    Handles seating, alignments, statuses, demon bluffs, the Fortune Teller red herring, the Drunk's
+    fake role, Recluse/Spy misregistration, the Baron outsider adjustment and first-night info.
+    All random choices come from one RNG so a seed reproduces the whole setup.
+    """
+
+    def __init__(self, seed: Optional[int] = None, misregister_chance: float = 0.5):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.misregister_chance = misregister_chance #how often a Recluse/Spy shows its false persona to info roles
+        self._personas: Optional[Dict[str, bool]] = None #player_id -> misregisters, rolled once per clue being computed
+
+    def adjust_for_baron(self, player_ids_roles: Dict[str, str]) -> Tuple[Dict[str, str], List[str]]:
+        """If the Baron is in play, turn Townsfolk into Outsiders until the Baron's two extra Outsiders are present."""
+        roles = dict(player_ids_roles)
+        if "Baron" not in roles.values():
+            return roles, []
+        outsiders_in_play = [r for r in roles.values() if ROLE_REGISTRY.is_type(r, RoleType.OUTSIDER)]
+        expected = BASE_OUTSIDERS.get(len(roles), 0) + BARON_EXTRA_OUTSIDERS
+        available = [r for r in get_roles_by_type(RoleType.OUTSIDER) if r not in roles.values()]
+        townsfolk_players = [pid for pid, r in roles.items() if ROLE_REGISTRY.is_type(r, RoleType.TOWNSFOLK)]
+        added: List[str] = []
+        while len(outsiders_in_play) + len(added) < expected and available and townsfolk_players:
+            player_id = townsfolk_players.pop(self.rng.randrange(len(townsfolk_players)))
+            outsider = available.pop(self.rng.randrange(len(available)))
+            roles[player_id] = outsider
+            added.append(outsider)
+        return roles, added
+
+    def build(self, grimoire: Grimoire, player_ids_roles: Dict[str, str], player_names: Optional[Dict[str, str]] = None,
+              shuffle_seating: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Populate an empty grimoire with the full setup and move it to FIRST_NIGHT.
+        Returns the first-night info clue for each info-role player (player_id -> clue).
+        """
+        roles, baron_added = self.adjust_for_baron(player_ids_roles)
+        seating = list(roles.keys())
+        if shuffle_seating:
+            self.rng.shuffle(seating)
+
+        names = grimoire.game_state.setdefault("player_names", {})
+        for player_id in seating:
+            role = roles[player_id]
+            role_details = get_role_details(role)
+            alignment = role_details["alignment"].value if role_details else RoleAlignment.GOOD.value
+            grimoire.add_player(player_id, role, alignment)
+            names[player_id] = (player_names or {}).get(player_id) or f"Player {player_id[-1]}"
+        grimoire.baron_added_outsiders = baron_added
+
+        in_play = set(roles.values())
+        unused_townsfolk = [r for r in get_roles_by_type(RoleType.TOWNSFOLK) if r not in in_play]
+        self.rng.shuffle(unused_townsfolk)
+
+        for player_id in grimoire.get_player_ids_by_role("Drunk"):
+            fake_role = unused_townsfolk.pop() if unused_townsfolk else None
+            grimoire.statuses[player_id].update({"is_drunk": True, "thinks_is_role": fake_role, "thinks_is_alignment": RoleAlignment.GOOD.value})
+        grimoire.demon_bluffs = unused_townsfolk[:3]
+
+        for player_id in grimoire.get_player_ids_by_role("Recluse"):
+            evil_roles = list(ROLE_REGISTRY.roles_of_type(RoleType.MINION, RoleType.DEMON))
+            grimoire.statuses[player_id].update({"misregisters_as_role": self.rng.choice(evil_roles), "misregisters_as_alignment": RoleAlignment.EVIL.value})
+        for player_id in grimoire.get_player_ids_by_role("Spy"):
+            good_roles = [r for r in ROLE_REGISTRY.roles_of_type(RoleType.TOWNSFOLK, RoleType.OUTSIDER) if r not in in_play]
+            grimoire.statuses[player_id].update({"misregisters_as_role": self.rng.choice(good_roles) if good_roles else None, "misregisters_as_alignment": RoleAlignment.GOOD.value})
+
+        demons = grimoire.get_player_ids_by_type(RoleType.DEMON)
+        grimoire.current_demon_player_id = demons[0] if demons else None
+
+        thinks_fortune_teller = any(grimoire.statuses[pid]["thinks_is_role"] == "Fortune Teller" for pid in seating)
+        good_players = grimoire.get_player_ids_by_alignment(RoleAlignment.GOOD.value)
+        if ("Fortune Teller" in in_play or thinks_fortune_teller) and good_players:
+            grimoire.fortune_teller_red_herring_player_id = self.rng.choice(good_players)
+
+        grimoire.log_event("GAME_SETUP", {
+            "seating_order": list(seating),
+            "roles": dict(roles),
+            "demon_bluffs": list(grimoire.demon_bluffs),
+            "baron_added_outsiders": baron_added,
+            "fortune_teller_red_herring_player_id": grimoire.fortune_teller_red_herring_player_id,
+            "seed": self.seed
+        })
+
+        first_night_info: Dict[str, Dict[str, Any]] = {}
+        for player_id in seating:
+            clue = self.first_night_info(grimoire, player_id)
+            if clue:
+                grimoire.add_private_clue(player_id, clue)
+                first_night_info[player_id] = clue
+
+        grimoire.log_event("PHASE_CHANGE", {"new_phase": "FIRST_NIGHT", "day_number": 0})
+        return first_night_info
+
+    #--- registration helpers (Recluse/Spy may register as their false persona) ---
+
+    def _misregisters(self, grimoire: Grimoire, player_id: str) -> bool:
+        if not grimoire.get_player_status(player_id, "misregisters_as_role"):
+            return False
+        if self._personas is None:
+            return self.rng.random() < self.misregister_chance
+        if player_id not in self._personas:
+            self._personas[player_id] = self.rng.random() < self.misregister_chance
+        return self._personas[player_id]
+
+    def registered_role(self, grimoire: Grimoire, player_id: str) -> Optional[str]:
+        if self._misregisters(grimoire, player_id):
+            return grimoire.get_player_status(player_id, "misregisters_as_role")
+        return grimoire.get_player_role(player_id)
+
+    def registered_alignment(self, grimoire: Grimoire, player_id: str) -> Optional[str]:
+        if self._misregisters(grimoire, player_id):
+            return grimoire.get_player_status(player_id, "misregisters_as_alignment")
+        return grimoire.get_player_alignment(player_id)
+
+    #--- first night information ---
+
+    def first_night_info(self, grimoire: Grimoire, player_id: str) -> Optional[Dict[str, Any]]:
+        """Compute the first-night clue for an info role; the Drunk gets arbitrary info for the role they think they are."""
+        role = grimoire.get_player_role(player_id)
+        is_drunk = grimoire.get_player_status(player_id, "is_drunk")
+        shown_role = grimoire.get_player_status(player_id, "thinks_is_role") if is_drunk else role
+        if shown_role not in FIRST_NIGHT_INFO_ROLES:
+            return None
+        others = [pid for pid in grimoire.players if pid != player_id]
+        self._personas = {} #a Recluse/Spy registers the same way throughout one clue (every pair of a Chef count, every candidate)
+        try:
+            clue = self._compute_clue(grimoire, player_id, shown_role, is_drunk, others)
+        finally:
+            self._personas = None
+        clue.update({"type": "FIRST_NIGHT_INFO", "role": shown_role})
+        clue["text"] = self._describe(grimoire, clue)
+        return clue
+
+    def _compute_clue(self, grimoire: Grimoire, player_id: str, shown_role: str, is_drunk: bool, others: List[str]) -> Dict[str, Any]:
+        if is_drunk:
+            clue = self._false_info(grimoire, shown_role, others)
+        elif shown_role == "Washerwoman":
+            clue = self._pair_info(grimoire, others, RoleType.TOWNSFOLK)
+        elif shown_role == "Librarian":
+            clue = self._pair_info(grimoire, others, RoleType.OUTSIDER)
+        elif shown_role == "Investigator":
+            clue = self._pair_info(grimoire, others, RoleType.MINION)
+        elif shown_role == "Chef":
+            clue = {"count": self.evil_pairs(grimoire)}
+        else:
+            clue = {"count": self.evil_neighbors(grimoire, player_id)}
+        return clue
+
+    def _pair_info(self, grimoire: Grimoire, others: List[str], role_type: RoleType) -> Dict[str, Any]:
+        candidates = []
+        for pid in others:
+            role = self.registered_role(grimoire, pid)
+            if ROLE_REGISTRY.is_type(role, role_type):
+                candidates.append((pid, role))
+        if not candidates:
+            return {"players": [], "shown_role": None}
+        target, shown_role = self.rng.choice(candidates)
+        decoy = self.rng.choice([pid for pid in others if pid != target] or [target])
+        pair = [target, decoy]
+        self.rng.shuffle(pair)
+        return {"players": pair, "shown_role": shown_role}
+
+    def _false_info(self, grimoire: Grimoire, shown_role: str, others: List[str]) -> Dict[str, Any]:
+        if shown_role in ("Chef", "Empath"):
+            return {"count": self.rng.randint(0, 2)}
+        role_type = {"Washerwoman": RoleType.TOWNSFOLK, "Librarian": RoleType.OUTSIDER, "Investigator": RoleType.MINION}[shown_role]
+        players = self.rng.sample(others, 2) if len(others) >= 2 else list(others)
+        return {"players": players, "shown_role": self.rng.choice(list(get_roles_by_type(role_type)))}
+
+    def evil_pairs(self, grimoire: Grimoire) -> int:
+        """Number of adjacent pairs of (registered) evil players around the circle."""
+        return grimoire.evil_pairs_count(lambda pid: self.registered_alignment(grimoire, pid) == RoleAlignment.EVIL.value)
+
+    def evil_neighbors(self, grimoire: Grimoire, player_id: str) -> int:
+        """Number of the player's two closest alive neighbours that register as evil."""
+        return sum(1 for pid in grimoire.alive_neighbors(player_id) if self.registered_alignment(grimoire, pid) == RoleAlignment.EVIL.value)
+
+    @staticmethod
+    def _describe(grimoire: Grimoire, clue: Dict[str, Any]) -> str:
+        names = grimoire.game_state.get("player_names", {})
+        role = clue["role"]
+        if role == "Chef":
+            return f"You see {clue['count']} pair(s) of evil players sitting next to each other."
+        if role == "Empath":
+            return f"You sense {clue['count']} evil neighbour(s)."
+        if not clue.get("shown_role"):
+            kind = {"Librarian": "Outsiders", "Investigator": "Minions"}.get(role, "Townsfolk")
+            return f"There are no {kind} in play."
+        first, second = (names.get(pid, pid) for pid in clue["players"])
+        return f"One of {first} or {second} is the {clue['shown_role']}."
@@ -0,0 +1,91 @@
+#backend/storyteller/snapshot.py
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+def freeze(value: Any) -> Any:
+    """Recursively turn dicts into read-only mappings and lists into tuples so a context can be shared safely."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+def _reuse(previous: Optional[Mapping], current: Dict) -> Mapping:
+    """Share the previous frozen mapping when nothing in it changed."""
+    return previous if previous is not None and previous == current else MappingProxyType(dict(current))
+
+class GrimoireSnapshot:
+    """
+    Immutable, consistent view of a grimoire at one version. Unchanged parts (roles, alignments, each
+    player's statuses) are shared with the previous snapshot. Derived views are built at most once per
+    snapshot via `view`; they are shared by every reader and must be treated as read-only.
+    """
+
+    __slots__ = ("version", "players", "roles", "alignments", "statuses", "player_names",
+                 "current_phase", "day_number", "game_state", "_views")
+
+    def __init__(self, version: int, players: Tuple[str, ...], roles: Mapping[str, str], alignments: Mapping[str, str],
+                 statuses: Mapping[str, Mapping[str, Any]], player_names: Mapping[str, str], current_phase: Optional[str],
+                 day_number: int, game_state: Mapping[str, Any]):
+        self.version = version
+        self.players = players
+        self.roles = roles
+        self.alignments = alignments
+        self.statuses = statuses
+        self.player_names = player_names
+        self.current_phase = current_phase
+        self.day_number = day_number
+        self.game_state = game_state
+        self._views: Dict[str, Any] = {}
+
+    def name_of(self, player_id: str) -> str:
+        return self.player_names.get(player_id, player_id)
+
+    def is_alive(self, player_id: str) -> bool:
+        return bool(self.statuses.get(player_id, {}).get("alive", False))
+
+    def view(self, name: str, build: Callable[["GrimoireSnapshot"], Any]) -> Any:
+        """Memoized derived view: `build(snapshot)` runs once per snapshot (i.e. once per grimoire version)."""
+        if name not in self._views:
+            self._views[name] = build(self)
+        return self._views[name]
+
+def take_snapshot(grimoire: Any, previous: Optional[GrimoireSnapshot] = None) -> GrimoireSnapshot:
+    previous_statuses = previous.statuses if previous else {}
+    statuses = MappingProxyType({pid: _reuse(previous_statuses.get(pid), status) for pid, status in grimoire.statuses.items()})
+    return GrimoireSnapshot(
+        version=grimoire.version,
+        players=tuple(grimoire.players),
+        roles=_reuse(previous.roles if previous else None, grimoire.roles),
+        alignments=_reuse(previous.alignments if previous else None, grimoire.alignments),
+        statuses=statuses,
+        player_names=_reuse(previous.player_names if previous else None, grimoire.game_state.get("player_names", {})),
+        current_phase=grimoire.current_phase,
+        day_number=grimoire.day_number,
+        game_state=freeze(grimoire.game_state),
+    )
+
+#--- common derived views (plain JSON-ready structures, shared per version) ---
+
+def observer_players_view(snapshot: GrimoireSnapshot):
+    return [
+        {"id": pid, "name": snapshot.name_of(pid), "role": snapshot.roles.get(pid),
+         "alignment": snapshot.alignments.get(pid), "status": dict(snapshot.statuses.get(pid, {}))}
+        for pid in snapshot.players
+    ]
+
+def public_players_view(snapshot: GrimoireSnapshot):
+    return [{"id": pid, "name": snapshot.name_of(pid), "isAlive": snapshot.is_alive(pid)} for pid in snapshot.players]
+
+def player_details_view(snapshot: GrimoireSnapshot):
+    return [{"id": pid, "name": snapshot.name_of(pid), "is_alive": snapshot.is_alive(pid)} for pid in snapshot.players]
+
+def storyteller_state_view(snapshot: GrimoireSnapshot):
+    return {
+        "players": list(snapshot.players),
+        "roles": dict(snapshot.roles),
+        "alignments": dict(snapshot.alignments),
+        "statuses": {pid: dict(status) for pid, status in snapshot.statuses.items()},
+        "current_phase": snapshot.current_phase,
+        "day_number": snapshot.day_number,
+    }
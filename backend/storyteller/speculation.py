@@ -0,0 +1,98 @@
+#backend/storyteller/speculation.py
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from ..llm_providers import start_usage_meter
+
+SpawnFn = Callable[[Awaitable[Any], str], Optional[asyncio.Task]]
+
+def speculation_key(kind: str, player_id: str, subject: Optional[str], public_version: int, chat_length: int) -> Tuple:
+    """A speculative result is only reused when the decision, the public state and the day's chat are unchanged."""
+    return (kind, player_id, subject, public_version, chat_length)
+
+def _tokens(meter: Optional[Dict[str, int]]) -> int:
+    return (meter["prompt_tokens"] + meter["completion_tokens"]) if meter else 0
+
+class SpeculativeDecisions:
+    """
+    Precomputes likely AI decisions (nomination intents, votes on the current nominee) while the
+    Storyteller call is in flight. Results are keyed by the grimoire's public version and the chat length;
+    a later request for the same key takes the result, anything else is cancelled and counted as waste.
+    Spends extra tokens to save wall-clock time, so it is off unless `speculative_prefetch` is enabled.
+    """
+
+    def __init__(self, spawn: SpawnFn, max_entries: int = 64):
+        self.spawn = spawn
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple, Dict[str, Any]] = {} #key -> {"task", "meter"}
+        self.prefetched = 0
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+        self.used_tokens = 0
+        self.wasted_tokens = 0
+
+    def prefetch(self, key: Tuple, factory: Callable[[], Awaitable[Any]]) -> bool:
+        """Start `factory()` speculatively unless the key is already in flight. Returns True if a task started."""
+        if key in self._entries or len(self._entries) >= self.max_entries:
+            return False
+        entry: Dict[str, Any] = {"meter": None}
+
+        async def run():
+            entry["meter"] = start_usage_meter() #usage of this task only (tasks copy the context)
+            return await factory()
+
+        task = self.spawn(run(), "speculation")
+        if task is None:
+            return False
+        entry["task"] = task
+        self._entries[key] = entry
+        self.prefetched += 1
+        return True
+
+    async def take(self, key: Tuple) -> Tuple[bool, Any]:
+        """Return (True, result) if a speculative result exists for exactly this key, else (False, None)."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        try:
+            result = await entry["task"]
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                raise #the caller itself was cancelled, not just the speculative task
+            self.misses += 1
+            self.wasted_tokens += _tokens(entry["meter"])
+            return False, None
+        except Exception:
+            self.misses += 1
+            self.wasted_tokens += _tokens(entry["meter"])
+            return False, None
+        self.hits += 1
+        self.used_tokens += _tokens(entry["meter"])
+        return True, result
+
+    def discard_stale(self, is_current: Callable[[Tuple], bool]) -> int:
+        """Cancel speculative work whose key no longer matches the game state."""
+        stale = [key for key in self._entries if not is_current(key)]
+        for key in stale:
+            entry = self._entries.pop(key)
+            entry["task"].cancel()
+            self.discarded += 1
+            self.wasted_tokens += _tokens(entry["meter"])
+        return len(stale)
+
+    def clear(self) -> int:
+        return self.discard_stale(lambda key: False)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "in_flight": len(self._entries),
+            "prefetched": self.prefetched,
+            "hits": self.hits,
+            "misses": self.misses,
+            "discarded": self.discarded,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "used_tokens_est": self.used_tokens,
+            "wasted_tokens_est": self.wasted_tokens
+        }
@@ -0,0 +1,122 @@
+#backend/storyteller/voting.py
+import asyncio
+import math
+from typing import Any, Awaitable, Callable, Coroutine, Dict, List, Mapping, Optional, Tuple
+from .grimoire import Grimoire
+from .snapshot import freeze
+from ..utils.logger import get_logger
+
+logger = get_logger("game")
+
+class VotingEngine:
+    """
+    Collects the votes on a nominee concurrently and tallies them locally.
+    One immutable context is built per nominee and shared by every voter. Votes are reported through
+    `on_vote` as they land; the tally then walks the seats in order to apply the Butler restriction
+    (a Butler's vote only counts if their master voted) and spend dead-vote tokens. The day's vote state
+    (highest count, nominees already tallied) lives in grimoire.game_state, written through the journal.
+    """
+
+    STATE_KEY = "voting_day"
+
+    def __init__(self, grimoire: Grimoire):
+        self.grimoire = grimoire
+        self.tallies: Dict[Tuple[int, str], Dict[str, Any]] = {} #(day, nominee_id) -> tally, for this process's votes
+
+    def _today(self) -> Dict[str, Any]:
+        state = self.grimoire.game_state.get(self.STATE_KEY)
+        if state and state["day"] == self.grimoire.day_number:
+            return state
+        return {"day": self.grimoire.day_number, "highest": 0, "tallied": []}
+
+    @staticmethod
+    def build_context(base_context: Dict[str, Any]) -> Mapping[str, Any]:
+        return freeze(base_context)
+
+    def already_tallied(self, nominee_id: str) -> bool:
+        return nominee_id in self._today()["tallied"]
+
+    def eligible_voters(self) -> List[str]:
+        """Alive players plus dead players who still hold their dead-vote token, in seat order."""
+        return [
+            pid for pid in self.grimoire.players
+            if self.grimoire.is_player_alive(pid) or not self.grimoire.get_player_status(pid, "dead_vote_used")
+        ]
+
+    def required_votes(self) -> int:
+        return math.ceil(len(self.grimoire.get_alive_players()) / 2)
+
+    async def run_vote(self, nominee_id: str, voters: List[str], decide: Callable[[str], Awaitable[Optional[bool]]],
+                       on_vote: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+                       spawn: Callable[[Coroutine], Optional[asyncio.Task]] = asyncio.create_task) -> Dict[str, Any]:
+        """
+        Ask every voter at once via `decide(voter_id) -> bool | None`, then tally. Requests are started with
+        `spawn` (pass a TaskSupervisor's so the game owns them) and cancelled if the vote itself is cancelled.
+        """
+        async def collect(voter_id: str) -> Tuple[str, Optional[bool]]:
+            try:
+                return voter_id, await decide(voter_id)
+            except Exception as e:
+                logger.warning("Vote from %s failed: %s", voter_id, e)
+                return voter_id, None
+
+        raw_votes: Dict[str, Optional[bool]] = {}
+        tasks = [task for task in (spawn(collect(pid)) for pid in voters) if task is not None]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                voter_id, vote = await finished
+                raw_votes[voter_id] = vote
+                if on_vote:
+                    await on_vote({"nominee_id": nominee_id, "voter_id": voter_id, "vote": vote, "votes_received": len(raw_votes), "voters_expected": len(voters)})
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return self.tally(nominee_id, raw_votes)
+
+    def tally(self, nominee_id: str, raw_votes: Dict[str, Optional[bool]]) -> Dict[str, Any]:
+        day = self.grimoire.day_number
+        today = self._today()
+        highest = today["highest"]
+
+        counted: List[str] = []
+        discarded: Dict[str, str] = {}
+        for voter_id in self.grimoire.players:
+            if not raw_votes.get(voter_id):
+                continue
+            if self.grimoire.get_player_role(voter_id) == "Butler":
+                master = self.grimoire.get_player_status(voter_id, "butler_master")
+                if master and not raw_votes.get(master):
+                    discarded[voter_id] = "BUTLER_MASTER_DID_NOT_VOTE"
+                    continue
+            if not self.grimoire.is_player_alive(voter_id):
+                if self.grimoire.get_player_status(voter_id, "dead_vote_used"):
+                    discarded[voter_id] = "NO_DEAD_VOTE_LEFT"
+                    continue
+                self.grimoire.set_status(voter_id, "dead_vote_used", True)
+            counted.append(voter_id)
+
+        votes_for = len(counted)
+        required = self.required_votes()
+        tied = votes_for >= required and votes_for == highest
+        on_the_block = votes_for >= required and votes_for > highest
+        if votes_for >= required:
+            highest = max(highest, votes_for)
+            self.grimoire.set_value(["game_state", "on_the_block"], {"nominee_id": nominee_id, "votes": votes_for} if on_the_block else None)
+
+        result = {
+            "nominee_id": nominee_id,
+            "day": day,
+            "votes_for": votes_for,
+            "required": required,
+            "yes_voters": counted,
+            "no_voters": [pid for pid, vote in raw_votes.items() if vote is False],
+            "discarded": discarded,
+            "on_the_block": on_the_block,
+            "tied": tied,
+        }
+        self.tallies[(day, nominee_id)] = result
+        self.grimoire.set_value(["game_state", self.STATE_KEY], {"day": day, "highest": highest, "tallied": today["tallied"] + [nominee_id]})
+        self.grimoire.log_event("VOTE_TALLY", result)
+        return result
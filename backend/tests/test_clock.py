@@ -0,0 +1,34 @@
+import asyncio
+from backend.storyteller.clock import GameClock
+from backend.storyteller.command_executor import StorytellerCommandExecutor
+from backend.storyteller.grimoire import Grimoire
+
+
+def test_stamps_are_ordered_and_monotonic():
+    clock = GameClock()
+    first, second = clock.stamp(), clock.stamp()
+    assert (first["seq"], second["seq"]) == (1, 2)
+    assert second["mono_ns"] >= first["mono_ns"]
+    assert second["timestamp"] >= first["timestamp"]
+    assert GameClock.elapsed_ms(first, second) >= 0
+
+
+def test_game_log_is_in_seq_order_and_shares_chat_stamps():
+    g = Grimoire()
+    g.add_player('p1', 'Monk', 'Good')
+    stamp = g.clock.stamp()
+    chat = {"sender": "p1", "text": "hi", **stamp}
+    g.log_event("CHAT", chat, stamp=stamp)
+    g.log_event("PHASE_CHANGE", {"phase": "DAY_CHAT"})
+    seqs = [entry["seq"] for entry in g.game_log]
+    assert seqs == sorted(seqs) and len(set(seqs)) == len(seqs)
+    assert g.game_log[1]["seq"] == chat["seq"]
+
+
+def test_command_timings_carry_the_game_clock():
+    clock = GameClock()
+    async def run(command):
+        pass
+    executor = StorytellerCommandExecutor(run, stamp=clock.stamp)
+    asyncio.run(executor.execute([{"command": "LOG_EVENT"}, {"command": "BROADCAST_MESSAGE"}]))
+    assert [t["seq"] for t in executor.timings] == [1, 2]
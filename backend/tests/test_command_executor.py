@@ -0,0 +1,89 @@
+import asyncio
+from backend.storyteller.command_executor import StorytellerCommandExecutor
+
+
+def msg(pid, text='hi'):
+    return {'command': 'SEND_PERSONAL_MESSAGE', 'params': {'player_id': pid, 'message_type': 'INFO', 'content': text}}
+
+
+def mutation(pid):
+    return {'command': 'UPDATE_GRIMOIRE_VALUE', 'params': {'path': ['statuses', pid, 'alive'], 'value': False}}
+
+
+def test_plan_groups_sends_between_barriers():
+    executor = StorytellerCommandExecutor(lambda c: None)
+    stages = executor.plan([msg('p1'), msg('p2'), mutation('p1'), msg('p1'), {'command': 'BROADCAST_MESSAGE', 'params': {}}])
+    assert [s['concurrent'] for s in stages] == [True, False, True]
+    assert set(stages[0]['lanes']) == {'player:p1', 'player:p2'}
+    assert set(stages[2]['lanes']) == {'player:p1', 'broadcast'}
+
+
+def test_sends_run_concurrently_and_barriers_stay_ordered():
+    events = []
+    active = {'now': 0, 'peak': 0}
+
+    async def run(command):
+        active['now'] += 1
+        active['peak'] = max(active['peak'], active['now'])
+        await asyncio.sleep(0.01)
+        active['now'] -= 1
+        events.append((command['command'], command['params'].get('player_id'), command['params'].get('content')))
+
+    executor = StorytellerCommandExecutor(run)
+    commands = [msg('p1', 'a'), msg('p2'), msg('p1', 'b'), mutation('p1'), msg('p3')]
+    asyncio.run(executor.execute(commands))
+    assert active['peak'] == 2
+    #per-player order is kept and the barrier waits for the whole stage
+    assert [e for e in events if e[1] == 'p1' and e[0] == 'SEND_PERSONAL_MESSAGE'] == [
+        ('SEND_PERSONAL_MESSAGE', 'p1', 'a'), ('SEND_PERSONAL_MESSAGE', 'p1', 'b')]
+    assert events.index(('UPDATE_GRIMOIRE_VALUE', None, None)) == 3
+    assert events[-1][1] == 'p3'
+    assert len(executor.timings) == 5
+
+
+def test_failing_command_does_not_cancel_siblings():
+    done = []
+
+    async def run(command):
+        if command['params']['player_id'] == 'p1':
+            raise RuntimeError('boom')
+        await asyncio.sleep(0.01)
+        done.append(command['params']['player_id'])
+
+    executor = StorytellerCommandExecutor(run)
+    asyncio.run(executor.execute([msg('p1'), msg('p2')]))
+    assert done == ['p2']
+    assert any(t['error'] for t in executor.timings)
+
+
+def test_should_stop_skips_remaining_stages():
+    state = {'stopped': False, 'ran': []}
+
+    async def run(command):
+        state['ran'].append(command['command'])
+        if command['command'] == 'END_GAME':
+            state['stopped'] = True
+
+    executor = StorytellerCommandExecutor(run, should_stop=lambda: state['stopped'])
+    asyncio.run(executor.execute([{'command': 'END_GAME', 'params': {}}, msg('p1')]))
+    assert state['ran'] == ['END_GAME']
+
+
+def test_execute_stream_starts_commands_before_stream_ends():
+    started = []
+
+    async def run(command):
+        started.append(command['params'].get('player_id'))
+
+    async def stream():
+        yield msg('p1')
+        await asyncio.sleep(0.02)
+        #the first send already ran while the stream was still producing
+        assert started == ['p1']
+        yield msg('p2')
+        yield mutation('p1')
+
+    executor = StorytellerCommandExecutor(run)
+    executed = asyncio.run(executor.execute_stream(stream()))
+    assert [c['command'] for c in executed] == ['SEND_PERSONAL_MESSAGE', 'SEND_PERSONAL_MESSAGE', 'UPDATE_GRIMOIRE_VALUE']
+    assert started == ['p1', 'p2', None]
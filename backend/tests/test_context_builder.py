@@ -0,0 +1,128 @@
+import json
+from backend.storyteller.grimoire import Grimoire
+from backend.storyteller.context_builder import StorytellerContextBuilder
+
+
+def make_grimoire():
+    g = Grimoire()
+    g.add_player('p1', 'Imp', 'Evil')
+    g.add_player('p2', 'Empath', 'Good')
+    g.log_event('PHASE_CHANGE', {'new_phase': 'NIGHT', 'day_number': 1})
+    return g
+
+
+def line(lines, prefix):
+    return next((l for l in lines if l.startswith(prefix)), None)
+
+
+def test_first_call_is_full_anchor():
+    g = make_grimoire()
+    builder = StorytellerContextBuilder()
+    lines, is_anchor = builder.build(g, 1, [], {})
+    assert is_anchor
+    assert line(lines, 'GRIMOIRE_SNAPSHOT:')
+
+
+def test_unchanged_grimoire_sends_empty_delta():
+    g = make_grimoire()
+    builder = StorytellerContextBuilder()
+    builder.build(g, 1, [], {})
+    lines, is_anchor = builder.build(g, 2, [], {})
+    assert not is_anchor
+    assert 'GRIMOIRE_DELTA: none' in lines
+    assert line(lines, 'GRIMOIRE_SNAPSHOT:') is None
+
+
+def test_delta_contains_only_changes_and_new_actions():
+    g = make_grimoire()
+    builder = StorytellerContextBuilder()
+    pending = {'a1': {'expected_players': ['p1', 'p2'], 'received_actions': {'p1': {'action_type': 'Imp'}}}}
+    builder.build(g, 1, [], pending)
+    g.update_status('p2', 'alive', False)
+    pending['a1']['received_actions']['p2'] = {'action_type': 'PASS'}
+    lines, _ = builder.build(g, 2, [{'sender': 'p1', 'text': 'hi'}], pending)
+    delta = json.loads(line(lines, 'GRIMOIRE_DELTA:').split(': ', 1)[1])
+    assert delta == {'statuses': {'p2': {'alive': False}}}
+    new_actions = json.loads(line(lines, 'NEW_PLAYER_ACTIONS:').split(': ', 1)[1])
+    assert new_actions == {'a1': {'p2': {'action_type': 'PASS'}}}
+    assert line(lines, 'NEW_EVENTS:')
+    assert line(lines, 'NEW_PUBLIC_CHAT:')
+
+
+def test_reanchors_periodically_and_on_phase_change():
+    g = make_grimoire()
+    builder = StorytellerContextBuilder(reanchor_every=2)
+    assert builder.build(g, 1, [], {})[1]
+    assert not builder.build(g, 2, [], {})[1]
+    assert builder.build(g, 3, [], {})[1]
+    g.log_event('PHASE_CHANGE', {'new_phase': 'DAY_CHAT', 'day_number': 2})
+    assert builder.build(g, 4, [], {})[1]
+
+
+def test_delta_is_relative_to_the_anchor_and_repeats_pending_actions():
+    g = make_grimoire()
+    builder = StorytellerContextBuilder()
+    pending = {'a1': {'expected_players': ['p1', 'p2'], 'received_actions': {}}}
+    builder.build(g, 1, [], pending)
+    g.update_status('p2', 'alive', False)
+    pending['a1']['received_actions']['p1'] = {'action_type': 'Imp'}
+    builder.build(g, 2, [], pending)
+    g.update_status('p1', 'poisoned', True)
+    lines, _ = builder.build(g, 3, [], pending)
+    delta = json.loads(line(lines, 'GRIMOIRE_DELTA:').split(': ', 1)[1])
+    assert delta == {'statuses': {'p1': {'poisoned': True}, 'p2': {'alive': False}}}
+    earlier = json.loads(line(lines, 'EARLIER_PLAYER_ACTIONS_STILL_PENDING:').split(': ', 1)[1])
+    assert earlier == {'a1': {'p1': {'action_type': 'Imp'}}}
+    assert line(lines, 'NEW_PLAYER_ACTIONS:') is None
+
+
+def test_session_history_caps_command_summaries_without_resending_context():
+    from backend.agents.storyteller_agent import StorytellerAgent
+    agent = StorytellerAgent.__new__(StorytellerAgent)
+    agent.session_turns = [{'commands': [{'command': 'LOG_EVENT', 'params': {'data': 'x' * 500}}]}]
+    for turn in range(10):
+        agent.session_turns.append({'commands': [{'command': 'SEND_MESSAGE'}]})
+    history = agent._render_session_history()
+    assert sum(l.startswith('TURN ') for l in history) == StorytellerAgent.MAX_HISTORY_TURNS
+    assert '(7 earlier turns omitted)' in history
+    assert max(len(l) for l in history) < 300
+
+
+def test_delta_prompts_are_smaller_than_anchor_prompts():
+    import asyncio
+    from backend.agents.storyteller_agent import StorytellerAgent
+
+    class RecordingLLM:
+        def __init__(self):
+            self.prompts = []
+
+        async def generate_content_async(self, prompt):
+            self.prompts.append(prompt)
+            return type('Response', (), {'text': '[{"command": "SEND_MESSAGE", "params": {"text": "The night continues."}}]'})()
+
+    g = make_grimoire()
+    for i in range(3, 9):
+        g.add_player(f'p{i}', 'Chef', 'Good')
+    chat = [{'sender': 'p3', 'text': f'message {i}'} for i in range(12)]
+    agent = StorytellerAgent.__new__(StorytellerAgent)
+    agent.llm = RecordingLLM()
+    agent.session_turns = []
+    builder = StorytellerContextBuilder()
+
+    async def play():
+        for iteration in range(1, 7):
+            lines, is_anchor = builder.build(g, iteration, chat, {})
+            await agent.generate_session_commands(lines, phase='NIGHT', anchor=is_anchor)
+            g.update_status(f'p{iteration + 2}', 'poisoned', True)
+
+    asyncio.run(play())
+    anchor_prompt, *delta_prompts = agent.llm.prompts
+    assert all(len(prompt) < len(anchor_prompt) for prompt in delta_prompts)
+    assert all('GRIMOIRE_SNAPSHOT' not in prompt for prompt in delta_prompts)
+
+
+def test_reanchor_interval_is_validated():
+    builder = StorytellerContextBuilder(reanchor_every='3')
+    assert builder.reanchor_every == 3
+    builder.reanchor_every = 0
+    assert builder.reanchor_every == 1
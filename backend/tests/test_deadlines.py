@@ -0,0 +1,42 @@
+import asyncio
+from backend.storyteller.deadlines import DeadlineMetrics, action_family, default_action, run_with_deadline
+
+
+def test_default_actions_per_type():
+    assert action_family('NIGHT_ACTION_WAVE') == 'NIGHT_ACTION'
+    night = default_action('NIGHT_ACTION_IMP', 'p1')
+    assert night['action_type'] == 'PASS' and night['targets'] == [] and night['defaulted']
+    assert default_action('VOTE_CHOICE', 'p2')['vote'] is False
+    assert default_action('SOMETHING_ELSE', 'p3')['action_type'] == 'NO_RESPONSE'
+
+
+def test_run_with_deadline_cancels_slow_awaitable():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return 'late'
+
+    async def fast():
+        return 'ok'
+
+    assert asyncio.run(run_with_deadline(slow(), 0.01)) == (None, True)
+    assert cancelled == [True]
+    assert asyncio.run(run_with_deadline(fast(), 0.01)) == ('ok', False)
+    #no deadline configured
+    assert asyncio.run(run_with_deadline(fast(), 0)) == ('ok', False)
+
+
+def test_metrics_count_by_action_and_phase():
+    metrics = DeadlineMetrics()
+    metrics.record('p1', 'NIGHT_ACTION_POISONER', 'NIGHT', 61.2)
+    metrics.record('p2', 'VOTE_CHOICE', 'VOTING', scope='phase')
+    data = metrics.to_dict()
+    assert data['total_misses'] == 2
+    assert data['misses_by_action'] == {'NIGHT_ACTION': 1, 'VOTE_CHOICE': 1}
+    assert data['misses_by_phase'] == {'NIGHT': 1, 'VOTING': 1}
+    assert data['recent'][1]['scope'] == 'phase'
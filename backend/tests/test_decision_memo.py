@@ -0,0 +1,39 @@
+import asyncio
+from types import SimpleNamespace
+from backend.agents.decision_memo import DecisionMemo
+from backend.agents.player_agent import PlayerAgent
+from backend.storyteller.grimoire import Grimoire
+
+
+def test_lru_eviction_and_stale_versions_dropped():
+    memo = DecisionMemo(max_entries=2)
+    memo.put(DecisionMemo.key('VOTE', ('p1', False), 1, 0), True)
+    memo.put(DecisionMemo.key('VOTE', ('p2', False), 1, 0), False)
+    assert memo.get(DecisionMemo.key('VOTE', ('p1', False), 1, 0)) == (True, True)
+    memo.put(DecisionMemo.key('VOTE', ('p3', False), 1, 0), True)
+    #p2 was least recently used
+    assert memo.get(DecisionMemo.key('VOTE', ('p2', False), 1, 0)) == (False, None)
+    memo.put(DecisionMemo.key('NOMINATION', ('p1',), 2, 0), 'p1')
+    assert len(memo) == 1
+
+
+def test_repeated_request_costs_one_call_until_state_changes():
+    grimoire = Grimoire()
+    agent = PlayerAgent('AIPlayer1', 'Monk', 'Good', api_key=None, game_manager=SimpleNamespace(grimoire=grimoire))
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return True
+
+    async def scenario():
+        await agent._memoized('VOTE', ('p2', False), compute)
+        await agent._memoized('VOTE', ('p2', False), compute)
+        agent.update_memory('CHAT_MESSAGE', {'sender': 'p2', 'text': 'hi'})
+        await agent._memoized('VOTE', ('p2', False), compute)
+        grimoire.log_event('DEATH', {'player_id': 'p3'})
+        await agent._memoized('VOTE', ('p2', False), compute)
+
+    asyncio.run(scenario())
+    assert len(calls) == 3
+    assert agent.decision_memo.hits == 1
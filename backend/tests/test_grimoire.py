@@ -39,9 +39,10 @@ def test_update_status_and_invalid_key(capfd):
     assert g.get_player_status('p1', 'alive') is False
     statuses_updated = [e for e in g.game_log if e['event_type'] == 'STATUS_UPDATE']
     assert statuses_updated and statuses_updated[0]['data']['status'] == 'alive'
-    # invalid update
-    g.update_status('p1', 'nonexistent', True)
-    # should append warning to storyteller_log
+    # invalid update is rejected
+    with pytest.raises(KeyError):
+        g.update_status('p1', 'nonexistent', True)
+    # and still noted in storyteller_log
     assert any('could not update status' in msg.lower() for msg in g.storyteller_log)
 
 
@@ -95,4 +96,19 @@ def test_player_queries():
     assert 'p4' in g.get_alive_players()
     # after death
     g.update_status('p4', 'alive', False)
-    assert 'p4' not in g.get_alive_players() 
\ No newline at end of file
+    assert 'p4' not in g.get_alive_players() 
+
+def test_role_index_follows_reassignment():
+    from backend.storyteller.roles import RoleType
+    g = Grimoire()
+    g.add_player('p1', 'Imp', 'Evil')
+    g.add_player('p2', 'Poisoner', 'Evil')
+    g.add_player('p3', 'Monk', 'Good')
+    assert g.get_player_ids_by_type(RoleType.MINION) == ['p2']
+    # the Poisoner becomes the Imp
+    g.roles['p2'] = 'Imp'
+    g.roles.pop('p1')
+    assert g.get_player_ids_by_role('Imp') == ['p2']
+    assert g.get_player_ids_by_type(RoleType.MINION) == []
+    g.roles = {'p3': 'Spy'}
+    assert g.get_player_ids_by_role('Spy') == ['p3'] and g.get_player_ids_by_role('Imp') == []
@@ -0,0 +1,240 @@
+import asyncio
+import json
+from backend.main import GameManager
+from backend.storyteller.grimoire import Grimoire
+from backend.storyteller.journal import GameJournal, load_journal, prompt_key
+
+
+def make_grimoire():
+    g = Grimoire()
+    for pid, role, alignment in [('p1', 'Imp', 'Evil'), ('p2', 'Monk', 'Good'), ('p3', 'Empath', 'Good')]:
+        g.add_player(pid, role, alignment)
+    g.log_event("PHASE_CHANGE", {"phase": "FIRST_NIGHT", "day_number": 0})
+    return g
+
+
+def test_recovery_replays_the_tail_after_the_last_snapshot(tmp_path):
+    path = str(tmp_path / "game.jsonl")
+    g = make_grimoire()
+    g.journal = GameJournal(path)
+    g.journal.snapshot({"grimoire": g.to_snapshot()})
+    g.update_status('p2', 'alive', False)
+    g.add_private_clue('p3', {"count": 1})
+    g.set_value(["demon_bluffs"], ["Chef", "Mayor", "Slayer"])
+    g.log_event("PHASE_CHANGE", {"phase": "DAY_CHAT", "day_number": 1})
+    g.journal.close()
+
+    recovered = load_journal(path)
+    r = recovered.grimoire
+    assert recovered.tail_records == 6 #4 mutations plus the events logged by the status update and the clue
+    assert r.game_log == g.game_log
+    assert r.get_alive_players() == ['p1', 'p3']
+    assert r.alive_neighbors('p1') == ['p3']
+    assert r.get_private_clues('p3') == [{"count": 1}]
+    assert r.demon_bluffs == ["Chef", "Mayor", "Slayer"]
+    assert (r.current_phase, r.day_number) == ("DAY_CHAT", 1)
+    assert r.get_player_ids_by_role('Imp') == ['p1']
+    assert r.clock.stamp()["seq"] == g.game_log[-1]["seq"] + 1
+
+
+def test_torn_final_line_is_ignored(tmp_path):
+    path = str(tmp_path / "game.jsonl")
+    g = make_grimoire()
+    g.journal = GameJournal(path)
+    g.journal.snapshot({"grimoire": g.to_snapshot()})
+    g.update_status('p3', 'poisoned', True)
+    g.journal.close()
+    with open(path, "a") as f:
+        f.write('{"type": "mutation", "op": "update_st')
+    r = load_journal(path).grimoire
+    assert r.get_player_status('p3', 'poisoned') is True
+
+
+def test_recorded_llm_responses_are_replayed_once(tmp_path):
+    path = str(tmp_path / "game.jsonl")
+    journal = GameJournal(path)
+    journal.snapshot({"grimoire": make_grimoire().to_snapshot()})
+    journal.llm("p2", "prompt", "VOTE: YES")
+    journal.close()
+    replay = GameJournal(str(tmp_path / "replay.jsonl"), recorded_llm=load_journal(path).recorded_llm)
+    assert replay.replayed_response("p2", "prompt") == "VOTE: YES"
+    assert replay.replayed_response("p2", "prompt") is None
+    assert replay.replayed_response("p3", "prompt") is None
+
+
+def test_game_manager_recovers_agents_and_memory(tmp_path):
+    manager = GameManager()
+    manager.settings.journal_dir = str(tmp_path)
+    manager.api_key = None
+    async def no_loop():
+        pass
+    manager.run_game_loop = no_loop
+
+    async def play_then_recover():
+        manager._reset_game(make_grimoire())
+        agent = manager._create_agent('p2', 'Monk', 'Good')
+        manager._start_journal()
+        agent.remember("private_info", {"role": "Monk"})
+        agent.remember("event", {"event_type": "CHAT_MESSAGE", "data": {"sender": "p1", "text": "hi"}})
+        manager.grimoire.update_status('p3', 'alive', False)
+        path = manager.journal.path
+        result = await manager.recover_game(path)
+        return path, result
+
+    path, result = asyncio.run(play_then_recover())
+    assert result["tail_records"] == 4
+    agent = manager.agents['p2']
+    assert agent.memory["private_info"] == {"role": "Monk"}
+    assert agent.memory["public_chat_log"] == [{"sender": "p1", "text": "hi"}]
+    assert manager.grimoire.get_alive_players() == ['p1', 'p2']
+    #the recovered game keeps appending to the same journal, starting with a fresh snapshot
+    with open(path) as f:
+        assert json.loads(f.read().splitlines()[-1])["type"] == "snapshot"
+
+
+def test_snapshots_point_at_log_pages_that_recovery_reads_on_demand(tmp_path):
+    path = str(tmp_path / "game.jsonl")
+    g = make_grimoire()
+    g.journal = GameJournal(path, page_items=3)
+    g.journal.snapshot({"grimoire": g.to_snapshot()}) #the first snapshot carries the log built before the journal
+    g.journal.llm("p2", "old prompt", "VOTE: NO")
+    for i in range(6):
+        g.log_event("CHAT", {"sender": "p2", "text": f"message {i}"})
+    g.journal.snapshot({"grimoire": g.to_snapshot(with_log=False)})
+    g.journal.llm("p2", "prompt", "VOTE: YES")
+    g.log_event("PHASE_CHANGE", {"phase": "NIGHT", "day_number": 1})
+    g.journal.close()
+
+    with open(path) as f:
+        line = f.read().splitlines()[-3]
+    snapshot = json.loads(line)
+    assert "game_log" not in snapshot["grimoire"] and "message 0" not in line #paged entries are not repeated
+    assert len(snapshot["logs"]["game_log"]["pages"]) == 3 and len(snapshot["logs"]["game_log"]["tail"]) == 1
+
+    recovered = load_journal(path, hot_items=2)
+    r = recovered.grimoire
+    assert recovered.tail_records == 2
+    assert r.game_log.stats()["page_reads"] == 0 #recovery did not read the pages
+    assert r.game_log == g.game_log
+    assert (r.current_phase, r.day_number) == ("NIGHT", 1)
+    #only the tail's LLM responses are kept: those are the calls the resumed game repeats
+    assert recovered.recorded_llm == {("p2", prompt_key("prompt")): ["VOTE: YES"]}
+
+
+def test_torn_final_snapshot_falls_back_to_the_previous_one(tmp_path):
+    path = str(tmp_path / "game.jsonl")
+    g = make_grimoire()
+    g.journal = GameJournal(path)
+    g.journal.snapshot({"grimoire": g.to_snapshot()})
+    g.update_status('p2', 'alive', False)
+    g.journal.close()
+    with open(path, "a") as f:
+        f.write(json.dumps({"type": "snapshot", "grimoire": g.to_snapshot(with_log=False)})[:40])
+    recovered = load_journal(path)
+    assert recovered.grimoire.game_log == g.game_log
+    assert recovered.grimoire.get_alive_players() == ['p1', 'p3']
+
+
+def test_recovered_day_keeps_its_nominations_and_chat(tmp_path):
+    manager = GameManager()
+    manager.settings.journal_dir = str(tmp_path)
+    manager.api_key = None
+    async def no_loop():
+        pass
+    manager.run_game_loop = no_loop
+
+    async def play_then_recover():
+        manager._reset_game(make_grimoire())
+        agent = manager._create_agent('p2', 'Monk', 'Good')
+        manager._start_journal()
+        manager.grimoire.log_event("PHASE_CHANGE", {"phase": "NOMINATION", "day_number": 1})
+        agent.remember("event", {"event_type": "CHAT_MESSAGE", "data": {"sender": "p1", "text": "hi"}})
+        manager.nomination_engine.start_day()
+        manager.nomination_engine.apply('p3', 'p1')
+        manager.voting_engine.tally('p1', {'p2': True, 'p3': True})
+        manager._journal_snapshot()
+        agent.remember("event", {"event_type": "CHAT_MESSAGE", "data": {"sender": "p3", "text": "bye"}})
+        await manager.recover_game(manager.journal.path)
+
+    asyncio.run(play_then_recover())
+    g, engine = manager.grimoire, manager.nomination_engine
+    assert manager.agents['p2'].memory["public_chat_log"] == [{"sender": "p1", "text": "hi"}, {"sender": "p3", "text": "bye"}]
+    engine.start_day() #same day: must not reopen nominations
+    assert (engine.day, engine.next_index) == (1, 0)
+    assert g.get_player_status('p3', 'can_nominate') is False
+    assert g.get_player_status('p1', 'nominated_today') is True
+    assert g.game_state["current_nominee_id"] == 'p1'
+    assert g.game_state["on_the_block"] == {"nominee_id": 'p1', "votes": 2}
+    assert manager.voting_engine.already_tallied('p1')
+
+
+def test_events_logged_inside_a_compound_mutation_are_recorded_once(tmp_path):
+    path = str(tmp_path / "game.jsonl")
+    g = make_grimoire()
+    g.journal = GameJournal(path)
+    g.journal.snapshot({"grimoire": g.to_snapshot()})
+    g.set_value(["players"], {"p4": "Chef"}) #seats p4 through add_player, which logs PLAYER_ADDED
+    g.journal.snapshot({"grimoire": g.to_snapshot(with_log=False)})
+    g.journal.close()
+    r = load_journal(path).grimoire
+    assert r.game_log == g.game_log
+    assert [entry["event_type"] for entry in r.game_log].count("PLAYER_ADDED") == 4
+
+
+def test_recovery_keeps_human_chat_and_only_todays_chat(tmp_path):
+    manager = GameManager()
+    manager.settings.journal_dir = str(tmp_path)
+    manager.api_key = None
+    async def no_loop():
+        pass
+    manager.run_game_loop = no_loop
+
+    async def play_then_recover():
+        manager._reset_game(make_grimoire())
+        manager._create_agent('p2', 'Monk', 'Good')
+        manager._start_journal()
+        manager.grimoire.log_event("PHASE_CHANGE", {"phase": "DAY_CHAT", "day_number": 1})
+        await manager.handle_incoming_message('p1', json.dumps({"type": "CHAT_MESSAGE", "payload": {"text": "day one"}}))
+        manager.grimoire.log_event("PHASE_CHANGE", {"phase": "NIGHT", "day_number": 1})
+        manager.grimoire.log_event("PHASE_CHANGE", {"phase": "DAY_CHAT", "day_number": 2})
+        await manager.handle_incoming_message('p1', json.dumps({"type": "CHAT_MESSAGE", "payload": {"text": "day two"}}))
+        await manager.recover_game(manager.journal.path)
+
+    asyncio.run(play_then_recover())
+    assert [chat["text"] for chat in manager._daily_chat_log] == ["day two"]
+    assert [entry["data"]["text"] for entry in manager.grimoire.game_log if entry["event_type"] == "CHAT"] == ["day one", "day two"]
+
+
+def test_second_recovery_continues_the_log_pages(tmp_path):
+    manager = GameManager()
+    manager.settings.journal_dir = str(tmp_path)
+    manager.settings.log_page_items = 2
+    manager.api_key = None
+    async def no_loop():
+        pass
+    manager.run_game_loop = no_loop
+
+    async def chat(text):
+        await manager.handle_incoming_message('p1', json.dumps({"type": "CHAT_MESSAGE", "payload": {"text": text}}))
+
+    async def play():
+        manager._reset_game(make_grimoire())
+        manager._create_agent('p2', 'Monk', 'Good')
+        manager._start_journal()
+        for i in range(3):
+            await chat(f"first {i}")
+        path = manager.journal.path
+        await manager.recover_game(path)
+        for i in range(3):
+            await chat(f"second {i}")
+        manager._journal_snapshot()
+        await chat("tail")
+        expected = list(manager.grimoire.game_log)
+        await manager.recover_game(path)
+        return expected
+
+    expected = asyncio.run(play())
+    texts = [f"first {i}" for i in range(3)] + [f"second {i}" for i in range(3)] + ["tail"]
+    assert manager.grimoire.game_log == expected
+    assert [entry["text"] for entry in manager.agents['p2'].memory["public_chat_log"]] == texts
+    assert manager.journal.stats()["log_pages"] > 2
@@ -0,0 +1,98 @@
+import asyncio
+from backend.utils.json_stream import JSONArrayStreamParser, iter_json_array
+from backend.agents.storyteller_agent import StorytellerAgent
+
+
+def feed_all(parser, chunks):
+    out = []
+    for chunk in chunks:
+        out.append(parser.feed(chunk))
+    return out
+
+
+def test_elements_are_yielded_as_soon_as_they_close():
+    parser = JSONArrayStreamParser()
+    text = 'Sure! [{"command": "BROADCAST_MESSAGE", "params": {"message": "Night [1] falls, \\"quietly\\""}}, {"command": "END_GAME", "params": {}}] done'
+    chunks = [text[i:i + 7] for i in range(0, len(text), 7)]
+    results = feed_all(parser, chunks)
+    flat = [e for r in results for e in r]
+    assert [e['command'] for e in flat] == ['BROADCAST_MESSAGE', 'END_GAME']
+    assert flat[0]['params']['message'] == 'Night [1] falls, "quietly"'
+    #the first command is available before the array closes
+    first_chunk_with_element = next(i for i, r in enumerate(results) if r)
+    assert first_chunk_with_element < len(chunks) - 3
+    assert parser.finished
+
+
+def test_scalars_and_malformed_elements():
+    parser = JSONArrayStreamParser()
+    assert parser.feed('[1, "a", {"x": }, true]') == [1, 'a', True]
+    assert len(parser.errors) == 1
+    assert parser.finished
+
+
+def test_truncated_stream_keeps_pending_fragment():
+    parser = JSONArrayStreamParser()
+    assert parser.feed('[{"a": 1}, {"b": ') == [{'a': 1}]
+    assert not parser.finished
+    assert parser.pending_fragment() == '{"b":'
+
+
+def test_iter_json_array_closes_source_after_array_ends():
+    state = {'yielded': 0, 'closed': False}
+
+    async def source():
+        try:
+            for chunk in ['[{"a"', ': 1}]', ' trailing', ' more']:
+                state['yielded'] += 1
+                yield chunk
+        finally:
+            state['closed'] = True
+
+    async def collect():
+        return [e async for e in iter_json_array(source())]
+
+    assert asyncio.run(collect()) == [{'a': 1}]
+    assert state['yielded'] == 2
+    assert state['closed']
+
+
+class StreamingLLM:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.yielded = 0
+
+    async def generate_content_stream(self, prompt, **kwargs):
+        for chunk in self.chunks:
+            self.yielded += 1
+            yield chunk
+
+
+def make_agent(chunks):
+    agent = StorytellerAgent.__new__(StorytellerAgent)
+    agent.game_manager = None
+    agent.llm = StreamingLLM(chunks)
+    agent.session_turns = []
+    return agent
+
+
+def test_stream_session_commands_records_turn_and_stops_at_array_end():
+    agent = make_agent(['[{"command": "LOG_EVENT", "params": {}}', ', 5', ']', ' postamble'])
+
+    async def collect():
+        return [c async for c in agent.stream_session_commands(['EVENT: x'], phase='NIGHT', anchor=True)]
+
+    commands = asyncio.run(collect())
+    assert [c['command'] for c in commands] == ['LOG_EVENT', 'ERROR_LOG']
+    assert agent.llm.yielded == 3
+    assert agent.session_turns == [{'commands': commands}]
+
+
+def test_stream_without_json_reports_error():
+    agent = make_agent(['no commands here'])
+
+    async def collect():
+        return [c async for c in agent.stream_commands(['EVENT: x'])]
+
+    commands = asyncio.run(collect())
+    assert commands[0]['command'] == 'ERROR_LOG'
@@ -0,0 +1,102 @@
+import asyncio
+import pytest
+from backend.llm_providers import (CircuitBreaker, CircuitOpenError, LLMError, LLMProvider, RetryPolicy,
+                                   UnifiedLLMClient, classify_error)
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class FakeAPIError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"status {status_code}")
+        self.response = FakeResponse(status_code, headers)
+
+
+class APITimeoutError(Exception):
+    pass
+
+
+class FlakyProvider(LLMProvider):
+    """Fails with the given errors first, then answers."""
+
+    def __init__(self, errors):
+        super().__init__(api_key="test", model="test-model")
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def generate_async(self, prompt, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "VOTE: YES"
+
+    async def generate_stream(self, prompt, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        yield "VOTE: "
+        yield "YES"
+
+
+def make_client(provider, threshold=5, reset_timeout=30.0):
+    client = UnifiedLLMClient(provider, retry_policy=RetryPolicy(max_retries=3, base_delay=0, max_delay=0))
+    client.breaker = CircuitBreaker("fake", failure_threshold=threshold, reset_timeout=reset_timeout)
+    return client
+
+
+def test_errors_are_classified_by_status_name_and_retry_after():
+    rate_limited = classify_error(FakeAPIError(429, {"retry-after": "2"}), "OpenAI")
+    assert rate_limited.retryable and rate_limited.status == 429 and rate_limited.retry_after == 2.0
+    assert classify_error(FakeAPIError(503), "OpenAI").retryable
+    assert not classify_error(FakeAPIError(400), "OpenAI").retryable
+    assert classify_error(APITimeoutError("slow"), "OpenAI").retryable
+    assert not classify_error(ValueError("bad prompt"), "OpenAI").retryable
+    assert RetryPolicy(max_retries=3, base_delay=0, max_retry_after=60).delay(rate_limited, 0) == 2.0
+    assert RetryPolicy(max_retries=3, max_retry_after=1).delay(rate_limited, 0) is None #too long to wait out
+
+
+def test_transient_failures_are_retried(monkeypatch):
+    monkeypatch.setenv("LLM_MIN_INTERVAL", "0")
+    provider = FlakyProvider([FakeAPIError(503), FakeAPIError(429)])
+    client = make_client(provider)
+    assert asyncio.run(client.generate_content_async("prompt")).text == "VOTE: YES"
+    assert provider.calls == 3
+    assert client.breaker.stats()["retries"] == 2 and client.breaker.state == "closed"
+    assert client.rate_controller.rate_limited >= 1 #the 429 slowed the provider's adaptive rate
+
+
+def test_non_retryable_failure_is_raised_at_once(monkeypatch):
+    monkeypatch.setenv("LLM_MIN_INTERVAL", "0")
+    provider = FlakyProvider([FakeAPIError(401)])
+    client = make_client(provider)
+    with pytest.raises(LLMError) as raised:
+        asyncio.run(client.generate_content_async("prompt"))
+    assert raised.value.status == 401 and provider.calls == 1
+
+
+def test_breaker_opens_fails_fast_and_recovers_after_a_trial_call(monkeypatch):
+    monkeypatch.setenv("LLM_MIN_INTERVAL", "0")
+    provider = FlakyProvider([FakeAPIError(500)] * 4)
+    client = make_client(provider, threshold=4, reset_timeout=30.0)
+    with pytest.raises(LLMError):
+        asyncio.run(client.generate_content_async("prompt"))
+    assert client.breaker.state == "open" and provider.calls == 4
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(client.generate_content_async("prompt"))
+    assert provider.calls == 4 and client.breaker.short_circuited == 1
+
+    client.breaker.reset_timeout = 0 #cool-down over: the next call is the half-open trial
+    assert asyncio.run(client.generate_content_async("prompt")).text == "VOTE: YES"
+    assert client.breaker.state == "closed"
+
+
+def test_stream_is_retried_before_its_first_chunk(monkeypatch):
+    monkeypatch.setenv("LLM_MIN_INTERVAL", "0")
+    provider = FlakyProvider([APITimeoutError("connect timeout")])
+    client = make_client(provider)
+    assert asyncio.run(client.generate_until("prompt")).text == "VOTE: YES"
+    assert provider.calls == 2
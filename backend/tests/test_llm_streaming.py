@@ -0,0 +1,108 @@
+import asyncio
+from backend.llm_providers import LLMProvider, UnifiedLLMClient
+from backend.agents.player_agent import NOMINATION_ANSWER_PATTERN, VOTE_ANSWER_PATTERN
+
+
+class ChunkedProvider(LLMProvider):
+    def __init__(self, chunks):
+        super().__init__(api_key="test", model="test-model")
+        self.rate_limit_interval = 0
+        self.chunks = chunks
+        self.yielded = 0
+        self.closed = False
+
+    async def generate_async(self, prompt, **kwargs):
+        return "".join(self.chunks)
+
+    async def generate_stream(self, prompt, **kwargs):
+        try:
+            for chunk in self.chunks:
+                self.yielded += 1
+                yield chunk
+        finally:
+            self.closed = True
+
+
+def test_default_stream_yields_full_completion():
+    class PlainProvider(LLMProvider):
+        async def generate_async(self, prompt, **kwargs):
+            return "hello"
+
+    async def collect():
+        return [c async for c in PlainProvider().generate_stream("x")]
+
+    assert asyncio.run(collect()) == ["hello"]
+
+
+def test_generate_until_stops_after_answer(monkeypatch):
+    monkeypatch.setenv("LLM_MIN_INTERVAL", "0")
+    provider = ChunkedProvider(["NOMINATE: AI_Pl", "ayer_3\n", "Because they were ", "very quiet", " today."])
+    client = UnifiedLLMClient(provider)
+    response = asyncio.run(client.generate_until("prompt", NOMINATION_ANSWER_PATTERN))
+    assert response.text == "NOMINATE: AI_Player_3"
+    assert response.early_stopped is True
+    assert provider.yielded == 2
+    assert provider.closed is True
+
+
+def test_generate_until_matches_answer_at_end_of_stream(monkeypatch):
+    monkeypatch.setenv("LLM_MIN_INTERVAL", "0")
+    provider = ChunkedProvider(["I think\n", "VOTE: YES"])
+    client = UnifiedLLMClient(provider)
+    response = asyncio.run(client.generate_until("prompt", VOTE_ANSWER_PATTERN))
+    #no terminator after the answer: it is matched once the stream ends
+    assert response.text == "VOTE: YES"
+    assert response.early_stopped is False
+
+
+def test_generate_until_without_match_returns_full_text(monkeypatch):
+    monkeypatch.setenv("LLM_MIN_INTERVAL", "0")
+    provider = ChunkedProvider(["I would rather ", "not say"])
+    client = UnifiedLLMClient(provider)
+    response = asyncio.run(client.generate_until("prompt", VOTE_ANSWER_PATTERN))
+    assert response.text == "I would rather not say"
+    assert response.early_stopped is False
+
+
+def test_stream_observers_receive_chunks(monkeypatch):
+    monkeypatch.setenv("LLM_MIN_INTERVAL", "0")
+    provider = ChunkedProvider(["a", "b"])
+    client = UnifiedLLMClient(provider)
+    seen = []
+
+    async def observer(event):
+        seen.append(event)
+
+    client.add_stream_observer(observer)
+    asyncio.run(client.generate_until("prompt"))
+    assert [e["chunk"] for e in seen if not e["done"]] == ["a", "b"]
+    assert seen[-1]["done"] is True
+
+
+def test_litellm_stream_is_closed_when_consumer_stops_early(monkeypatch):
+    from types import SimpleNamespace
+    from backend import llm_providers
+
+    class FakeStream:
+        def __init__(self):
+            self.closed = False
+
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="VOTE: NO\n"))])
+
+        async def aclose(self):
+            self.closed = True
+
+    stream = FakeStream()
+
+    async def fake_acompletion(**kwargs):
+        return stream
+
+    monkeypatch.setenv("LLM_MIN_INTERVAL", "0")
+    monkeypatch.setattr(llm_providers.litellm, "acompletion", fake_acompletion)
+    client = UnifiedLLMClient(llm_providers.LiteLLMProvider(model="test-model"))
+    assert asyncio.run(client.generate_until("prompt", VOTE_ANSWER_PATTERN)).text == "VOTE: NO"
+    assert stream.closed is True
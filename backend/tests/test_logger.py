@@ -0,0 +1,44 @@
+import io
+import json
+import logging
+from backend.utils.logger import SamplingFilter, configure_logging, get_logger, set_verbose, shutdown_logging
+
+
+def test_records_are_written_as_json_by_the_background_writer():
+    out = io.StringIO()
+    configure_logging(verbose=True, stream=out)
+    try:
+        get_logger("game").info("Player %s connected.", "p1", extra={"fields": {"seat": 3}})
+    finally:
+        shutdown_logging() #drains the queue
+    entry = json.loads(out.getvalue().strip())
+    assert entry["subsystem"] == "game"
+    assert entry["msg"] == "Player p1 connected."
+    assert entry["fields"] == {"seat": 3}
+
+
+def test_quiet_levels_drop_debug_records():
+    out = io.StringIO()
+    configure_logging(verbose=False, stream=out)
+    try:
+        get_logger("grimoire").debug("Event Logged: %s", "CHAT")
+        set_verbose(True)
+        get_logger("grimoire").debug("Event Logged: %s", "DEATH")
+    finally:
+        shutdown_logging()
+        set_verbose(True)
+    lines = out.getvalue().strip().splitlines()
+    assert [json.loads(line)["msg"] for line in lines] == ["Event Logged: DEATH"]
+
+
+def test_sampling_filter_keeps_one_in_n_per_kind():
+    sampler = SamplingFilter({"CHAT": 3})
+    def record(kind):
+        rec = logging.LogRecord("botc.game", logging.DEBUG, __file__, 0, "msg", None, None)
+        if kind:
+            rec.sample = kind
+        return rec
+    kept = [sampler.filter(record("CHAT")) for _ in range(7)]
+    assert kept == [True, False, False, True, False, False, True]
+    assert sampler.filter(record(None))
+    assert sampler.dropped == 4
@@ -2,7 +2,7 @@ import os
 import shutil
 import pytest
 from fastapi.testclient import TestClient
-from backend.main import app, game_manager
+from backend.main import GameSettings, app, game_manager
 
 client = TestClient(app)
 
@@ -80,4 +80,23 @@ def test_save_logs_creates_file(tmp_path, monkeypatch):
     assert saved_data["metadata"]["game_phase"] == "DAY_CHAT"
     assert saved_data["metadata"]["day_number"] == 1
     
-    shutil.rmtree(tmp_path / "logs", ignore_errors=True) 
\ No newline at end of file
+    shutil.rmtree(tmp_path / "logs", ignore_errors=True) 
+
+def test_settings_update_ignores_paths_and_validates_numbers(monkeypatch):
+    settings = GameSettings()
+    monkeypatch.setattr(game_manager, 'settings', settings)
+    journal_dir = settings.journal_dir
+
+    response = client.post("/settings", json={"journal_dir": "/tmp/elsewhere", "log_spill_dir": "/tmp", "max_concurrent_commands": "4",
+                                              "storyteller_reanchor_interval": 0, "log_hot_items": None})
+    assert response.json()["success"]
+    assert (settings.journal_dir, settings.log_spill_dir) == (journal_dir, None)
+    assert (settings.max_concurrent_commands, settings.storyteller_reanchor_interval, settings.log_hot_items) == (4, 1, None)
+    assert game_manager.command_executor.max_concurrency == 4
+
+    #an invalid value is rejected before anything is applied
+    response = client.post("/settings", json={"verbose_logging": False, "max_concurrent_commands": "x"})
+    assert "error" in response.json()
+    assert settings.verbose_logging is True and settings.max_concurrent_commands == 4
+    with pytest.raises(ValueError):
+        settings.update_from_dict({"phase_deadlines": {"NIGHT": "soon"}})
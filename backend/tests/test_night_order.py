@@ -0,0 +1,69 @@
+import asyncio
+from backend.storyteller.grimoire import Grimoire
+from backend.storyteller.night_order import (
+    FIRST_NIGHT_ORDER, OTHER_NIGHT_ORDER, needs_night_choice, is_info_role, plan_night
+)
+from backend.main import GameManager
+
+
+def test_tables_follow_role_flags_and_script_order():
+    assert FIRST_NIGHT_ORDER.index('Poisoner') < FIRST_NIGHT_ORDER.index('Washerwoman') < FIRST_NIGHT_ORDER.index('Fortune Teller')
+    assert 'Imp' not in FIRST_NIGHT_ORDER
+    assert OTHER_NIGHT_ORDER.index('Monk') < OTHER_NIGHT_ORDER.index('Imp') < OTHER_NIGHT_ORDER.index('Empath')
+    assert 'Washerwoman' not in OTHER_NIGHT_ORDER
+
+
+def test_chooser_lookup():
+    for role in ('Monk', 'Poisoner', 'Imp', 'Fortune Teller', 'Butler'):
+        assert needs_night_choice(role, 'NIGHT')
+    assert needs_night_choice('Fortune Teller', 'FIRST_NIGHT')
+    assert not needs_night_choice('Monk', 'FIRST_NIGHT')
+    assert not needs_night_choice('Empath', 'NIGHT')
+    assert is_info_role('Empath', 'NIGHT')
+    assert not needs_night_choice('Imp', 'DAY_CHAT')
+
+
+def make_grimoire():
+    g = Grimoire()
+    for pid, role, alignment in [('p1', 'Empath', 'Good'), ('p2', 'Imp', 'Evil'), ('p3', 'Monk', 'Good'),
+                                 ('p4', 'Drunk', 'Good'), ('p5', 'Poisoner', 'Evil')]:
+        g.add_player(pid, role, alignment)
+    g.statuses['p4'].update({'is_drunk': True, 'thinks_is_role': 'Fortune Teller'})
+    g.current_phase = 'NIGHT'
+    return g
+
+
+def test_plan_night_splits_choosers_and_info_in_wake_order():
+    plan = plan_night(make_grimoire())
+    #Poisoner, Monk, Imp, then the Drunk waking as the Fortune Teller
+    assert plan['choosers'] == ['p5', 'p3', 'p2', 'p4']
+    assert plan['info'] == ['p1']
+
+
+class FakeAgent:
+    def __init__(self, player_id, log):
+        self.player_id = player_id
+        self.log = log
+
+    async def get_night_action(self, game_state, alive):
+        self.log.append(('start', self.player_id, id(game_state['daily_chat_log'])))
+        await asyncio.sleep(0.01)
+        self.log.append(('end', self.player_id))
+        return {'action_type': 'CHOSE', 'player_id': self.player_id}
+
+
+def test_night_wave_asks_all_choosers_concurrently():
+    manager = GameManager()
+    manager.grimoire = make_grimoire()
+    log = []
+    manager.agents = {pid: FakeAgent(pid, log) for pid in manager.grimoire.players}
+    asyncio.run(manager._run_night_wave())
+    action_id = 'night_wave_night_0'
+    received = manager.pending_storyteller_actions[action_id]['received_actions']
+    assert set(received) == {'p2', 'p3', 'p4', 'p5'}
+    #every chooser started before any finished, and they all shared one context build
+    starts = [entry for entry in log if entry[0] == 'start']
+    assert log.index(starts[-1]) < min(i for i, e in enumerate(log) if e[0] == 'end')
+    assert len({entry[2] for entry in starts}) == 1
+    assert manager.grimoire.game_log[-1]['event_type'] == 'NIGHT_WAVE'
+    assert manager._night_wave_done_for == ('NIGHT', 0)
@@ -0,0 +1,120 @@
+import asyncio
+from backend.storyteller.grimoire import Grimoire
+from backend.storyteller.nominations import NominationEngine
+
+
+def make_engine():
+    g = Grimoire()
+    for pid in ('p1', 'p2', 'p3', 'p4'):
+        g.add_player(pid, 'Monk', 'Good')
+    g.day_number = 1
+    return g, NominationEngine(g)
+
+
+def test_first_valid_intent_in_seat_order_wins_and_rest_cancelled():
+    g, engine = make_engine()
+    cancelled = []
+    intents = {'p1': None, 'p2': 'p4', 'p3': 'p1', 'p4': 'p2'}
+    delays = {'p1': 0.01, 'p2': 0.03, 'p3': 0.0, 'p4': 0.5}
+
+    async def decide(pid):
+        try:
+            await asyncio.sleep(delays[pid])
+        except asyncio.CancelledError:
+            cancelled.append(pid)
+            raise
+        return intents[pid]
+
+    nomination = asyncio.run(engine.run_slot(decide))
+    #p3 answered first but p2 sits earlier
+    assert nomination == {'nominator_id': 'p2', 'nominee_id': 'p4', 'day': 1}
+    assert cancelled == ['p4']
+    assert g.get_player_status('p2', 'can_nominate') is False
+    assert g.get_player_status('p4', 'nominated_today') is True
+    assert g.game_state['current_nominee_id'] == 'p4'
+    assert not engine.slot_open()
+
+
+def test_next_slot_starts_after_previous_nominator_and_skips_invalid():
+    g, engine = make_engine()
+    asyncio.run(engine.run_slot(lambda pid: asyncio.sleep(0, result={'p1': 'p2'}.get(pid))))
+    engine.resolve_current()
+    asked = []
+
+    async def decide(pid):
+        asked.append(pid)
+        #p2 was already nominated today, so p3's intent is invalid
+        return {'p3': 'p2', 'p4': 'p3'}.get(pid)
+
+    nomination = asyncio.run(engine.run_slot(decide))
+    assert asked[0] == 'p2'
+    assert 'p1' not in asked
+    assert nomination['nominator_id'] == 'p4'
+
+
+def test_all_pass_closes_nominations_for_the_day():
+    g, engine = make_engine()
+
+    async def decide(pid):
+        return None
+
+    assert asyncio.run(engine.run_slot(decide)) is None
+    assert engine.closed
+    assert g.game_log[-1]['event_type'] == 'NOMINATIONS_CLOSED'
+    g.day_number = 2
+    engine.start_day()
+    assert engine.slot_open()
+
+
+def test_humans_are_asked_so_ai_passes_do_not_close_the_day():
+    import json
+    from backend.main import GameManager
+    manager = GameManager()
+    manager.api_key = None
+    g, _ = make_engine()
+
+    class HumanSocket:
+        """Answers every nomination request by nominating p3."""
+        async def send_text(self, text):
+            message = json.loads(text)
+            if message["type"] == "REQUEST_NOMINATION":
+                reply = {"type": "REQUEST_NOMINATION", "payload": {"action_id": message["payload"]["action_id"], "nominee_id": "p3"}}
+                asyncio.get_running_loop().call_soon(asyncio.ensure_future, manager.handle_incoming_message("p1", json.dumps(reply)))
+
+    async def scenario():
+        manager._reset_game(g)
+        for pid in ('p2', 'p3', 'p4'):
+            manager._create_agent(pid, 'Monk', 'Good') #no LLM: every AI passes
+        manager.active_connections["p1"] = HumanSocket()
+        try:
+            await manager._run_nomination_slot()
+        finally:
+            manager.active_connections.pop("p1", None)
+
+    asyncio.run(scenario())
+    assert g.game_state['current_nominee_id'] == 'p3'
+    assert not manager.nomination_engine.closed
+    assert manager.human_player_expected_actions == {}
+
+
+def test_speculative_prefetch_does_not_open_the_day():
+    from backend.main import GameManager
+    manager = GameManager()
+    manager.api_key = None
+    manager.settings.speculative_prefetch = True
+    g, _ = make_engine()
+    g.current_phase = "DAY_CHAT"
+    g.statuses['p1']['can_nominate'] = False #yesterday's flags, until the Storyteller opens nominations
+
+    async def scenario():
+        manager._reset_game(g)
+        for pid in ('p1', 'p2'):
+            manager._create_agent(pid, 'Monk', 'Good')
+        before = (len(g.game_log), g.version)
+        manager._prefetch_decisions()
+        return before
+
+    log_length, version = asyncio.run(scenario())
+    assert (len(g.game_log), g.version) == (log_length, version)
+    assert g.get_player_status('p1', 'can_nominate') is False
+    assert manager.nomination_engine.day is None
@@ -0,0 +1,35 @@
+import json
+from backend.storyteller.grimoire import Grimoire
+from backend.utils.paged_log import PagedLog, json_default
+
+
+def test_spills_old_pages_and_reads_them_back(tmp_path):
+    log = PagedLog(hot_items=10, page_items=5, spill_dir=str(tmp_path))
+    entries = [{"seq": i} for i in range(53)]
+    log.extend(entries)
+    assert log.stats()["hot_items"] < 15 and log.spilled == 40
+    assert len(log) == 53
+    assert log == entries
+    assert log[0] == {"seq": 0} and log[-1] == {"seq": 52} and log[17] == {"seq": 17}
+    assert log[3:23] == entries[3:23]
+    assert log[38:] == entries[38:]
+    assert log[-5:] == entries[-5:]
+    assert log[::10] == entries[::10]
+    assert list(reversed(log)) == entries[::-1]
+    assert json.loads(json.dumps({"log": log}, default=json_default)) == {"log": entries}
+
+
+def test_unbounded_log_never_spills():
+    log = PagedLog(range(1000))
+    assert log.spilled == 0 and log[999] == 999 and log.stats()["segment_bytes"] == 0
+
+
+def test_grimoire_logs_page_out_and_still_snapshot_in_full(tmp_path):
+    g = Grimoire()
+    g.configure_log_paging(hot_items=20, page_items=10, spill_dir=str(tmp_path))
+    for i in range(100):
+        g.log_event("CHAT", {"text": f"message {i}"})
+    assert g.game_log.spilled >= 70
+    assert [entry["data"]["text"] for entry in g.game_log[:2]] == ["message 0", "message 1"]
+    restored = Grimoire.from_snapshot(json.loads(json.dumps(g.to_snapshot())))
+    assert restored.game_log == g.game_log
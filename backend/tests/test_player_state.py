@@ -0,0 +1,28 @@
+import pytest
+from backend.storyteller.grimoire import Grimoire
+from backend.storyteller.player_state import PlayerState, STATUS_DEFAULTS
+
+
+def test_player_state_acts_like_the_status_dict_but_rejects_unknown_keys():
+    state = PlayerState(poisoned=True)
+    assert dict(state) == {**STATUS_DEFAULTS, 'poisoned': True}
+    assert state.get('not_a_status') is None
+    state.update({'is_drunk': True})
+    assert state['is_drunk'] is True
+    with pytest.raises(KeyError):
+        state['not_a_status'] = 1
+    assert not hasattr(state, '__dict__')
+
+
+def test_alive_bitmask_tracks_status_writes_and_reseating():
+    g = Grimoire()
+    for pid in ('p1', 'p2', 'p3', 'p4'):
+        g.add_player(pid, 'Monk', 'Good')
+    g.statuses['p2']['alive'] = False
+    g.update_status('p4', 'alive', False)
+    assert g.get_alive_players() == ['p1', 'p3']
+    assert g.alive_count() == 2 and not g.is_player_alive('p2')
+    g.players = ['p3', 'p2', 'p1', 'p4']
+    assert g.get_alive_players() == ['p3', 'p1']
+    g.statuses['p2'].alive = True
+    assert g.get_alive_players() == ['p3', 'p2', 'p1']
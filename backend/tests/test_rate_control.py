@@ -0,0 +1,52 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from backend.llm_providers import AdaptiveRateController, rate_limit_signal
+
+
+def make_controller(**overrides):
+    settings = dict(initial_rate=10.0, min_rate=0.1, max_rate=50.0, increase=1.0, decrease=0.5,
+                    initial_concurrency=4, max_concurrency=8)
+    settings.update(overrides)
+    return AdaptiveRateController("test", **settings)
+
+
+def test_rate_limit_headers_are_parsed_for_each_provider():
+    assert rate_limit_signal({"x-ratelimit-remaining-requests": "59", "x-ratelimit-reset-requests": "6m0s"}) == \
+        {"remaining": 59.0, "reset_seconds": 360.0}
+    assert rate_limit_signal({"llm_provider-x-ratelimit-remaining-requests": "3",
+                              "llm_provider-x-ratelimit-reset-requests": "20ms"}) == {"remaining": 3.0, "reset_seconds": 0.02}
+    reset_at = (datetime.now(timezone.utc) + timedelta(seconds=30)).isoformat().replace("+00:00", "Z")
+    signal = rate_limit_signal({"anthropic-ratelimit-requests-remaining": "10", "anthropic-ratelimit-requests-reset": reset_at})
+    assert signal["remaining"] == 10.0 and 28 < signal["reset_seconds"] <= 30
+    assert rate_limit_signal({"content-type": "application/json"}) is None
+
+
+def test_additive_increase_and_multiplicative_decrease():
+    controller = make_controller()
+    for _ in range(4):
+        controller.on_success()
+    assert controller.rate == 14.0 and controller.concurrency == 5 #one window of successes widens concurrency
+    controller.on_rate_limited()
+    controller.on_rate_limited() #same burst: only the first 429 cuts the rate
+    assert controller.rate == 7.0 and controller.concurrency == 2 and controller.decreases == 1
+
+
+def test_remaining_quota_caps_the_rate():
+    controller = make_controller()
+    controller.on_success({"x-ratelimit-remaining-requests": "30", "x-ratelimit-reset-requests": "60s"})
+    assert controller.rate == 0.5
+    assert controller.stats()["interval_seconds"] == 2.0
+
+
+def test_concurrency_limit_holds_calls_until_a_slot_frees():
+    async def scenario():
+        controller = make_controller(initial_rate=50.0, initial_concurrency=1)
+        await controller.acquire()
+        second = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0.05)
+        assert not second.done() and controller.stats()["waiting"] == 1
+        controller.release()
+        await asyncio.wait_for(second, 1)
+        assert controller.in_flight == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,71 @@
+from backend.storyteller.grimoire import Grimoire
+from backend.storyteller.journal import GameJournal
+from backend.storyteller.replay import GameReplay, load_replay, read_records, replay_messages
+
+
+def record_game(path, days=3):
+    """Play a small scripted game into a journal; returns the live states keyed by journal position."""
+    g = Grimoire()
+    for pid, role, alignment in [('p1', 'Imp', 'Evil'), ('p2', 'Monk', 'Good'), ('p3', 'Empath', 'Good'), ('p4', 'Chef', 'Good')]:
+        g.add_player(pid, role, alignment)
+    g.log_event("PHASE_CHANGE", {"phase": "FIRST_NIGHT", "day_number": 0})
+    g.journal = GameJournal(path)
+    g.journal.snapshot({"grimoire": g.to_snapshot()})
+    states = {0: (list(g.game_log), g.get_alive_players())}
+    for day in range(1, days + 1):
+        g.log_event("PHASE_CHANGE", {"phase": "DAY_CHAT", "day_number": day})
+        for i in range(5):
+            g.log_event("CHAT", {"sender": "p2", "sender_name": "P2", "text": f"day {day} message {i}"})
+        g.log_event("PHASE_CHANGE", {"phase": "NIGHT", "day_number": day})
+        if day == 2:
+            g.update_status('p4', 'alive', False)
+            g.journal.snapshot({"grimoire": g.to_snapshot(with_log=False)}) #compact, as the game writes them
+        states[g.journal.records - g.journal.snapshots] = (list(g.game_log), g.get_alive_players())
+    g.journal.close()
+    return g, states
+
+
+def test_seek_matches_the_live_game_at_every_recorded_point(tmp_path):
+    path = str(tmp_path / "game.jsonl")
+    g, states = record_game(path)
+    replay = GameReplay(read_records(path), checkpoint_every=4)
+    assert len(replay.checkpoints) > 3 #sparse, not one per mutation
+    for position, (game_log, alive) in states.items():
+        state = replay.state_at(position)
+        assert state.game_log == game_log
+        assert state.get_alive_players() == alive
+    final = replay.state_at(replay.length)
+    assert final.game_log == g.game_log
+    assert final.alive_neighbors('p3') == ['p2', 'p1']
+
+
+def test_seek_by_event_phase_and_day(tmp_path):
+    path = str(tmp_path / "game.jsonl")
+    g, _ = record_game(path)
+    replay = load_replay(path, checkpoint_every=4)
+    assert load_replay(path, checkpoint_every=4) is replay #cached until the file changes
+
+    chat = next(entry for entry in g.game_log if entry["event_type"] == "CHAT" and entry["data"]["text"] == "day 2 message 3")
+    _, state = replay.seek(seq=chat["seq"])
+    assert state.game_log[-1] == chat
+
+    _, state = replay.seek(phase="NIGHT", day=2)
+    assert (state.current_phase, state.day_number) == ("NIGHT", 2)
+    assert state.is_player_alive('p4') #the death comes after the phase change
+
+    position, state = replay.seek(day=3)
+    assert (state.current_phase, state.day_number) == ("DAY_CHAT", 3)
+    assert not state.is_player_alive('p4')
+    assert [entry["data"].get("text") for entry in replay.events_from(position)][:2] == ["day 3 message 0", "day 3 message 1"]
+
+
+def test_replay_messages_start_from_the_seek_point(tmp_path):
+    path = str(tmp_path / "game.jsonl")
+    record_game(path, days=1)
+    replay = load_replay(path)
+    position, state = replay.seek(phase="DAY_CHAT")
+    messages = [message for _, message in replay_messages(replay, position, state)]
+    assert [m["type"] for m in messages[:2]] == ["PLAYER_ROLES_UPDATE", "GAME_STATE_UPDATE"]
+    assert messages[1]["payload"]["currentPhase"] == "DAY_CHAT"
+    assert messages[2]["type"] == "CHAT_MESSAGE" and messages[2]["payload"]["text"] == "day 1 message 0"
+    assert messages[-1]["type"] == "GAME_STATE_UPDATE" and messages[-1]["payload"]["currentPhase"] == "NIGHT"
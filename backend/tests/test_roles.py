@@ -24,4 +24,16 @@ def test_get_roles_by_type():
 def test_get_all_roles():
     roles = get_all_roles()
     assert isinstance(roles, list)
-    assert "Imp" in roles 
\ No newline at end of file
+    assert "Imp" in roles 
+
+def test_role_registry_indexes():
+    from backend.storyteller.roles import ROLE_REGISTRY
+    assert ROLE_REGISTRY.is_type("Poisoner", RoleType.MINION)
+    assert not ROLE_REGISTRY.is_type("Nonexistent", RoleType.MINION)
+    assert "Imp" in ROLE_REGISTRY.by_alignment[RoleAlignment.EVIL]
+    assert ROLE_REGISTRY.has_flag("Ravenkeeper", "on_death")
+    assert ROLE_REGISTRY.has_flag("Baron", "setup")
+    assert ROLE_REGISTRY.by_flag["night_choice"] >= {"Monk", "Imp", "Poisoner"}
+    assert get_roles_by_type(RoleType.DEMON) is get_roles_by_type(RoleType.DEMON)
+    with pytest.raises(TypeError):
+        get_roles_by_type(RoleType.DEMON)["Vortox"] = {}
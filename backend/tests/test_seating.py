@@ -0,0 +1,38 @@
+from backend.storyteller.grimoire import Grimoire
+from backend.storyteller.seating import SeatRing
+from backend.tools.game_state_tools import GameStateTools
+
+
+def make_grimoire(alignments):
+    g = Grimoire()
+    for i, alignment in enumerate(alignments, start=1):
+        g.add_player(f'p{i}', 'Imp' if alignment == 'Evil' else 'Monk', alignment)
+    return g
+
+
+def test_alive_neighbors_skip_the_dead_and_relink_on_revive():
+    g = make_grimoire(['Good'] * 5)
+    assert g.seat_of('p3') == 2
+    assert g.alive_neighbors('p1') == ['p5', 'p2']
+    g.update_status('p2', 'alive', False)
+    g.update_status('p5', 'alive', False)
+    assert g.alive_neighbors('p1') == ['p4', 'p3']
+    #a dead player's neighbours are still the closest living players
+    assert g.alive_neighbors('p2') == ['p1', 'p3']
+    g.update_status('p5', 'alive', True)
+    assert g.alive_neighbors('p1') == ['p5', 'p3']
+    assert GameStateTools(g).get_player_neighbors('p4')['right']['id'] == 'p5'
+
+
+def test_evil_pairs_count_uses_the_whole_circle():
+    g = make_grimoire(['Evil', 'Good', 'Good', 'Evil', 'Evil'])
+    #p4-p5 and p5-p1 wrap around
+    assert g.evil_pairs_count() == 2
+    assert g.evil_pairs_count(lambda pid: pid in ('p2', 'p3')) == 1
+
+
+def test_ring_with_two_players_and_one_alive():
+    ring = SeatRing(['a', 'b'])
+    assert ring.alive_neighbors('a') == ['b']
+    ring.set_alive(1, False)
+    assert ring.alive_neighbors('a') == []
@@ -0,0 +1,86 @@
+from backend.storyteller.grimoire import Grimoire
+from backend.storyteller.setup import GameSetupEngine
+from backend.storyteller.roles import get_role_details, RoleType
+
+ROLES = {
+    'p1': 'Imp', 'p2': 'Baron', 'p3': 'Washerwoman', 'p4': 'Chef',
+    'p5': 'Empath', 'p6': 'Fortune Teller', 'p7': 'Drunk', 'p8': 'Librarian'
+}
+
+
+def build(seed=7, roles=ROLES):
+    g = Grimoire()
+    info = GameSetupEngine(seed=seed).build(g, roles, {pid: pid.upper() for pid in roles})
+    return g, info
+
+
+def test_setup_is_deterministic_for_a_seed():
+    g1, info1 = build()
+    g2, info2 = build()
+    assert g1.players == g2.players
+    assert g1.roles == g2.roles
+    assert g1.demon_bluffs == g2.demon_bluffs
+    assert info1 == info2
+
+
+def test_setup_state():
+    g, _ = build()
+    assert g.current_phase == 'FIRST_NIGHT'
+    assert g.day_number == 0
+    assert sorted(g.players) == sorted(ROLES)
+    assert g.current_demon_player_id == 'p1'
+    assert g.alignments['p2'] == 'Evil'
+    #bluffs are three Townsfolk not in play
+    assert len(g.demon_bluffs) == 3
+    for bluff in g.demon_bluffs:
+        assert get_role_details(bluff)['type'] == RoleType.TOWNSFOLK
+        assert bluff not in g.roles.values()
+    assert g.alignments[g.fortune_teller_red_herring_player_id] == 'Good'
+
+
+def test_baron_adds_outsiders():
+    g, _ = build()
+    outsiders = [r for r in g.roles.values() if get_role_details(r)['type'] == RoleType.OUTSIDER]
+    #8 players have one base outsider, the Baron adds two
+    assert len(outsiders) == 3
+    assert len(g.baron_added_outsiders) == 2
+
+
+def test_drunk_gets_fake_townsfolk_role():
+    g, _ = build()
+    drunk = g.get_player_ids_by_role('Drunk')[0]
+    fake = g.get_player_status(drunk, 'thinks_is_role')
+    assert g.get_player_status(drunk, 'is_drunk')
+    assert get_role_details(fake)['type'] == RoleType.TOWNSFOLK
+    assert fake not in g.roles.values()
+    assert fake not in g.demon_bluffs
+
+
+def test_chef_and_empath_info_is_correct():
+    roles = {'p1': 'Imp', 'p2': 'Poisoner', 'p3': 'Chef', 'p4': 'Empath', 'p5': 'Soldier'}
+    g = Grimoire()
+    info = GameSetupEngine(seed=1).build(g, roles, shuffle_seating=False)
+    assert info['p3']['count'] == 1 #p1 and p2 sit together
+    assert info['p4']['count'] == 0 #neighbours p3 and p5 are good
+    assert 'p3' in g.private_clues and g.private_clues['p3'][0]['text'].startswith('You see 1 pair')
+
+
+def test_washerwoman_info_names_a_real_townsfolk():
+    roles = {'p1': 'Imp', 'p2': 'Washerwoman', 'p3': 'Monk', 'p4': 'Saint', 'p5': 'Poisoner'}
+    for seed in range(10):
+        g = Grimoire()
+        info = GameSetupEngine(seed=seed).build(g, roles)
+        clue = info['p2']
+        assert clue['shown_role'] == 'Monk'
+        assert 'p3' in clue['players']
+
+
+def test_recluse_registers_one_way_for_a_whole_chef_count():
+    roles = {'p1': 'Imp', 'p2': 'Recluse', 'p3': 'Poisoner', 'p4': 'Chef', 'p5': 'Soldier'}
+    counts = set()
+    for seed in range(30):
+        g = Grimoire()
+        info = GameSetupEngine(seed=seed).build(g, roles, shuffle_seating=False)
+        counts.add(info['p4']['count'])
+    #the Recluse sits between two evil players: as evil both pairs count, as good neither does
+    assert counts == {0, 2}
@@ -0,0 +1,39 @@
+import pytest
+from backend.storyteller.grimoire import Grimoire
+
+
+def make_grimoire():
+    g = Grimoire()
+    g.add_player('p1', 'Imp', 'Evil')
+    g.add_player('p2', 'Empath', 'Good')
+    return g
+
+
+def test_snapshot_rebuilt_only_on_version_change_and_shares_unchanged_parts():
+    g = make_grimoire()
+    first = g.snapshot()
+    assert g.snapshot() is first
+    g.update_status('p2', 'poisoned', True)
+    second = g.snapshot()
+    assert second is not first and second.version == g.version
+    assert second.statuses['p1'] is first.statuses['p1']
+    assert second.roles is first.roles
+    assert second.statuses['p2']['poisoned'] is True and first.statuses['p2']['poisoned'] is False
+    with pytest.raises(TypeError):
+        second.statuses['p2']['alive'] = False
+
+
+def test_views_memoized_per_version():
+    g = make_grimoire()
+    calls = []
+
+    def build(snapshot):
+        calls.append(snapshot.version)
+        return [pid for pid in snapshot.players if snapshot.is_alive(pid)]
+
+    assert g.view('alive', build) == ['p1', 'p2']
+    assert g.get_public_player_info() is g.get_public_player_info()
+    g.view('alive', build)
+    g.update_status('p1', 'alive', False)
+    assert g.view('alive', build) == ['p2']
+    assert len(calls) == 2
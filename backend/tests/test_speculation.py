@@ -0,0 +1,48 @@
+import asyncio
+from backend.llm_providers import record_usage
+from backend.storyteller.grimoire import Grimoire
+from backend.storyteller.speculation import SpeculativeDecisions, speculation_key
+
+
+def spawner():
+    return lambda coro, kind: asyncio.get_running_loop().create_task(coro)
+
+
+def test_matching_key_is_a_hit_and_stale_work_is_wasted():
+    async def scenario():
+        speculation = SpeculativeDecisions(spawner())
+        calls = []
+
+        async def decide(pid):
+            calls.append(pid)
+            record_usage('x' * 40, 'VOTE: YES')
+            return True
+
+        speculation.prefetch(speculation_key('VOTE', 'p1', 'p3', 2, 5), lambda: decide('p1'))
+        speculation.prefetch(speculation_key('VOTE', 'p2', 'p3', 2, 5), lambda: decide('p2'))
+        #a duplicate key does not start a second call
+        assert not speculation.prefetch(speculation_key('VOTE', 'p1', 'p3', 2, 5), lambda: decide('p1'))
+        await asyncio.sleep(0)
+        hit = await speculation.take(speculation_key('VOTE', 'p1', 'p3', 2, 5))
+        #public state moved on: p2's answer no longer applies
+        discarded = speculation.discard_stale(lambda key: key[3:] == (3, 5))
+        miss = await speculation.take(speculation_key('VOTE', 'p2', 'p3', 3, 5))
+        return speculation, calls, hit, miss, discarded
+
+    speculation, calls, hit, miss, discarded = asyncio.run(scenario())
+    assert hit == (True, True) and miss == (False, None) and discarded == 1
+    assert sorted(calls) == ['p1', 'p2']
+    stats = speculation.stats()
+    assert stats['hits'] == 1 and stats['misses'] == 1 and stats['hit_rate'] == 0.5
+    assert stats['used_tokens_est'] == 13 and stats['wasted_tokens_est'] == 13
+
+
+def test_public_version_ignores_phase_changes_and_private_state():
+    g = Grimoire()
+    g.add_player('p1', 'Monk', 'Good')
+    version = g.public_version
+    g.log_event('PHASE_CHANGE', {'new_phase': 'NOMINATION', 'day_number': 1})
+    g.update_status('p1', 'poisoned', True)
+    assert g.public_version == version
+    g.update_status('p1', 'alive', False)
+    assert g.public_version == version + 1
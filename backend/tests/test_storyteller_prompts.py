@@ -0,0 +1,23 @@
+from backend.agents.storyteller_prompts import (
+    CORE_PROMPT, NIGHT_RULES, PREPARATION_RULES, build_storyteller_prompt, modules_for_phase
+)
+
+
+def test_phase_prompt_is_smaller_than_full_prompt():
+    full = build_storyteller_prompt()
+    for phase in ("PREPARATION", "FIRST_NIGHT", "DAY_CHAT", "NOMINATION", "VOTING", "NIGHT"):
+        assert len(build_storyteller_prompt(phase)) < len(full)
+
+
+def test_prompt_starts_with_stable_core():
+    for phase in (None, "PREPARATION", "DAY_CHAT", "NIGHT"):
+        assert build_storyteller_prompt(phase).startswith(CORE_PROMPT)
+    #same phase -> identical prompt object (cached)
+    assert build_storyteller_prompt("NIGHT") is build_storyteller_prompt("NIGHT")
+
+
+def test_only_relevant_modules_included():
+    night = build_storyteller_prompt("NIGHT")
+    assert NIGHT_RULES in night
+    assert PREPARATION_RULES not in night
+    assert modules_for_phase("SOMETHING_ELSE") == modules_for_phase(None)
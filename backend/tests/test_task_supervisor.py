@@ -0,0 +1,34 @@
+import asyncio
+from backend.utils.task_supervisor import TaskSupervisor
+
+
+def test_cancel_all_stops_in_flight_tasks_and_rejects_new_work():
+    async def scenario():
+        supervisor = TaskSupervisor('g1')
+        cancelled = []
+
+        async def slow(tag):
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(tag)
+                raise
+
+        async def fails():
+            raise RuntimeError('boom')
+
+        supervisor.spawn(slow('a'), kind='action')
+        supervisor.spawn(slow('b'), kind='curation')
+        supervisor.spawn(fails())
+        await asyncio.sleep(0)
+        assert supervisor.stats()['in_flight_by_kind'] == {'action': 1, 'curation': 1}
+
+        await supervisor.aclose('game ended')
+        assert supervisor.spawn(slow('late')) is None
+        return supervisor, cancelled
+
+    supervisor, cancelled = asyncio.run(scenario())
+    assert sorted(cancelled) == ['a', 'b']
+    stats = supervisor.stats()
+    assert stats['in_flight'] == 0
+    assert stats['cancelled'] == 2 and stats['failed'] == 1 and stats['rejected'] == 1
@@ -0,0 +1,37 @@
+from backend.agents.turn_planner import parse_turn_plan
+from backend.storyteller.grimoire import Grimoire
+
+
+def make_grimoire():
+    g = Grimoire()
+    for pid in ('AIPlayer1', 'AIPlayer2', 'Human1'):
+        g.add_player(pid, 'Monk', 'Good')
+    g.day_number = 1
+    return g
+
+
+def test_parse_plan_validates_targets_and_recipients():
+    text = 'Reasoning first.\n{"communication": {"type": "PRIVATE_CHAT", "recipient_id": "Human1", "text": "psst"},' \
+           ' "nominate": ["Ghost", "Human1", "AIPlayer2"], "votes": {"Human1": "yes", "AIPlayer2": "NO", "AIPlayer1": "maybe"}}'
+    plan, error = parse_turn_plan(text, 1, 0, ['AIPlayer2', 'Human1'], ['AIPlayer2'])
+    assert error is None
+    #the human is not a valid private recipient, so the message goes public
+    assert plan.communication == {'type': 'PUBLIC_CHAT', 'text': 'psst'}
+    assert plan.nominations == ['Human1', 'AIPlayer2']
+    assert plan.votes == {'Human1': True, 'AIPlayer2': False}
+    assert plan.nomination_for(['AIPlayer2']) == 'AIPlayer2'
+    assert parse_turn_plan('NOMINATE: Human1', 1, 0, [], [])[0] is None
+
+
+def test_plan_survives_nominations_but_not_deaths_or_a_new_day():
+    g = make_grimoire()
+    plan, _ = parse_turn_plan('{"nominate": [], "votes": {}}', 1, len(g.game_log), ['AIPlayer2'], [])
+    g.log_event('NOMINATION', {'nominator_id': 'AIPlayer2', 'nominee_id': 'Human1', 'day': 1})
+    g.update_status('Human1', 'nominated_today', True)
+    g.log_event('PHASE_CHANGE', {'new_phase': 'VOTING'})
+    assert plan.is_current(g)
+    g.update_status('Human1', 'alive', False)
+    assert not plan.is_current(g)
+    plan.log_cursor = len(g.game_log)
+    g.day_number = 2
+    assert not plan.is_current(g)
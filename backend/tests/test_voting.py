@@ -0,0 +1,132 @@
+import asyncio
+import pytest
+from backend.storyteller.grimoire import Grimoire
+from backend.storyteller.voting import VotingEngine
+
+
+def make_engine():
+    g = Grimoire()
+    for pid, role in [('p1', 'Imp'), ('p2', 'Butler'), ('p3', 'Monk'), ('p4', 'Chef'), ('p5', 'Saint')]:
+        g.add_player(pid, role, 'Evil' if role == 'Imp' else 'Good')
+    g.day_number = 1
+    return g, VotingEngine(g)
+
+
+def run(engine, nominee, votes, delays=None):
+    landed = []
+
+    async def decide(pid):
+        await asyncio.sleep((delays or {}).get(pid, 0))
+        return votes.get(pid)
+
+    async def on_vote(event):
+        landed.append(event['voter_id'])
+
+    result = asyncio.run(engine.run_vote(nominee, list(votes), decide, on_vote=on_vote))
+    return result, landed
+
+
+def test_votes_stream_as_they_land_and_tally_locally():
+    g, engine = make_engine()
+    result, landed = run(engine, 'p1', {'p3': True, 'p4': True, 'p5': True, 'p1': False},
+                         delays={'p3': 0.03, 'p4': 0.0, 'p5': 0.01, 'p1': 0.02})
+    assert landed == ['p4', 'p5', 'p1', 'p3']
+    assert result['votes_for'] == 3
+    assert result['required'] == 3
+    assert result['on_the_block']
+    assert g.game_log[-1]['event_type'] == 'VOTE_TALLY'
+    assert engine.already_tallied('p1')
+
+
+def test_butler_vote_only_counts_if_master_votes():
+    g, engine = make_engine()
+    g.statuses['p2']['butler_master'] = 'p3'
+    result, _ = run(engine, 'p1', {'p2': True, 'p3': False})
+    assert result['discarded'] == {'p2': 'BUTLER_MASTER_DID_NOT_VOTE'}
+    result, _ = run(engine, 'p5', {'p2': True, 'p3': True})
+    assert result['yes_voters'] == ['p2', 'p3']
+
+
+def test_dead_vote_token_is_spent_once():
+    g, engine = make_engine()
+    g.statuses['p4']['alive'] = False
+    assert 'p4' in engine.eligible_voters()
+    result, _ = run(engine, 'p1', {'p4': True})
+    assert result['yes_voters'] == ['p4']
+    assert g.get_player_status('p4', 'dead_vote_used')
+    assert 'p4' not in engine.eligible_voters()
+
+
+def test_tie_with_highest_vote_clears_the_block():
+    g, engine = make_engine()
+    run(engine, 'p1', {'p2': True, 'p3': True, 'p4': True})
+    result, _ = run(engine, 'p5', {'p2': True, 'p3': True, 'p4': True})
+    assert result['tied'] and not result['on_the_block']
+    assert g.game_state['on_the_block'] is None
+
+
+def test_vote_context_is_immutable():
+    context = VotingEngine.build_context({'daily_chat_log': [{'text': 'hi'}]})
+    with pytest.raises(TypeError):
+        context['x'] = 1
+    assert context['daily_chat_log'][0]['text'] == 'hi'
+
+
+def test_supervisor_owns_vote_requests():
+    from backend.utils.task_supervisor import TaskSupervisor
+    g, engine = make_engine()
+    supervisor = TaskSupervisor("test")
+    cancelled = []
+
+    async def decide(pid):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(pid)
+            raise
+
+    async def scenario():
+        vote = asyncio.create_task(engine.run_vote('p1', ['p3', 'p4'], decide, spawn=lambda coro: supervisor.spawn(coro, kind="vote")))
+        await asyncio.sleep(0.01)
+        assert supervisor.stats()["in_flight_by_kind"] == {"vote": 2}
+        supervisor.cancel_all("game over") #END_GAME: the vote requests stop even while the vote is awaited
+        await asyncio.sleep(0.01)
+        vote.cancel()
+        await asyncio.gather(vote, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert sorted(cancelled) == ['p3', 'p4']
+
+
+def test_human_votes_are_collected_and_count_for_their_butler():
+    import json
+    from backend.main import GameManager
+    manager = GameManager()
+    manager.api_key = None
+    g, _ = make_engine()
+    g.update_status('p2', 'butler_master', 'p1')
+
+    class HumanSocket:
+        async def send_text(self, text):
+            message = json.loads(text)
+            if message["type"] == "REQUEST_VOTE":
+                reply = {"type": "REQUEST_VOTE", "payload": {"action_id": message["payload"]["action_id"], "vote": "YES"}}
+                asyncio.get_running_loop().call_soon(asyncio.ensure_future, manager.handle_incoming_message("p1", json.dumps(reply)))
+
+    class AlwaysYes:
+        async def decide_vote(self, *args, **kwargs):
+            return True
+
+    async def scenario():
+        manager._reset_game(g)
+        manager.agents = {pid: AlwaysYes() for pid in ('p2', 'p3')}
+        manager.active_connections["p1"] = HumanSocket()
+        g.game_state['current_nominee_id'] = 'p5'
+        try:
+            await manager._run_vote()
+        finally:
+            manager.active_connections.pop("p1", None)
+
+    asyncio.run(scenario())
+    result = manager.voting_engine.tallies[(1, 'p5')]
+    assert result['yes_voters'] == ['p1', 'p2', 'p3'] and result['on_the_block']
@@ -5,7 +5,7 @@ Instead of embedding all game information in prompts, agents can call these tool
 
 from typing import Dict, List, Any, Optional
 from ..storyteller.grimoire import Grimoire
-from ..storyteller.roles import get_role_details, RoleDescription
+from ..storyteller.roles import get_role_details
 
 class GameStateTools:
     """Tools for querying game state information on demand"""
@@ -59,18 +59,14 @@ class GameStateTools:
         }
     
     def get_player_neighbors(self, player_id: str) -> Dict[str, Dict[str, str]]:
-        """Get the players sitting adjacent to a given player"""
-        if player_id not in self.grimoire.players:
+        """Get the closest alive players on each side of a given player (dead players are skipped)"""
+        if self.grimoire.seat_of(player_id) is None:
             return {"error": f"Player {player_id} not found"}
         
-        player_index = self.grimoire.players.index(player_id)
-        num_players = len(self.grimoire.players)
-        
-        left_index = (player_index - 1) % num_players
-        right_index = (player_index + 1) % num_players
-        
-        left_player = self.grimoire.players[left_index]
-        right_player = self.grimoire.players[right_index]
+        neighbors = self.grimoire.alive_neighbors(player_id)
+        if not neighbors:
+            return {"error": f"Player {player_id} has no living neighbours"}
+        left_player, right_player = neighbors[0], neighbors[-1]
         
         return {
             "left": {
@@ -0,0 +1,89 @@
+#backend/utils/json_stream.py
+import json
+from typing import Any, AsyncIterator, List, Optional, Tuple
+
+class JSONArrayStreamParser:
+    """
+    Incremental parser for a single top-level JSON array arriving in chunks.
+    Text before the first '[' is ignored (LLM preamble). Each element is decoded and returned
+    from feed() as soon as it closes, so callers can act on it before the array is finished.
+    Elements that fail to decode are skipped and recorded in `errors` as (fragment, message).
+    """
+
+    def __init__(self):
+        self.started = False
+        self.finished = False
+        self.errors: List[Tuple[str, str]] = []
+        self._element: List[str] = [] #characters of the element currently being read
+        self._depth = 0 #nesting depth inside the current element
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Consume a chunk of text and return the elements completed by it."""
+        completed: List[Any] = []
+        for char in chunk:
+            if self.finished:
+                break
+            if not self.started:
+                if char == '[':
+                    self.started = True
+                continue
+
+            if self._in_string:
+                self._element.append(char)
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if self._depth == 0 and char in ',]':
+                #end of a scalar element (or separator after a container element)
+                self._flush(completed)
+                if char == ']':
+                    self.finished = True
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in '[{':
+                self._depth += 1
+            elif char in ']}':
+                self._depth -= 1
+            if self._element or not char.isspace():
+                self._element.append(char)
+            if self._depth <= 0 and char in ']}':
+                self._flush(completed) #a negative depth means an unbalanced element; it is reported as an error
+        return completed
+
+    def _flush(self, completed: List[Any]):
+        fragment = "".join(self._element).strip()
+        self._element = []
+        self._depth = 0
+        if not fragment:
+            return
+        try:
+            completed.append(json.loads(fragment))
+        except json.JSONDecodeError as e:
+            self.errors.append((fragment, str(e)))
+
+    def pending_fragment(self) -> Optional[str]:
+        """Return the unfinished element text, if any (useful after a truncated stream)."""
+        fragment = "".join(self._element).strip()
+        return fragment or None
+
+async def iter_json_array(chunks: AsyncIterator[str]) -> AsyncIterator[Any]:
+    """Yield the elements of a streamed JSON array as they complete; the source is closed once the array ends."""
+    parser = JSONArrayStreamParser()
+    try:
+        async for chunk in chunks:
+            for element in parser.feed(chunk):
+                yield element
+            if parser.finished:
+                break
+    finally:
+        if hasattr(chunks, "aclose"):
+            await chunks.aclose()
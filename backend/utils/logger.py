@@ -1,7 +1,12 @@
 #backend/utils/logger.py
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
 import sys
 from datetime import datetime
+from typing import Dict, Optional, TextIO
 
 #basic logger setup, can be expanded with file logging, structured logging, etc.
 
@@ -28,4 +33,105 @@ def create_game_log_entry(event_type: str, data: dict, timestamp_override: datet
         "timestamp": timestamp_override or datetime.utcnow().isoformat(),
         "event_type": event_type,
         "data": data
-    } 
\ No newline at end of file
+    } 
+
+#--- game server logging: one "botc" logger tree, written off the event loop by a background thread ---
+
+ROOT_LOGGER = "botc"
+
+#subsystem -> level when verbose logging is off; with verbose logging on every subsystem logs at DEBUG
+QUIET_LEVELS: Dict[str, int] = {
+    "game": logging.INFO,
+    "grimoire": logging.WARNING,
+    "agent": logging.WARNING,
+    "storyteller": logging.INFO,
+    "llm": logging.WARNING,
+}
+
+#high-volume record kinds (passed as extra={"sample": kind}): only the first and then every Nth is written
+DEFAULT_SAMPLE_EVERY: Dict[str, int] = {"CHAT": 10, "STATUS_UPDATE": 5, "LLM_RESPONSE": 5}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def get_logger(subsystem: str) -> logging.Logger:
+    """Logger for one subsystem ("game", "grimoire", "agent", "storyteller", "llm"); cheap to call at import time."""
+    return logging.getLogger(f"{ROOT_LOGGER}.{subsystem}")
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, subsystem, message and any `fields` passed via extra."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.utcfromtimestamp(record.created).isoformat(timespec="milliseconds") + "Z",
+            "level": record.levelname,
+            "subsystem": record.name.split(".", 1)[-1],
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry["fields"] = fields
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class SamplingFilter(logging.Filter):
+    """Passes 1 in N records per sample kind (records without a kind always pass)."""
+
+    def __init__(self, sample_every: Optional[Dict[str, int]] = None):
+        super().__init__()
+        self.sample_every = dict(DEFAULT_SAMPLE_EVERY if sample_every is None else sample_every)
+        self.seen: Dict[str, int] = {}
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        kind = getattr(record, "sample", None)
+        every = self.sample_every.get(kind, 1) if kind else 1
+        if every <= 1:
+            return True
+        count = self.seen.get(kind, 0)
+        self.seen[kind] = count + 1
+        if count % every == 0:
+            return True
+        self.dropped += 1
+        return False
+
+def set_verbose(verbose: bool):
+    """Switch every subsystem between DEBUG and its quiet level; disabled calls return before formatting anything."""
+    for subsystem, level in QUIET_LEVELS.items():
+        get_logger(subsystem).setLevel(logging.DEBUG if verbose else level)
+
+def configure_logging(verbose: bool = True, json_output: bool = True, stream: Optional[TextIO] = None,
+                      sample_every: Optional[Dict[str, int]] = None) -> logging.Logger:
+    """
+    Route the "botc" logger tree through a QueueHandler: callers on the event loop only enqueue the record,
+    and a QueueListener thread formats and writes it. Safe to call again (reconfigures the writer).
+    """
+    global _listener
+    shutdown_logging()
+    root = logging.getLogger(ROOT_LOGGER)
+
+    writer = logging.StreamHandler(stream or sys.stdout)
+    writer.setFormatter(JsonFormatter() if json_output else logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(records)
+    queue_handler.addFilter(SamplingFilter(sample_every))
+    root.addHandler(queue_handler)
+    root.propagate = False
+    set_verbose(verbose)
+
+    _listener = logging.handlers.QueueListener(records, writer)
+    _listener.start()
+    return root
+
+def shutdown_logging():
+    """Stop the writer thread after it drains the queue, and detach the queue handler."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    root = logging.getLogger(ROOT_LOGGER)
+    for handler in [h for h in root.handlers if isinstance(h, logging.handlers.QueueHandler)]:
+        root.removeHandler(handler)
+    root.propagate = True
+
+atexit.register(shutdown_logging)
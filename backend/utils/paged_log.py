@@ -0,0 +1,176 @@
+#backend/utils/paged_log.py
+import json
+import tempfile
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+def json_default(value: Any) -> Any:
+    """`default=` for json.dump(s): paged logs serialize as the full list, anything else as its str()."""
+    if isinstance(value, PagedLog):
+        return value.to_list()
+    return str(value)
+
+class PagedLog(Sequence):
+    """
+    Append-only list that keeps only its newest entries in memory. Once more than `hot_items + page_items`
+    entries are held, the oldest `page_items` are written as one JSON page to an anonymous segment file
+    (deleted when the log is closed or collected). Indexing, slicing and iteration page spilled entries back
+    in transparently, with a small cache of recently read pages. With `hot_items=None` nothing is spilled and
+    it behaves like a plain list. Entries must be JSON-serializable; a spilled entry comes back as a copy.
+    """
+
+    def __init__(self, items: Iterable[Any] = (), hot_items: Optional[int] = None, page_items: int = 500,
+                 spill_dir: Optional[str] = None, cached_pages: int = 2):
+        self.hot_items = hot_items
+        self.page_items = max(1, page_items)
+        self.spill_dir = spill_dir
+        self.cached_pages = cached_pages
+        self._hot: List[Any] = []
+        self._pages: List[Tuple[int, int]] = [] #(offset, byte length) of each spilled page in the segment file
+        self._segment: Optional[IO[bytes]] = None
+        self._segment_bytes = 0
+        self._source: Optional[IO[bytes]] = None #file holding adopted pages (see adopt_pages)
+        self._source_pages = 0 #the first this many pages are read from _source, the rest from _segment
+        self._cache: "OrderedDict[int, List[Any]]" = OrderedDict()
+        self.page_reads = 0
+        self.extend(items)
+
+    def adopt_pages(self, path: str, pages: List[Tuple[int, int]]):
+        """
+        Serve this (empty) log's oldest entries from pages already written to another file, such as a game
+        journal: each (offset, byte length) there must hold a JSON list of exactly `page_items` entries.
+        The file is only read, on demand, like a spilled page.
+        """
+        if len(self):
+            raise ValueError("only an empty log can adopt pages")
+        if pages:
+            self._source = open(path, "rb")
+            self._source_pages = len(pages)
+            self._pages = [(offset, length) for offset, length in pages]
+
+    def configure(self, hot_items: Optional[int], page_items: int = 500, spill_dir: Optional[str] = None):
+        """Change the memory limit; entries over the new limit are spilled at once."""
+        if self._pages and max(1, page_items) != self.page_items:
+            raise ValueError("page size cannot change once pages have been spilled")
+        self.hot_items, self.page_items, self.spill_dir = hot_items, max(1, page_items), spill_dir
+        self._spill()
+
+    @property
+    def spilled(self) -> int:
+        return len(self._pages) * self.page_items
+
+    def append(self, item: Any):
+        self._hot.append(item)
+        self._spill()
+
+    def extend(self, items: Iterable[Any]):
+        for item in items:
+            self.append(item)
+
+    def _spill(self):
+        if self.hot_items is None:
+            return
+        while len(self._hot) >= self.hot_items + self.page_items:
+            page, self._hot = self._hot[:self.page_items], self._hot[self.page_items:]
+            data = json.dumps(page, default=json_default).encode("utf-8")
+            if self._segment is None:
+                self._segment = tempfile.TemporaryFile(dir=self.spill_dir, prefix="botc-log-", suffix=".seg")
+            self._segment.seek(self._segment_bytes)
+            self._segment.write(data)
+            self._pages.append((self._segment_bytes, len(data)))
+            self._segment_bytes += len(data)
+
+    def _page(self, index: int) -> List[Any]:
+        page = self._cache.get(index)
+        if page is None:
+            offset, length = self._pages[index]
+            segment = self._source if index < self._source_pages else self._segment
+            segment.seek(offset)
+            page = json.loads(segment.read(length).decode("utf-8"))
+            self.page_reads += 1
+            self._cache[index] = page
+            while len(self._cache) > self.cached_pages:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(index)
+        return page
+
+    def __len__(self) -> int:
+        return self.spilled + len(self._hot)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return self._range(start, stop)
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("PagedLog index out of range")
+        if index >= self.spilled:
+            return self._hot[index - self.spilled]
+        return self._page(index // self.page_items)[index % self.page_items]
+
+    def _range(self, start: int, stop: int) -> List[Any]:
+        items: List[Any] = []
+        position = start
+        while position < min(stop, self.spilled):
+            page_index, offset = divmod(position, self.page_items)
+            page = self._page(page_index)[offset:offset + (stop - position)]
+            items.extend(page)
+            position += len(page)
+        if stop > self.spilled:
+            items.extend(self._hot[max(0, start - self.spilled):stop - self.spilled])
+        return items
+
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(len(self._pages)):
+            yield from self._page(index)
+        yield from list(self._hot) #a copy: the hot window shifts when an append spills a page
+
+    def __reversed__(self) -> Iterator[Any]:
+        yield from reversed(list(self._hot))
+        for index in range(len(self._pages) - 1, -1, -1):
+            yield from reversed(self._page(index))
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, (PagedLog, list)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(self.to_list())
+
+    def to_list(self) -> List[Any]:
+        return self._range(0, len(self))
+
+    def clear(self):
+        self._hot = []
+        self._pages = []
+        self._cache.clear()
+        self._close_source()
+        self._segment_bytes = 0
+        if self._segment is not None:
+            self._segment.truncate(0)
+
+    def close(self):
+        """Release the segment file; spilled entries are lost, so only call this once the log is done with."""
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+        self._close_source()
+
+    def _close_source(self):
+        if self._source is not None:
+            self._source.close()
+            self._source = None
+        self._source_pages = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {"items": len(self), "hot_items": len(self._hot), "spilled_items": self.spilled,
+                "pages": len(self._pages), "segment_bytes": self._segment_bytes, "page_reads": self.page_reads}
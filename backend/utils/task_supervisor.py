@@ -0,0 +1,84 @@
+#backend/utils/task_supervisor.py
+import asyncio
+from typing import Any, Coroutine, Dict, Optional
+from .logger import get_logger
+
+logger = get_logger("game")
+
+class TaskSupervisor:
+    """
+    Owns every background task spawned for one game (agent decisions, memory curation).
+    Works like a long-lived TaskGroup: a failing child is logged without touching its siblings, and
+    `cancel_all` cancels everything still running and refuses new work. Cancelling a task cancels the
+    provider call it is awaiting, so a finished or reset game stops spending LLM quota immediately.
+    """
+
+    def __init__(self, name: str = "game"):
+        self.name = name
+        self.closed = False
+        self._tasks: Dict[asyncio.Task, str] = {} #task -> kind
+        self.spawned = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.rejected = 0 #spawn attempts after the supervisor was closed
+
+    def spawn(self, coro: Coroutine[Any, Any, Any], kind: str = "agent") -> Optional[asyncio.Task]:
+        """Start `coro` as a supervised task. Returns None (and closes the coroutine) once the game is over."""
+        if self.closed:
+            coro.close()
+            self.rejected += 1
+            return None
+        task = asyncio.create_task(coro)
+        self._tasks[task] = kind
+        self.spawned += 1
+        task.add_done_callback(self._on_done)
+        return task
+
+    def _on_done(self, task: asyncio.Task):
+        kind = self._tasks.pop(task, "agent")
+        if task.cancelled():
+            self.cancelled += 1
+        elif task.exception() is not None:
+            self.failed += 1
+            logger.error("TaskSupervisor[%s]: %s task failed: %s", self.name, kind, task.exception())
+        else:
+            self.completed += 1
+
+    @property
+    def in_flight(self) -> int:
+        return sum(1 for task in self._tasks if not task.done())
+
+    def cancel_all(self, reason: str = "") -> int:
+        """Cancel every running task and close the supervisor. Returns how many tasks were cancelled."""
+        self.closed = True
+        current = asyncio.current_task() if asyncio.get_event_loop().is_running() else None
+        pending = [task for task in self._tasks if not task.done() and task is not current]
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.info("TaskSupervisor[%s]: cancelled %s in-flight task(s)%s", self.name, len(pending), f" ({reason})" if reason else "")
+        return len(pending)
+
+    async def aclose(self, reason: str = ""):
+        """Cancel everything and wait until the cancelled tasks have unwound."""
+        self.cancel_all(reason)
+        current = asyncio.current_task()
+        await asyncio.gather(*(task for task in list(self._tasks) if task is not current), return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        by_kind: Dict[str, int] = {}
+        for task, kind in self._tasks.items():
+            if not task.done():
+                by_kind[kind] = by_kind.get(kind, 0) + 1
+        return {
+            "name": self.name,
+            "closed": self.closed,
+            "in_flight": self.in_flight,
+            "in_flight_by_kind": by_kind,
+            "spawned": self.spawned,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "rejected": self.rejected
+        }